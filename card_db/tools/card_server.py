@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""Local asyncio HTTP service over the normalized card database.
+
+    python3 card_db/tools/card_server.py --cards card_db/cards.json --port 8780
+
+Endpoints (all JSON, CORS-enabled):
+
+    GET  /cards/<id>                       one card
+    GET  /cards/batch?ids=a,b,c            several cards, in request order; unknown ids are listed under "missing"
+    POST /cards/batch  {"ids": [...]}      the same, for long id lists
+    GET  /cards?type=Attack&keyword=Breaker&limit=50&offset=0
+                                           filtered page; any CardStore field, comma-separated values match any;
+                                           numeric fields (cost, difficulty, control, speed, damage, block, ...) take integers or null
+    GET  /cards.json, /abilities_index.json
+                                           the whole database and the ability index, for loadCardDatabase()
+
+Queries run against a CardStore. Response bodies are cached in memory (LRU)
+together with their ETag and gzip encoding, so a repeated request costs a dict
+lookup; If-None-Match is answered with 304. The database is reloaded, and
+the cache dropped, when cards.json changes on disk.
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from card_store import CardStore
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 512
+MAX_HEADER_BYTES = 65536
+MAX_BODY_BYTES = 1 << 20
+RELOAD_CHECK_SECONDS = 1.0
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+class Response:
+    """Encoded body with its ETag and, when worthwhile, a gzip copy."""
+
+    __slots__ = ("status", "body", "gzipped", "etag")
+
+    def __init__(self, status: int, payload: Any) -> None:
+        self.status = status
+        self.body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.gzipped = gzip.compress(self.body, compresslevel=6, mtime=0) if len(self.body) >= GZIP_MIN_BYTES else None
+
+
+class CardService:
+    """Request handling over a CardStore, independent of the socket layer."""
+
+    def __init__(self, cards_path: str, abilities_path: Optional[str] = None, cache_size: int = 1024) -> None:
+        self.cards_path = cards_path
+        self.abilities_path = abilities_path or os.path.join(os.path.dirname(cards_path), "abilities_index.json")
+        self.cache_size = cache_size
+        self.cache: "OrderedDict[str, Response]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.store: Optional[CardStore] = None
+        self.mtime = 0.0
+        self.checked = 0.0
+        self.load()
+
+    def load(self) -> None:
+        self.mtime = os.path.getmtime(self.cards_path)
+        self.store = CardStore.load(self.cards_path)
+        self.cache.clear()
+
+    def maybe_reload(self, now: float) -> None:
+        if now - self.checked < RELOAD_CHECK_SECONDS:
+            return
+        self.checked = now
+        try:
+            changed = os.path.getmtime(self.cards_path) != self.mtime
+        except OSError:
+            return
+        if changed:
+            self.load()
+
+    def handle(self, method: str, target: str, body: bytes = b"") -> Response:
+        """Response for a request; GETs and batch POSTs are served from the cache when possible."""
+        parts = urlsplit(target)
+        path = unquote(parts.path).rstrip("/") or "/"
+        if method == "POST" and path == "/cards/batch":
+            try:
+                ids = json.loads(body or b"{}").get("ids")
+            except (ValueError, AttributeError):
+                ids = None
+            if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+                return Response(400, {"error": 'Body must be {"ids": [...]}'})
+            return self._cached("batch:" + ",".join(ids), lambda: self._batch(ids))
+        if method not in ("GET", "HEAD"):
+            return Response(405, {"error": f"{method} not allowed"})
+        query = parse_qs(parts.query)
+        key = path + "?" + "&".join(f"{k}={','.join(v)}" for k, v in sorted(query.items()))
+        return self._cached(key, lambda: self._route(path, query))
+
+    def _cached(self, key: str, build: Any) -> Response:
+        response = self.cache.get(key)
+        if response is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return response
+        self.misses += 1
+        response = build()
+        # Errors are cheap to rebuild; only cache what is worth keeping
+        if response.status == 200 and self.cache_size:
+            self.cache[key] = response
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return response
+
+    def _route(self, path: str, query: Dict[str, List[str]]) -> Response:
+        if path == "/cards":
+            return self._filter(query)
+        if path == "/cards/batch":
+            ids = [i for value in query.get("ids", []) for i in value.split(",") if i]
+            return self._batch(ids)
+        if path.startswith("/cards/"):
+            card = self.store.get(path[len("/cards/"):])
+            return Response(200, card) if card is not None else Response(404, {"error": "No such card"})
+        if path == "/cards.json":
+            return Response(200, list(self.store))
+        if path == "/abilities_index.json" and os.path.exists(self.abilities_path):
+            with open(self.abilities_path, "rb") as f:
+                return Response(200, f.read())
+        if path == "/health":
+            return Response(200, {"cards": len(self.store)})
+        return Response(404, {"error": "Not found"})
+
+    def _batch(self, ids: List[str]) -> Response:
+        cards = []
+        missing = []
+        for card_id in ids:
+            card = self.store.get(card_id)
+            if card is None:
+                missing.append(card_id)
+            else:
+                cards.append(card)
+        return Response(200, {"cards": cards, "missing": missing})
+
+    def _filter(self, query: Dict[str, List[str]]) -> Response:
+        try:
+            limit = min(MAX_LIMIT, max(0, int(query.pop("limit", [DEFAULT_LIMIT])[-1])))
+            offset = max(0, int(query.pop("offset", [0])[-1]))
+        except ValueError:
+            return Response(400, {"error": "limit and offset must be integers"})
+        try:
+            filters = CardStore.parse_filters(query)
+        except ValueError as exc:
+            return Response(400, {"error": str(exc)})
+        try:
+            rows = self.store.ids_where(**filters)
+        except KeyError as exc:
+            return Response(400, {"error": str(exc.args[0])})
+        page = [self.store.row(row) for row in rows[offset:offset + limit]]
+        return Response(200, {"total": len(rows), "offset": offset, "limit": limit, "cards": page})
+
+
+class CardServer:
+    """HTTP/1.1 keep-alive front end for a CardService on asyncio streams."""
+
+    def __init__(self, service: CardService, host: str = "127.0.0.1", port: int = 8780) -> None:
+        self.service = service
+        self.host = host
+        self.port = port
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> "CardServer":
+        self.server = await asyncio.start_server(self._connection, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                self.service.maybe_reload(loop.time())
+                if body is None:
+                    response = Response(413, {"error": "Request body too large"})
+                else:
+                    response = self.service.handle(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close" and (version == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive")
+                writer.write(self._encode(method, response, headers, keep_alive and body is not None))
+                await writer.drain()
+                if not keep_alive or body is None:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], Optional[bytes]]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY_BYTES:
+            return method, target, version, headers, None
+        body = await reader.readexactly(length) if length else b""
+        return method, target, version, headers, body
+
+    @staticmethod
+    def _encode(method: str, response: Response, headers: Dict[str, str], keep_alive: bool) -> bytes:
+        status = response.status
+        out = [
+            ("Content-Type", "application/json; charset=utf-8"),
+            ("Access-Control-Allow-Origin", "*"),
+            ("Vary", "Accept-Encoding"),
+            ("Connection", "keep-alive" if keep_alive else "close"),
+        ]
+        body = response.body
+        if status == 200:
+            out.append(("ETag", response.etag))
+            out.append(("Cache-Control", "no-cache"))
+            if response.etag in (tag.strip() for tag in headers.get("if-none-match", "").split(",")):
+                status, body = 304, b""
+            elif response.gzipped is not None and "gzip" in headers.get("accept-encoding", ""):
+                body = response.gzipped
+                out.append(("Content-Encoding", "gzip"))
+        out.append(("Content-Length", str(len(body))))
+        head = f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in out) + "\r\n"
+        return head.encode("latin-1") + (b"" if method == "HEAD" or status == 304 else body)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    service = CardService(args.cards, args.abilities, args.cache_size)
+    server = await CardServer(service, args.host, args.port).start()
+    print(f"Serving {len(service.store)} cards at {server.base_url}", file=sys.stderr)
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve the card database over HTTP")
+    parser.add_argument("--cards", default="card_db/cards.json")
+    parser.add_argument("--abilities", default=None, help="Defaults to abilities_index.json next to --cards")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--cache-size", type=int, default=1024, help="Cached responses (0 disables the cache)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
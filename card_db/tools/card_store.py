@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""Columnar, indexed in-memory store over the normalized card database.
+
+Cards are held column by column (one list per Card field) with the
+repetitive type/rarity/set strings interned, and secondary indexes map
+type, rarity, set, number and keyword values to sorted row ids:
+
+    store = CardStore.load("card_db/cards.json")
+    store.where(type="Attack", keyword="Breaker")
+
+A binary snapshot (marshal) of the columns and indexes loads in a few
+milliseconds; CardStore.load() reuses it while it is newer than the JSON.
+"""
+import argparse
+import json
+import marshal
+import os
+import sys
+import time
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Same fields, in the same order, as the ingestor's Card dataclass
+COLUMNS = ("id", "name", "type", "rarity", "cost", "attack", "health", "keywords", "text", "set_code", "set_name", "number", "image_url", "difficulty", "control", "speed", "damage", "zone", "block", "block_zone")
+INTERNED = ("type", "rarity", "set_code", "set_name", "zone", "block_zone")
+INDEXED = ("id", "type", "rarity", "set_code", "set_name", "number", "keyword")
+# Integer columns; text filters on them (query strings, command line) are converted
+NUMERIC = ("cost", "attack", "health", "difficulty", "control", "speed", "damage", "block")
+
+SNAPSHOT_MAGIC = b"UVSCARDS"
+SNAPSHOT_VERSION = 2
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _flatten(card: Dict[str, Any]) -> Dict[str, Any]:
+    set_info = card.get("set") or {}
+    image = card.get("image") or {}
+    block = card.get("block") or {}
+    number = set_info.get("number")
+    return {
+        "id": card.get("id"),
+        "name": card.get("name"),
+        "type": card.get("type"),
+        "rarity": card.get("rarity"),
+        "cost": card.get("cost"),
+        "attack": card.get("attack"),
+        "health": card.get("health"),
+        "keywords": tuple(_intern(k) for k in card.get("keywords") or ()),
+        "text": card.get("text"),
+        "set_code": set_info.get("code"),
+        "set_name": set_info.get("name"),
+        "number": str(number) if number is not None else None,
+        "image_url": image.get("url"),
+        "difficulty": card.get("difficulty"),
+        "control": card.get("control"),
+        "speed": card.get("speed"),
+        "damage": card.get("damage"),
+        "zone": card.get("zone"),
+        "block": block.get("modifier"),
+        "block_zone": block.get("zone"),
+    }
+
+
+class CardStore:
+    def __init__(self, columns: Dict[str, List[Any]], indexes: Dict[str, Dict[str, array]]) -> None:
+        self.columns = columns
+        self.indexes = indexes
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[Dict[str, Any]]) -> "CardStore":
+        columns: Dict[str, List[Any]] = {name: [] for name in COLUMNS}
+        for card in cards:
+            row = _flatten(card)
+            for name in COLUMNS:
+                value = row[name]
+                columns[name].append(_intern(value) if name in INTERNED else value)
+        return cls(columns, cls._build_indexes(columns))
+
+    @staticmethod
+    def _build_indexes(columns: Dict[str, List[Any]]) -> Dict[str, Dict[str, array]]:
+        indexes: Dict[str, Dict[str, array]] = {name: {} for name in INDEXED}
+        for name in INDEXED:
+            index = indexes[name]
+            if name == "keyword":
+                for row, keywords in enumerate(columns["keywords"]):
+                    for keyword in set(k.lower() for k in keywords):
+                        index.setdefault(keyword, array("I")).append(row)
+                continue
+            for row, value in enumerate(columns[name]):
+                if value is not None:
+                    index.setdefault(value, array("I")).append(row)
+        return indexes
+
+    @classmethod
+    def from_json(cls, path: str) -> "CardStore":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls.from_cards(data.get("cards", []) if isinstance(data, dict) else data)
+
+    @classmethod
+    def from_snapshot(cls, path: str) -> "CardStore":
+        with open(path, "rb") as f:
+            data = f.read()
+        header = SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION])
+        if not data.startswith(header):
+            raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} card snapshot")
+        # marshal.load() on a file object reads in small chunks; loads() on the buffer is much faster
+        columns, raw_indexes = marshal.loads(memoryview(data)[len(header):])
+        indexes = {}
+        for name, index in raw_indexes.items():
+            loaded = {}
+            for value, rows in index.items():
+                ids = array("I")
+                ids.frombytes(rows)
+                loaded[value] = ids
+            indexes[name] = loaded
+        return cls(columns, indexes)
+
+    def save_snapshot(self, path: str) -> None:
+        raw_indexes = {name: {value: rows.tobytes() for value, rows in index.items()} for name, index in self.indexes.items()}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]))
+            f.write(marshal.dumps((self.columns, raw_indexes)))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, json_path: str, snapshot_path: Optional[str] = None) -> "CardStore":
+        """Load from the snapshot when it is newer than the JSON, else parse and refresh it."""
+        snapshot_path = snapshot_path or os.path.splitext(json_path)[0] + ".snapshot"
+        if os.path.exists(snapshot_path) and os.path.getmtime(snapshot_path) >= os.path.getmtime(json_path):
+            try:
+                return cls.from_snapshot(snapshot_path)
+            except (ValueError, EOFError, TypeError):
+                pass
+        store = cls.from_json(json_path)
+        try:
+            store.save_snapshot(snapshot_path)
+        except OSError:
+            pass
+        return store
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(len(self)):
+            yield self.row(row)
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """The card at a row id, in the normalized cards.json shape."""
+        c = self.columns
+        return {
+            "id": c["id"][row],
+            "name": c["name"][row],
+            "type": c["type"][row],
+            "rarity": c["rarity"][row],
+            "cost": c["cost"][row],
+            "attack": c["attack"][row],
+            "health": c["health"][row],
+            "keywords": list(c["keywords"][row]),
+            "text": c["text"][row],
+            "set": {"code": c["set_code"][row], "name": c["set_name"][row], "number": c["number"][row]},
+            "image": {"url": c["image_url"][row]},
+            "difficulty": c["difficulty"][row],
+            "control": c["control"][row],
+            "speed": c["speed"][row],
+            "damage": c["damage"][row],
+            "zone": c["zone"][row],
+            "block": {"modifier": c["block"][row], "zone": c["block_zone"][row]},
+        }
+
+    def get(self, card_id: str) -> Optional[Dict[str, Any]]:
+        rows = self.indexes["id"].get(card_id)
+        return self.row(rows[0]) if rows else None
+
+    def values(self, field: str) -> List[str]:
+        """Distinct values of an indexed field."""
+        return sorted(self.indexes[field])
+
+    def _index_rows(self, field: str, value: Any) -> List[int]:
+        index = self.indexes[field]
+        values = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        if field == "keyword":
+            values = [v.lower() for v in values]
+        elif field == "number":
+            values = [str(v) for v in values]
+        if len(values) == 1:
+            return list(index.get(values[0], ()))
+        rows = set()
+        for v in values:
+            rows.update(index.get(v, ()))
+        return sorted(rows)
+
+    def ids_where(self, **filters: Any) -> List[int]:
+        """Row ids matching every filter, in database order.
+
+        Indexed fields (id, type, rarity, set_code, set_name, set, number,
+        keyword) are answered from the indexes; any other column is scanned.
+        A list, tuple or set value matches any of its members; set matches
+        either the set code or the set name.
+        """
+        candidates: List[List[int]] = []
+        scans = []
+        for field, value in filters.items():
+            if field == "set":
+                candidates.append(sorted(set(self._index_rows("set_code", value)) | set(self._index_rows("set_name", value))))
+            elif field in self.indexes:
+                candidates.append(self._index_rows(field, value))
+            elif field in self.columns:
+                scans.append((self.columns[field], value if isinstance(value, (list, tuple, set, frozenset)) else (value,)))
+            else:
+                raise KeyError(f"Unknown card field: {field}")
+
+        if candidates:
+            candidates.sort(key=len)
+            rows = candidates[0]
+            for other in candidates[1:]:
+                if not rows:
+                    break
+                keep = set(other)
+                rows = [r for r in rows if r in keep]
+        else:
+            rows = range(len(self))
+        return [r for r in rows if all(column[r] in allowed for column, allowed in scans)]
+
+    @staticmethod
+    def parse_filters(raw: Dict[str, Iterable[str]]) -> Dict[str, Any]:
+        """ids_where() filters from text values, e.g. a query string: comma-separated
+        values match any member, numeric columns take integers and "null" matches a missing value.
+
+        Raises ValueError for a non-integer value on a numeric column.
+        """
+        filters: Dict[str, Any] = {}
+        for field, values in raw.items():
+            members: List[Any] = [v for value in values for v in value.split(",")]
+            if field in NUMERIC:
+                try:
+                    members = [None if v.strip().lower() in ("null", "none", "") else int(v) for v in members]
+                except ValueError:
+                    raise ValueError(f"{field} must be an integer or null") from None
+            filters[field] = members[0] if len(members) == 1 else members
+        return filters
+
+    def where(self, **filters: Any) -> List[Dict[str, Any]]:
+        return [self.row(r) for r in self.ids_where(**filters)]
+
+    def count(self, **filters: Any) -> int:
+        return len(self.ids_where(**filters))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the binary card store snapshot and run a query")
+    parser.add_argument("--cards", default="card_db/cards.json")
+    parser.add_argument("--snapshot", default=None, help="Defaults to cards.snapshot next to --cards")
+    parser.add_argument("filters", nargs="*", help="field=value filters, e.g. type=Attack keyword=Breaker")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = CardStore.load(args.cards, args.snapshot)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"Loaded {len(store)} cards in {elapsed:.1f} ms", file=sys.stderr)
+
+    filters = CardStore.parse_filters({field: [value] for field, value in (f.split("=", 1) for f in args.filters)})
+    if filters:
+        print(json.dumps(store.where(**filters), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
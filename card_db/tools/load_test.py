@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Load test for card_server.py: requests per second and latency percentiles.
+
+Runs --connections keep-alive clients for --duration seconds, each issuing a
+mix of by-id, batch and filtered requests with ids and filter values drawn
+from the database. With --revalidate clients send If-None-Match for bodies
+they have seen, the way a browser does, so most answers are 304s.
+
+    python3 card_db/tools/load_test.py --url http://127.0.0.1:8780 --cards card_db/cards.json
+    python3 card_db/tools/load_test.py --cards card_db/cards.json      # starts a server in-process
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from card_server import CardServer, CardService
+from card_store import CardStore
+
+# Share of requests per endpoint
+MIX = (("card", 0.6), ("batch", 0.2), ("filter", 0.2))
+
+
+def build_targets(store: CardStore, count: int, seed: int) -> List[Tuple[str, str]]:
+    """(kind, target) pairs sampled from the card ids and indexed values of the database."""
+    rng = random.Random(seed)
+    ids = store.columns["id"]
+    filters = [("type", v) for v in store.values("type")] + [("rarity", v) for v in store.values("rarity")] + [("keyword", v) for v in store.values("keyword")]
+    kinds = [kind for kind, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    targets = []
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "card" or not filters:
+            targets.append(("card", "/cards/" + quote(rng.choice(ids))))
+        elif kind == "batch":
+            batch = rng.sample(ids, min(len(ids), rng.randint(5, 25)))
+            targets.append(("batch", "/cards/batch?ids=" + ",".join(quote(i) for i in batch)))
+        else:
+            field, value = rng.choice(filters)
+            targets.append(("filter", f"/cards?{field}={quote(value)}&limit=20&offset={rng.choice([0, 0, 20, 40])}"))
+    return targets
+
+
+async def client(host: str, port: int, targets: List[Tuple[str, str]], deadline: float, revalidate: bool, gzip: bool, latencies: List[float], statuses: Dict[int, int], counters: Dict[str, int], rng: random.Random) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    etags: Dict[str, str] = {}
+    try:
+        while time.perf_counter() < deadline:
+            _, target = rng.choice(targets)
+            headers = f"GET {target} HTTP/1.1\r\nHost: {host}\r\n"
+            if gzip:
+                headers += "Accept-Encoding: gzip\r\n"
+            if revalidate and target in etags:
+                headers += f"If-None-Match: {etags[target]}\r\n"
+            started = time.perf_counter()
+            writer.write((headers + "\r\n").encode("latin-1"))
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            status = int(lines[0].split(" ", 2)[1])
+            length = 0
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                name = name.lower()
+                if name == "content-length":
+                    length = int(value)
+                elif name == "etag":
+                    etags[target] = value.strip()
+            if length:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+            counters["bytes"] += length
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run(url: str, targets: List[Tuple[str, str]], connections: int, duration: float, revalidate: bool, gzip: bool, seed: int) -> Dict[str, Any]:
+    parts = urlsplit(url)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    counters = {"bytes": 0}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(client(parts.hostname, parts.port or 80, targets, deadline, revalidate, gzip, latencies, statuses, counters, random.Random(seed + i)) for i in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_ms": {"p50": ms(percentile(latencies, 0.5)), "p95": ms(percentile(latencies, 0.95)), "p99": ms(percentile(latencies, 0.99)), "max": ms(latencies[-1] if latencies else None)},
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "bytes": counters["bytes"],
+        "connections": connections,
+        "revalidate": revalidate,
+        "gzip": gzip,
+    }
+
+
+def start_local_server(cards_path: str, cache_size: int) -> str:
+    """Run a CardServer on a free port in a background thread; returns its base URL."""
+    ready = threading.Event()
+    holder: Dict[str, str] = {}
+
+    def serve() -> None:
+        async def main() -> None:
+            server = await CardServer(CardService(cards_path, cache_size=cache_size), port=0).start()
+            holder["url"] = server.base_url
+            ready.set()
+            await server.server.serve_forever()
+
+        asyncio.run(main())
+
+    threading.Thread(target=serve, name="card-server", daemon=True).start()
+    ready.wait()
+    return holder["url"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the card data service")
+    parser.add_argument("--url", default=None, help="Server to test; without it a server is started in-process")
+    parser.add_argument("--cards", default="card_db/cards.json", help="Database the request targets are drawn from")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--targets", type=int, default=2000, help="Distinct request targets in the mix")
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match for bodies already seen")
+    parser.add_argument("--no-gzip", action="store_true")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Cache size of the in-process server")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    store = CardStore.load(args.cards)
+    targets = build_targets(store, args.targets, args.seed)
+    url = args.url or start_local_server(args.cards, args.cache_size)
+    report = asyncio.run(run(url, targets, args.connections, args.duration, args.revalidate, not args.no_gzip, args.seed))
+    report["url"] = url
+    print(json.dumps(report, indent=2))
+    return 0 if report["requests"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
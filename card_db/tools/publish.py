@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Publish cards.json as per-set shards with a versioned manifest.
+
+Each shard holds one set's cards and is named after its content hash, so an
+unchanged set keeps its URL and clients serve it from cache. Every run diffs
+the new database against the previous publish by card id and content hash,
+bumps the manifest version only when something changed, and writes .gz and
+(when the brotli module is installed) .br files next to each shard for
+servers that serve precompressed assets. Shards of the last --keep-versions
+distinct versions stay on disk for clients that still hold an older manifest.
+
+    python3 card_db/tools/publish.py --cards card_db/cards.json --out-dir cards
+
+The default out-dir, cards/ at the repository root, is what the game loads
+from the site (CARD_SHARDS_URL in index.html).
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli output is optional
+    brotli = None
+
+MANIFEST_NAME = "manifest.json"
+STATE_NAME = "publish_state.json"
+DEFAULT_KEEP_VERSIONS = 2
+
+
+def card_hash(card: Dict[str, Any]) -> str:
+    payload = json.dumps(card, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def shard_key(card: Dict[str, Any]) -> str:
+    set_info = card.get("set") or {}
+    label = set_info.get("code") or set_info.get("name") or "unsorted"
+    return re.sub(r"[^a-z0-9]+", "-", label.lower()).strip("-") or "unsorted"
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def diff_cards(previous: Dict[str, str], current: Dict[str, str]) -> Dict[str, List[str]]:
+    """Card ids added, changed and removed between two id -> content hash maps."""
+    return {
+        "added": sorted(c for c in current if c not in previous),
+        "changed": sorted(c for c in current if c in previous and previous[c] != current[c]),
+        "removed": sorted(c for c in previous if c not in current),
+    }
+
+
+def publish(cards: List[Dict[str, Any]], out_dir: str, keep_versions: int = DEFAULT_KEEP_VERSIONS) -> Dict[str, Any]:
+    shard_dir = os.path.join(out_dir, "shards")
+    os.makedirs(shard_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    state_path = os.path.join(out_dir, STATE_NAME)
+
+    previous_manifest: Dict[str, Any] = {"version": 0, "shards": {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous_manifest = json.load(f)
+    state: Dict[str, Any] = {"hashes": {}, "versions": {}}
+    if os.path.exists(state_path):
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if "hashes" not in state:
+            # Older state files were the bare id -> hash map
+            state = {"hashes": state, "versions": {}}
+    previous_hashes: Dict[str, str] = state["hashes"]
+
+    groups: Dict[str, List[Dict[str, Any]]] = OrderedDict()
+    hashes: Dict[str, str] = {}
+    for card in cards:
+        groups.setdefault(shard_key(card), []).append(card)
+        if card.get("id"):
+            hashes[card["id"]] = card_hash(card)
+    changes = diff_cards(previous_hashes, hashes)
+
+    shards: Dict[str, Dict[str, Any]] = {}
+    for key, group in groups.items():
+        body = json.dumps(group, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        name = f"{key}.{digest[:12]}.json"
+        path = os.path.join(shard_dir, name)
+        entry = {"file": f"shards/{name}", "hash": digest, "cards": len(group), "bytes": len(body)}
+        if not os.path.exists(path):
+            write_atomic(path, body)
+        gz_path = path + ".gz"
+        if not os.path.exists(gz_path):
+            write_atomic(gz_path, gzip.compress(body, compresslevel=9, mtime=0))
+        entry["gzip_bytes"] = os.path.getsize(gz_path)
+        if brotli is not None:
+            br_path = path + ".br"
+            if not os.path.exists(br_path):
+                write_atomic(br_path, brotli.compress(body, quality=11))
+            entry["br_bytes"] = os.path.getsize(br_path)
+        shards[key] = entry
+
+    changed_shards = sorted(k for k, v in shards.items() if previous_manifest["shards"].get(k, {}).get("hash") != v["hash"])
+    dirty = bool(changed_shards) or set(shards) != set(previous_manifest["shards"])
+    manifest = {
+        "version": previous_manifest["version"] + 1 if dirty else previous_manifest["version"],
+        "generated_at": int(time.time()) if dirty else previous_manifest.get("generated_at"),
+        "card_count": len(cards),
+        "shards": shards,
+        "changes": {key: len(ids) for key, ids in changes.items()} if dirty else previous_manifest.get("changes", {}),
+    }
+    # Shard files of each distinct version, newest last; a no-op republish leaves the list as it was
+    versions: Dict[str, List[str]] = state.get("versions", {})
+    if previous_manifest["version"] and str(previous_manifest["version"]) not in versions:
+        versions[str(previous_manifest["version"])] = sorted(s["file"] for s in previous_manifest["shards"].values())
+    versions[str(manifest["version"])] = sorted(s["file"] for s in shards.values())
+    versions = {v: versions[v] for v in sorted(versions, key=int)[-max(1, keep_versions):]}
+
+    write_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8"))
+    write_atomic(state_path, json.dumps({"hashes": hashes, "versions": versions}, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+
+    # Keep the shards of recent versions for clients that still hold their manifests
+    keep = {os.path.basename(f) for files in versions.values() for f in files}
+    for name in os.listdir(shard_dir):
+        base = re.sub(r"\.(gz|br)$", "", name)
+        if base not in keep and not name.endswith(".tmp"):
+            os.remove(os.path.join(shard_dir, name))
+
+    return {"manifest": manifest, "changes": changes, "changed_shards": changed_shards}
+
+
+def transfer_report(result: Dict[str, Any], monolith_path: Optional[str]) -> str:
+    """Bytes a returning client downloads with the monolithic file versus the changed shards."""
+    shards = result["manifest"]["shards"]
+    changed = result["changed_shards"]
+    lines = []
+    if monolith_path and os.path.exists(monolith_path):
+        with open(monolith_path, "rb") as f:
+            raw = f.read()
+        lines.append(f"Monolithic {os.path.basename(monolith_path)}: {len(raw) / 1024:.1f} KB raw, {len(gzip.compress(raw)) / 1024:.1f} KB gzip on every load")
+    total_raw = sum(s["bytes"] for s in shards.values())
+    total_gz = sum(s["gzip_bytes"] for s in shards.values())
+    delta_raw = sum(shards[k]["bytes"] for k in changed)
+    delta_gz = sum(shards[k]["gzip_bytes"] for k in changed)
+    lines.append(f"All {len(shards)} shards (first load): {total_raw / 1024:.1f} KB raw, {total_gz / 1024:.1f} KB gzip")
+    lines.append(f"Changed shards ({len(changed)}) for a returning client: {delta_raw / 1024:.1f} KB raw, {delta_gz / 1024:.1f} KB gzip")
+    return "\n".join(lines)
+
+
+def startup_report(result: Dict[str, Any], out_dir: str, monolith_path: Optional[str], bandwidth_mbps: float = 10.0, rtt_ms: float = 50.0) -> str:
+    """Modelled client startup: gzip transfer at bandwidth_mbps plus round trips, and measured JSON parse time.
+
+    The monolithic load is one request for cards.json. A sharded cold load is
+    the manifest, then every shard in parallel; a returning client fetches the
+    manifest and only the changed shards, and parses the rest from its cache.
+    """
+    def parse_seconds(blobs: List[bytes]) -> float:
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            for blob in blobs:
+                json.loads(blob)
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    def transfer(gzip_bytes: int, round_trips: int) -> float:
+        return gzip_bytes * 8 / (bandwidth_mbps * 1e6) + round_trips * rtt_ms / 1000
+
+    shards = result["manifest"]["shards"]
+    bodies = {}
+    for key, shard in shards.items():
+        with open(os.path.join(out_dir, shard["file"]), "rb") as f:
+            bodies[key] = f.read()
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(manifest_path, "rb") as f:
+        manifest_body = f.read()
+    manifest_gz = len(gzip.compress(manifest_body))
+    parse_all = parse_seconds([manifest_body] + list(bodies.values()))
+    changed = result["changed_shards"]
+
+    rows = []
+    if monolith_path and os.path.exists(monolith_path):
+        with open(monolith_path, "rb") as f:
+            raw = f.read()
+        rows.append(("monolithic cards.json", transfer(len(gzip.compress(raw)), 1), parse_seconds([raw])))
+    rows.append(("shards, first load", transfer(manifest_gz + sum(s["gzip_bytes"] for s in shards.values()), 2), parse_all))
+    rows.append((f"shards, returning ({len(changed)} changed)", transfer(manifest_gz + sum(shards[k]["gzip_bytes"] for k in changed), 2 if changed else 1), parse_all))
+    lines = [f"Startup at {bandwidth_mbps:g} Mbit/s, {rtt_ms:g} ms RTT (transfer modelled, parse measured):"]
+    for name, fetch, parse in rows:
+        lines.append(f"  {name:32s} {(fetch + parse) * 1000:8.0f} ms = {fetch * 1000:.0f} ms transfer + {parse * 1000:.0f} ms parse")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Publish cards.json as versioned, precompressed per-set shards")
+    parser.add_argument("--cards", default="card_db/cards.json")
+    parser.add_argument("--out-dir", default="cards", help="Served directory the game loads manifest.json and shards/ from")
+    parser.add_argument("--keep-versions", type=int, default=DEFAULT_KEEP_VERSIONS, help="Distinct versions whose shards stay on disk")
+    parser.add_argument("--bandwidth-mbps", type=float, default=10.0, help="Client bandwidth for the startup estimate")
+    parser.add_argument("--rtt-ms", type=float, default=50.0, help="Client round-trip time for the startup estimate")
+    args = parser.parse_args()
+
+    with open(args.cards, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    cards = data.get("cards", []) if isinstance(data, dict) else data
+
+    result = publish(cards, args.out_dir, args.keep_versions)
+    changes = result["changes"]
+    print(
+        f"Manifest v{result['manifest']['version']}: {len(changes['added'])} added, {len(changes['changed'])} changed, "
+        f"{len(changes['removed'])} removed; {len(result['changed_shards'])} shards rewritten",
+        file=sys.stderr,
+    )
+    print(transfer_report(result, args.cards), file=sys.stderr)
+    print(startup_report(result, args.out_dir, args.cards, args.bandwidth_mbps, args.rtt_ms), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
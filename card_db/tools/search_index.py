@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Full-text inverted index with BM25 ranking over card names, keywords and rules text.
+
+The persisted file (search_index.json, next to cards.json) keeps each card's
+content hash and weighted term frequencies; postings are rebuilt from those on
+load. Re-indexing a new ingest only re-tokenizes cards whose hash changed.
+
+    index = SearchIndex.load("card_db/search_index.json")
+    index.update(cards)
+    index.search("breaker pow")   # last term is prefix-matched
+
+export_web() writes a compact postings file the browser can score directly.
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+INDEX_VERSION = 1
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+# A term in the name counts three times as much as one in the rules text
+FIELD_WEIGHTS = (("name", 3), ("keywords", 2), ("text", 1))
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def card_fields(card: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "name": card.get("name") or "",
+        "keywords": " ".join(card.get("keywords") or []),
+        "text": card.get("text") or "",
+    }
+
+
+def content_hash(card: Dict[str, Any]) -> str:
+    payload = json.dumps(card_fields(card), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def term_frequencies(card: Dict[str, Any]) -> Dict[str, int]:
+    fields = card_fields(card)
+    tf: Dict[str, int] = defaultdict(int)
+    for field, weight in FIELD_WEIGHTS:
+        for token in tokenize(fields[field]):
+            tf[token] += weight
+    return dict(tf)
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        # card id -> {"hash": content hash, "tf": {term: weighted frequency}}
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.terms: List[str] = []
+        self.doc_lengths: Dict[str, int] = {}
+        self.total_len = 0
+
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        index = cls()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                index.docs = data["docs"]
+        index._rebuild_postings()
+        return index
+
+    def save(self, path: str) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "docs": self.docs}, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _rebuild_postings(self) -> None:
+        postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for card_id, doc in self.docs.items():
+            for term, tf in doc["tf"].items():
+                postings[term][card_id] = tf
+            self.doc_lengths[card_id] = sum(doc["tf"].values())
+        self.postings = dict(postings)
+        self.terms = sorted(self.postings)
+        self.total_len = sum(self.doc_lengths.values())
+
+    def _remove(self, card_id: str) -> None:
+        doc = self.docs.pop(card_id)
+        for term in doc["tf"]:
+            posting = self.postings[term]
+            del posting[card_id]
+            if not posting:
+                del self.postings[term]
+        self.total_len -= self.doc_lengths.pop(card_id)
+
+    def _add(self, card_id: str, digest: str, tf: Dict[str, int]) -> None:
+        self.docs[card_id] = {"hash": digest, "tf": tf}
+        for term, count in tf.items():
+            self.postings.setdefault(term, {})[card_id] = count
+        self.doc_lengths[card_id] = sum(tf.values())
+        self.total_len += self.doc_lengths[card_id]
+
+    def update(self, cards: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Bring the index in line with cards, touching only added, changed and removed cards."""
+        seen = set()
+        added = changed = 0
+        for card in cards:
+            card_id = card.get("id")
+            if not card_id or card_id in seen:
+                continue
+            seen.add(card_id)
+            digest = content_hash(card)
+            existing = self.docs.get(card_id)
+            if existing is not None:
+                if existing["hash"] == digest:
+                    continue
+                self._remove(card_id)
+                changed += 1
+            else:
+                added += 1
+            self._add(card_id, digest, term_frequencies(card))
+        removed = [card_id for card_id in self.docs if card_id not in seen]
+        for card_id in removed:
+            self._remove(card_id)
+        if added or changed or removed:
+            self.terms = sorted(self.postings)
+        return {"added": added, "changed": changed, "removed": len(removed), "unchanged": len(seen) - added - changed}
+
+    def expand(self, token: str, prefix: bool) -> List[str]:
+        """Index terms matching a query token, either exactly or as a prefix."""
+        if not prefix:
+            return [token] if token in self.postings else []
+        start = bisect.bisect_left(self.terms, token)
+        end = bisect.bisect_left(self.terms, token + "\uffff", start)
+        return self.terms[start:end]
+
+    def search(self, query: str, limit: int = 20, require_all: bool = True) -> List[Tuple[str, float]]:
+        """Rank cards for a query with BM25.
+
+        The last query term, and any term ending in '*', also matches index
+        terms it is a prefix of; each query term scores its best expansion.
+        With require_all a card must match every query term.
+        """
+        raw = query.lower().split()
+        tokens: List[Tuple[str, bool]] = []
+        for i, word in enumerate(raw):
+            parts = tokenize(word)
+            for j, part in enumerate(parts):
+                last = j == len(parts) - 1
+                tokens.append((part, last and (word.endswith("*") or i == len(raw) - 1)))
+        if not tokens or not self.docs:
+            return []
+
+        n_docs = len(self.docs)
+        avgdl = self.total_len / n_docs
+        per_token: List[Dict[str, float]] = []
+        for token, prefix in tokens:
+            best: Dict[str, float] = {}
+            for term in self.expand(token, prefix):
+                posting = self.postings[term]
+                idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for card_id, tf in posting.items():
+                    score = self._bm25(idf, tf, card_id, avgdl)
+                    if score > best.get(card_id, 0.0):
+                        best[card_id] = score
+            per_token.append(best)
+
+        if require_all:
+            candidates = set(per_token[0])
+            for best in per_token[1:]:
+                candidates &= set(best)
+        else:
+            candidates = set().union(*per_token)
+        scored = [(card_id, sum(best.get(card_id, 0.0) for best in per_token)) for card_id in candidates]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def _bm25(self, idf: float, tf: int, card_id: str, avgdl: float) -> float:
+        dl = self.doc_lengths.get(card_id, 0)
+        return idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avgdl))
+
+    def export_web(self, path: str) -> None:
+        """Write a compact browser index: card ids, doc lengths and [doc, tf] postings per term."""
+        ids = sorted(self.docs)
+        ordinal = {card_id: i for i, card_id in enumerate(ids)}
+        data = {
+            "version": INDEX_VERSION,
+            "k1": K1,
+            "b": B,
+            "ids": ids,
+            "lengths": [self.doc_lengths[card_id] for card_id in ids],
+            "terms": {term: sorted([ordinal[c], tf] for c, tf in self.postings[term].items()) for term in self.terms},
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build or update the card search index and optionally run a query")
+    parser.add_argument("--cards", default="card_db/cards.json")
+    parser.add_argument("--index", default=None, help="Defaults to search_index.json next to --cards")
+    parser.add_argument("--web-export", default=None, help="Also write the browser index here, e.g. card_db/search_index.web.json")
+    parser.add_argument("--query", default=None)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.cards, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    cards = data.get("cards", []) if isinstance(data, dict) else data
+
+    index_path = args.index or os.path.join(os.path.dirname(args.cards), "search_index.json")
+    index = SearchIndex.load(index_path)
+    stats = index.update(cards)
+    index.save(index_path)
+    print(f"Indexed {len(index.docs)} cards ({stats['added']} added, {stats['changed']} changed, {stats['removed']} removed)", file=sys.stderr)
+    if args.web_export:
+        index.export_web(args.web_export)
+
+    if args.query:
+        names = {card.get("id"): card.get("name") for card in cards}
+        for card_id, score in index.search(args.query, limit=args.limit):
+            print(f"{score:7.3f}  {card_id}  {names.get(card_id)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
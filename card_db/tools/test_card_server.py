@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test Card Server
+Verifies the by-id, batch and filter endpoints, the response cache, ETag/304 and gzip over a real socket
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+
+from card_server import CardServer, CardService
+from test_card_store import sample_cards
+
+
+def make_service(tmp, count=300):
+    path = os.path.join(tmp, "cards.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(sample_cards(count), f)
+    return CardService(path)
+
+
+def body(response):
+    return json.loads(response.body)
+
+
+def test_endpoints():
+    """By-id, batch and filtered/paginated queries answer from the card store"""
+    with tempfile.TemporaryDirectory() as tmp:
+        service = make_service(tmp)
+        assert body(service.handle("GET", "/cards/card_7"))["id"] == "card_7"
+        assert service.handle("GET", "/cards/nope").status == 404
+        batch = body(service.handle("GET", "/cards/batch?ids=card_3,nope,card_1"))
+        assert [c["id"] for c in batch["cards"]] == ["card_3", "card_1"] and batch["missing"] == ["nope"]
+        posted = body(service.handle("POST", "/cards/batch", json.dumps({"ids": ["card_2"]}).encode()))
+        assert [c["id"] for c in posted["cards"]] == ["card_2"]
+        assert service.handle("POST", "/cards/batch", b"[1]").status == 400
+
+        expected = service.store.where(type=["Attack", "Action"], rarity="Rare")
+        page = body(service.handle("GET", "/cards?type=Attack,Action&rarity=Rare&limit=5&offset=2"))
+        assert page["total"] == len(expected)
+        assert page["cards"] == expected[2:7]
+        assert service.handle("GET", "/cards?colour=red").status == 400
+
+        # Numeric columns are compared as integers, "null" matches a missing value
+        cheap = body(service.handle("GET", "/cards?cost=2&limit=500"))
+        assert cheap["total"] == len(service.store.where(cost=2)) > 0
+        assert all(card["cost"] == 2 for card in cheap["cards"])
+        either = body(service.handle("GET", "/cards?cost=1,null&limit=0"))["total"]
+        assert either == len(service.store.where(cost=[1, None]))
+        assert service.handle("GET", "/cards?cost=two").status == 400
+        assert len(body(service.handle("GET", "/cards.json"))) == 300
+
+
+def test_cache_and_reload():
+    """Repeated requests hit the cache; rewriting cards.json reloads the store and drops it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        service = make_service(tmp)
+        first = service.handle("GET", "/cards?type=Attack&limit=3")
+        assert service.handle("GET", "/cards?limit=3&type=Attack") is first
+        assert service.hits == 1 and service.misses == 1
+        with open(service.cards_path, "w", encoding="utf-8") as f:
+            json.dump(sample_cards(10, seed=1), f)
+        os.utime(service.cards_path, (service.mtime + 5, service.mtime + 5))
+        service.maybe_reload(service.checked + 10)
+        assert len(service.store) == 10 and not service.cache
+
+
+async def _fetch(port, target, headers=""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n{headers}\r\n".encode())
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    fields = {k.lower(): v.strip() for k, v in (line.split(":", 1) for line in lines[1:])}
+    return status, fields, payload
+
+
+def test_http_etag_and_gzip():
+    """Over HTTP, gzip is negotiated and a matching If-None-Match gets a 304 without a body"""
+    async def scenario(service):
+        server = await CardServer(service, port=0).start()
+        try:
+            status, fields, payload = await _fetch(server.port, "/cards?limit=50", "Accept-Encoding: gzip\r\n")
+            assert status == 200 and fields["content-encoding"] == "gzip"
+            assert json.loads(gzip.decompress(payload))["limit"] == 50
+            status, fields, payload = await _fetch(server.port, "/cards?limit=50", f"If-None-Match: {fields['etag']}\r\n")
+            assert status == 304 and payload == b""
+            status, fields, payload = await _fetch(server.port, "/cards/card_1")
+            assert status == 200 and json.loads(payload)["id"] == "card_1"
+        finally:
+            await server.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(scenario(make_service(tmp)))
+
+
+def main():
+    """Main test function"""
+    test_endpoints()
+    test_cache_and_reload()
+    test_http_etag_and_gzip()
+    print("✅ Card server verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test Card Store
+Verifies indexed queries and the binary snapshot against plain list filtering
+"""
+
+import os
+import random
+import tempfile
+
+from card_store import CardStore
+
+TYPES = ["Attack", "Action", "Asset", "Foundation", "Character"]
+RARITIES = ["Common", "Uncommon", "Rare", "Ultra Rare"]
+SETS = [("MHA", "My Hero Academia"), ("SF", "Street Fighter"), (None, "Promo Set")]
+KEYWORDS = ["Breaker", "Powerful", "Charge", "Fury", "Ally"]
+
+
+def sample_cards(count, seed=7):
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        code, name = rng.choice(SETS)
+        cards.append({
+            "id": f"card_{i}",
+            "name": f"Card {i}",
+            "type": rng.choice(TYPES),
+            "rarity": rng.choice(RARITIES),
+            "cost": rng.choice([None, 1, 2, 3]),
+            "attack": None,
+            "health": None,
+            "keywords": rng.sample(KEYWORDS, rng.randint(0, 2)),
+            "text": None,
+            "set": {"code": code, "name": name, "number": str(i % 200)},
+            "image": {"url": None},
+            "difficulty": rng.choice([None, 0, 4]),
+            "control": rng.choice([None, 3, 5]),
+            "speed": None,
+            "damage": None,
+            "zone": None,
+            "block": {"modifier": rng.choice([None, 2]), "zone": rng.choice([None, "mid", "low"])},
+        })
+    return cards
+
+
+def test_where_matches_linear_filter():
+    """Indexed queries return the same cards, in order, as a list scan"""
+    cards = sample_cards(2000)
+    store = CardStore.from_cards(cards)
+    assert len(store) == len(cards)
+    expected = [c for c in cards if c["type"] == "Attack" and "Breaker" in c["keywords"]]
+    assert store.where(type="Attack", keyword="breaker") == expected
+    expected = [c for c in cards if c["rarity"] in ("Rare", "Ultra Rare") and c["set"]["name"] == "Street Fighter" and c["cost"] == 2]
+    assert store.where(rarity=["Rare", "Ultra Rare"], set="Street Fighter", cost=2) == expected
+    assert store.count(set="MHA") == sum(1 for c in cards if c["set"]["code"] == "MHA")
+    assert store.where(number=5, type="Nope") == []
+    assert store.get("card_42") == cards[42]
+
+
+def test_snapshot_round_trip():
+    """A saved snapshot reloads to the same columns and indexes"""
+    store = CardStore.from_cards(sample_cards(500))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cards.snapshot")
+        store.save_snapshot(path)
+        loaded = CardStore.from_snapshot(path)
+    assert list(loaded) == list(store)
+    assert loaded.ids_where(type="Asset", keyword="Ally") == store.ids_where(type="Asset", keyword="Ally")
+
+
+def main():
+    """Main test function"""
+    test_where_matches_linear_filter()
+    test_snapshot_round_trip()
+    print("✅ Card store queries and snapshot verified")
+
+
+if __name__ == "__main__":
+    main()
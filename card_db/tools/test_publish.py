@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test Shard Publishing
+Verifies that unchanged sets keep their shard files and only changes bump the manifest version
+"""
+
+import copy
+import gzip
+import json
+import os
+import tempfile
+
+from publish import brotli, publish, startup_report
+
+
+def sample_cards():
+    cards = []
+    for code in ("MHA", "SF", None):
+        for i in range(20):
+            cards.append({
+                "id": f"{code or 'promo'}_{i}",
+                "name": f"Card {i}",
+                "type": "Attack",
+                "keywords": [],
+                "set": {"code": code, "name": "Promo Set" if code is None else f"Set {code}", "number": str(i)},
+            })
+    return cards
+
+
+def test_publish_versions_and_shards():
+    """A re-run without changes keeps the version; one changed card rewrites one shard"""
+    cards = sample_cards()
+    with tempfile.TemporaryDirectory() as tmp:
+        first = publish(cards, tmp)
+        assert first["manifest"]["version"] == 1
+        assert sorted(first["manifest"]["shards"]) == ["mha", "promo-set", "sf"]
+        assert len(first["changes"]["added"]) == len(cards)
+
+        again = publish(cards, tmp)
+        assert again["manifest"]["version"] == 1
+        assert again["changed_shards"] == []
+
+        updated = copy.deepcopy(cards)
+        updated[0]["text"] = "Errata"
+        second = publish(updated, tmp)
+        assert second["manifest"]["version"] == 2
+        assert second["changed_shards"] == ["mha"]
+        assert second["changes"]["changed"] == ["MHA_0"]
+        assert second["manifest"]["shards"]["sf"] == first["manifest"]["shards"]["sf"]
+
+        shard = second["manifest"]["shards"]["mha"]
+        path = os.path.join(tmp, shard["file"])
+        with open(path, "rb") as f:
+            body = f.read()
+        with gzip.open(path + ".gz", "rb") as f:
+            assert f.read() == body
+        assert json.loads(body)[0]["text"] == "Errata"
+        # The version 1 shard stays for clients that still hold the old manifest, also after a no-op republish
+        v1_shard = os.path.join(tmp, first["manifest"]["shards"]["mha"]["file"])
+        assert os.path.exists(v1_shard)
+        assert publish(updated, tmp)["manifest"]["version"] == 2
+        assert os.path.exists(v1_shard) and os.path.exists(v1_shard + ".gz")
+
+        # A third distinct version drops version 1 with the default of two kept versions
+        updated[20]["text"] = "Errata"
+        third = publish(updated, tmp)
+        assert third["manifest"]["version"] == 3
+        assert not os.path.exists(v1_shard)
+        assert os.path.exists(os.path.join(tmp, second["manifest"]["shards"]["mha"]["file"]))
+        # mha v2, sf v1 and v3, promo: each with its compressed copies
+        assert len(os.listdir(os.path.join(tmp, "shards"))) == 4 * (3 if brotli else 2)
+
+
+def test_startup_report():
+    """The startup estimate covers the monolithic file, a first sharded load and a returning client"""
+    cards = sample_cards()
+    with tempfile.TemporaryDirectory() as tmp:
+        monolith = os.path.join(tmp, "cards.json")
+        with open(monolith, "w", encoding="utf-8") as f:
+            json.dump(cards, f)
+        out = os.path.join(tmp, "cards")
+        publish(cards, out)
+        cards[0]["text"] = "Errata"
+        report = startup_report(publish(cards, out), out, monolith).splitlines()
+        assert [line.split()[0] for line in report[1:]] == ["monolithic", "shards,", "shards,"]
+        assert "returning (1 changed)" in report[3]
+
+
+def main():
+    """Main test function"""
+    test_publish_versions_and_shards()
+    test_startup_report()
+    print("✅ Shard publishing verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test Search Index
+Verifies BM25 ranking, prefix matching and incremental updates
+"""
+
+import os
+import tempfile
+
+from search_index import SearchIndex
+
+CARDS = [
+    {"id": "kick", "name": "Full Power Kick", "keywords": ["Breaker", "Powerful"], "text": "Breaker 2; Powerful. E: Commit 1 foundation: +1 speed."},
+    {"id": "punch", "name": "Quick Punch", "keywords": ["Ally"], "text": "R: After this attack deals damage, draw 1 card."},
+    {"id": "wall", "name": "Power Wall", "keywords": [], "text": "Your blocks get +1 speed."},
+    {"id": "shield", "name": "Shield", "keywords": ["Breaker"], "text": None},
+]
+
+
+def test_ranking_and_prefix():
+    """Name matches outrank text matches, and the last term is a prefix"""
+    index = SearchIndex()
+    index.update(CARDS)
+    assert {card_id for card_id, _ in index.search("power")} == {"kick", "wall"}
+    assert [card_id for card_id, _ in index.search("breaker pow")] == ["kick"]
+    assert {card_id for card_id, _ in index.search("breaker")} == {"kick", "shield"}
+    assert index.search("speed", require_all=False)
+    assert index.search("nothing here") == []
+
+
+def test_incremental_update_matches_rebuild():
+    """Updating a saved index gives the same postings as building from scratch"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search_index.json")
+        index = SearchIndex()
+        index.update(CARDS)
+        index.save(path)
+
+        changed = [dict(CARDS[0], text="Breaker 3."), CARDS[1], CARDS[3], {"id": "new", "name": "Power Surge", "keywords": [], "text": None}]
+        reloaded = SearchIndex.load(path)
+        stats = reloaded.update(changed)
+        assert stats == {"added": 1, "changed": 1, "removed": 1, "unchanged": 2}
+
+        fresh = SearchIndex()
+        fresh.update(changed)
+        assert reloaded.postings == fresh.postings
+        assert reloaded.total_len == fresh.total_len
+        assert reloaded.search("power") == fresh.search("power")
+
+
+def main():
+    """Main test function"""
+    test_ranking_and_prefix()
+    test_incremental_update_matches_rebuild()
+    print("✅ Search index verified")
+
+
+if __name__ == "__main__":
+    main()
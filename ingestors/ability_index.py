@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+UVS Ability Index Builder
+Categorizes every card's abilities once at ingest time and writes a compact
+abilities_index.json keyed by card id, so the game only does lookups during play
+"""
+
+import argparse
+import json
+import os
+
+from ability_system import AbilitySystem
+
+# Index field name for each parsed field; the index uses the game's JS naming
+INDEX_FIELDS = {
+    'cost': 'cost',
+    'condition': 'condition',
+    'trigger': 'trigger',
+    'effect': 'effect',
+    'original_text': 'originalText'
+}
+
+# The game file holding the AbilitySystem the index must agree with and the GAME_DATA it plays
+GAME_JS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game_startup_with_abilities.js')
+
+
+class GameAbilitySystem(AbilitySystem):
+    """AbilitySystem that also reads 'Enhance ...' and 'Response ...' without a colon, as the game's parseAbility does"""
+
+    def _parse_normalized(self, ability_text):
+        if ability_text.startswith('Enhance '):
+            parsed = self.parse_enhance_ability('Enhance:' + ability_text[8:])
+        elif ability_text.startswith('Response '):
+            parsed = self.parse_response_ability('Response:' + ability_text[9:])
+        else:
+            return super()._parse_normalized(ability_text)
+        parsed['original_text'] = ability_text
+        return parsed
+
+
+def card_abilities(card):
+    """Ability lines for a card: its abilities list, or one line per rules text line"""
+    abilities = card.get('abilities')
+    if abilities is not None:
+        return abilities
+    text = card.get('text') or ''
+    return [line for line in text.split('\n') if line.strip()]
+
+
+def load_game_cards(game_js=GAME_JS):
+    """The character and deck cards of the game's GAME_DATA, which carry the game's own card ids"""
+    with open(game_js, 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('{', source.index('const GAME_DATA = '))
+    game_data, _ = json.JSONDecoder().raw_decode(source, start)
+    cards = [game_data['character']]
+    for group in game_data['deck'].values():
+        cards.extend(group)
+    return cards
+
+
+def compact_ability(parsed):
+    """Keep only the fields that are set; the category list implies the type"""
+    return {INDEX_FIELDS[k]: v for k, v in parsed.items() if k in INDEX_FIELDS and v is not None}
+
+
+def build_ability_index(cards, ability_system=None):
+    """Map card id -> {enhances, responses, static} for every card with abilities"""
+    ability_system = ability_system or GameAbilitySystem()
+    index = {}
+    for card in cards:
+        card_id = card.get('id')
+        if not card_id:
+            continue
+        categorized = ability_system.categorize_card_abilities({'abilities': card_abilities(card)})
+        entry = {
+            category: [compact_ability(parsed) for parsed in parsed_list]
+            for category, parsed_list in categorized.items()
+            if parsed_list
+        }
+        if entry:
+            # JSON object keys are strings; the game looks integer ids up as strings too
+            index[str(card_id)] = entry
+    return index
+
+
+def write_ability_index(cards, output_path, game_js=None):
+    """Build the index, plus the cards of the game's GAME_DATA when game_js is given, and write it without whitespace"""
+    if game_js:
+        cards = list(cards) + load_game_cards(game_js)
+    index = build_ability_index(cards)
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, output_path)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build abilities_index.json from the normalized card database')
+    parser.add_argument('--cards', default='card_db/cards.json')
+    parser.add_argument('--output', default=None, help='Defaults to abilities_index.json next to --cards')
+    parser.add_argument('--game-js', default=GAME_JS, help='Also index the GAME_DATA cards of this game file under their ids')
+    parser.add_argument('--no-game-data', action='store_true', help='Index only the cards in --cards')
+    args = parser.parse_args()
+
+    with open(args.cards, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    cards = data.get('cards', []) if isinstance(data, dict) else data
+
+    output_path = args.output or os.path.join(os.path.dirname(args.cards), 'abilities_index.json')
+    index = write_ability_index(cards, output_path, None if args.no_game_data else args.game_js)
+    print(f"Indexed abilities for {len(index)} of {len(cards)} cards in {output_path}")
+
+
+if __name__ == "__main__":
+    main()
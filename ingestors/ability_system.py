@@ -4,22 +4,69 @@ UVS Ability System - Basic Version
 Handles card abilities based on conditions and costs
 """
 
+import functools
 import json
 import re
 
 class AbilitySystem:
-    def __init__(self):
+    def __init__(self, cache_size=4096):
+        # Parsed abilities are memoized on their normalized text; None means unbounded, 0 disables
+        self.cache_size = cache_size
+        self._parse_cached = functools.lru_cache(maxsize=cache_size)(self._parse_normalized)
         self.enhance_costs = ['Commit', 'Flip', 'Discard', 'Remove', 'Destroy', 'Clear']
         self.enhance_conditions = ['If this attack deals damage', 'If this attack is blocked', 'If you have']
         self.response_triggers = ['After this attack deals damage', 'After your attack resolves', 'At the start of']
+        self.compile_matchers()
+    
+    def compile_matchers(self):
+        """Precompute lowercased phrase tables for costs, conditions and triggers
+        
+        Call again after changing enhance_costs, enhance_conditions or response_triggers.
+        """
+        self._cost_table = tuple((phrase.lower(), phrase) for phrase in self.enhance_costs)
+        self._condition_table = tuple((phrase.lower(), phrase) for phrase in self.enhance_conditions)
+        self._trigger_table = tuple((phrase.lower(), phrase) for phrase in self.response_triggers)
+        self.clear_cache()
+    
+    def clear_cache(self):
+        """Drop all memoized parses and reset the hit/miss counters"""
+        self._parse_cached.cache_clear()
+    
+    def cache_stats(self):
+        """Hit/miss counters and size of the parse cache"""
+        info = self._parse_cached.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0
+        }
+    
+    @staticmethod
+    def normalize_ability_text(ability_text):
+        """Normalized cache key; parsing only ever sees the stripped text"""
+        return ability_text.strip()
+    
+    @staticmethod
+    def _first_phrase(table, lowered):
+        """Return the first phrase in table contained in the already-lowercased text"""
+        for phrase_lower, phrase in table:
+            if phrase_lower in lowered:
+                return phrase
+        return None
     
     def parse_ability(self, ability_text):
         """Parse an ability text and categorize it"""
         if not ability_text or not isinstance(ability_text, str):
             return None
-            
-        ability_text = ability_text.strip()
         
+        # Copy so callers can modify the result without touching the cached entry
+        return dict(self._parse_cached(self.normalize_ability_text(ability_text)))
+    
+    def _parse_normalized(self, ability_text):
+        """Parse an already normalized ability text"""
         # Enhance abilities
         if ability_text.startswith('E:') or ability_text.startswith('Enhance:'):
             return self.parse_enhance_ability(ability_text)
@@ -41,24 +88,13 @@ class AbilitySystem:
         else:
             text = ability_text
             
-        # Check for costs
-        cost = None
-        for cost_type in self.enhance_costs:
-            if cost_type.lower() in text.lower():
-                cost = cost_type
-                break
-        
-        # Check for conditions
-        condition = None
-        for condition_type in self.enhance_conditions:
-            if condition_type.lower() in text.lower():
-                condition = condition_type
-                break
+        # Check for costs and conditions
+        lowered = text.lower()
         
         return {
             'type': 'enhance',
-            'cost': cost,
-            'condition': condition,
+            'cost': self._first_phrase(self._cost_table, lowered),
+            'condition': self._first_phrase(self._condition_table, lowered),
             'effect': text,
             'original_text': ability_text
         }
@@ -73,15 +109,11 @@ class AbilitySystem:
             text = ability_text
             
         # Check for triggers
-        trigger = None
-        for trigger_type in self.response_triggers:
-            if trigger_type.lower() in text.lower():
-                trigger = trigger_type
-                break
+        lowered = text.lower()
         
         return {
             'type': 'response',
-            'trigger': trigger,
+            'trigger': self._first_phrase(self._trigger_table, lowered),
             'effect': text,
             'original_text': ability_text
         }
@@ -106,6 +138,11 @@ class AbilitySystem:
                     categorized['static'].append(parsed)
         
         return categorized
+    
+    def categorize_many(self, cards):
+        """Categorize the abilities of every card, in order"""
+        categorize = self.categorize_card_abilities
+        return [categorize(card) for card in cards]
 
 def main():
     """Test the ability system"""
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Monte Carlo evaluation of deck lists with the headless game engine, across cores.
+
+Every pair of decks plays seeded games in batches on a process pool. Card data
+and decks are loaded once per worker by the pool initializer, so a task is
+just (pair, first seed, game count) and a batch result is a handful of sums.
+Batches are merged in submission order, which makes the aggregates and the
+stopping point depend only on the seed and batch size, not on worker count
+or scheduling. After each merge a JSON line with the running estimates and
+their confidence intervals is printed; a pair stops once its win rate
+interval is narrower than --tolerance (after --min-games).
+
+    python3 ingestors/deck_eval.py --cards card_db/cards.json --deck decks/aggro.json --deck decks/control.json --max-games 20000
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import combinations
+from statistics import NormalDist
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from game_engine import AGENTS, CardPool, Game
+
+# Sums per deck (index 0 and 1 of a pair) carried by a batch result
+SIDE_FIELDS = ("wins", "attacks", "damage", "damage_sq", "attacks_sq", "damage_attacks", "blocks_attempted", "blocks_succeeded")
+
+# Per-worker state set up by init_worker
+_POOL: Optional[CardPool] = None
+_DECKS: List[Any] = []
+_AGENTS: Tuple[str, str] = ("greedy", "greedy")
+
+
+def init_worker(cards_path: Optional[str], abilities_path: Optional[str], cards: Optional[List[Dict[str, Any]]], decks: Sequence[Any], agents: Tuple[str, str]) -> None:
+    """Build the card pool and decks once per process; tasks only name a pair and seeds."""
+    global _POOL, _DECKS, _AGENTS
+    _POOL = CardPool.load(cards_path, abilities_path) if cards_path else CardPool.from_cards(cards or [])
+    _DECKS = [_POOL.deck(spec) for spec in decks]
+    _AGENTS = agents
+
+
+def run_batch(pair: Tuple[int, int], first_seed: int, games: int) -> Dict[str, Any]:
+    """Play games seeded first_seed.. with the first player alternating by seed; return their sums."""
+    a, b = pair
+    decks = [_DECKS[a], _DECKS[b]]
+    agents = [AGENTS[name]() for name in _AGENTS]
+    sides = [dict.fromkeys(SIDE_FIELDS, 0) for _ in range(2)]
+    draws = 0
+    for seed in range(first_seed, first_seed + games):
+        result = Game(_POOL, decks, agents, seed=seed, first_player=seed % 2).play()
+        if result.winner is None:
+            draws += 1
+        for i, side in enumerate(sides):
+            attacks, damage = result.attacks[i], result.damage[i]
+            side["wins"] += result.winner == i
+            side["attacks"] += attacks
+            side["damage"] += damage
+            side["damage_sq"] += damage * damage
+            side["attacks_sq"] += attacks * attacks
+            side["damage_attacks"] += damage * attacks
+            side["blocks_attempted"] += result.blocks_attempted[i]
+            side["blocks_succeeded"] += result.blocks_succeeded[i]
+    return {"pair": pair, "games": games, "draws": draws, "sides": sides}
+
+
+def wilson_interval(successes: int, trials: int, z: float) -> Optional[Tuple[float, float]]:
+    """Wilson score interval for a binomial proportion."""
+    if not trials:
+        return None
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def ratio_interval(side: Dict[str, float], games: int, z: float) -> Optional[Tuple[float, float, float]]:
+    """Mean damage per attack with a delta-method interval, treating each game as one sample."""
+    attacks = side["attacks"]
+    if not attacks or games < 2:
+        return None
+    ratio = side["damage"] / attacks
+    mean_attacks = attacks / games
+    # Sample variance of (damage_i - ratio * attacks_i) over games
+    residual = side["damage_sq"] - 2 * ratio * side["damage_attacks"] + ratio * ratio * side["attacks_sq"]
+    variance = max(0.0, residual / (games - 1))
+    half = z * math.sqrt(variance / games) / mean_attacks
+    return ratio, ratio - half, ratio + half
+
+
+class PairEstimate:
+    """Running sums for one deck pair, merged batch by batch."""
+
+    def __init__(self, pair: Tuple[int, int]) -> None:
+        self.pair = pair
+        self.games = 0
+        self.draws = 0
+        self.sides = [dict.fromkeys(SIDE_FIELDS, 0) for _ in range(2)]
+        self.next_seed = 0
+        self.done = False
+
+    def merge(self, batch: Dict[str, Any]) -> None:
+        self.games += batch["games"]
+        self.draws += batch["draws"]
+        for mine, theirs in zip(self.sides, batch["sides"]):
+            for key in SIDE_FIELDS:
+                mine[key] += theirs[key]
+
+    def win_interval(self, z: float) -> Optional[Tuple[float, float]]:
+        # Draws count as half a win so the two sides' rates sum to one
+        return wilson_interval(self.sides[0]["wins"] + self.draws / 2, self.games, z)
+
+    def converged(self, z: float, tolerance: float, min_games: int) -> bool:
+        interval = self.win_interval(z)
+        return self.games >= min_games and interval is not None and (interval[1] - interval[0]) / 2 <= tolerance
+
+    def report(self, z: float, names: Sequence[str]) -> Dict[str, Any]:
+        interval = self.win_interval(z)
+        decks = []
+        for i, side in enumerate(self.sides):
+            ratio = ratio_interval(side, self.games, z)
+            blocks = wilson_interval(side["blocks_succeeded"], side["blocks_attempted"], z)
+            decks.append({
+                "deck": names[self.pair[i]],
+                "wins": side["wins"],
+                "attacks": side["attacks"],
+                "mean_damage_per_attack": _round(ratio[0]) if ratio else None,
+                "mean_damage_per_attack_ci": [_round(ratio[1]), _round(ratio[2])] if ratio else None,
+                "block_success_rate": _round(side["blocks_succeeded"] / side["blocks_attempted"]) if side["blocks_attempted"] else None,
+                "block_success_rate_ci": [_round(v) for v in blocks] if blocks else None,
+            })
+        return {
+            "pair": [names[i] for i in self.pair],
+            "games": self.games,
+            "draws": self.draws,
+            "win_rate": _round((self.sides[0]["wins"] + self.draws / 2) / self.games) if self.games else None,
+            "win_rate_ci": [_round(v) for v in interval] if interval else None,
+            "converged": self.done,
+            "decks": decks,
+        }
+
+
+def _round(value: float) -> float:
+    return round(value, 4)
+
+
+def evaluate(decks: Sequence[Any], names: Sequence[str], cards_path: Optional[str] = None, abilities_path: Optional[str] = None, cards: Optional[List[Dict[str, Any]]] = None, agents: Tuple[str, str] = ("greedy", "greedy"), workers: int = 1, batch_size: int = 200, min_games: int = 1000, max_games: int = 20000, tolerance: float = 0.01, confidence: float = 0.95, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield a running report per merged batch, then one final report per pair.
+
+    Pair k plays seeds seed + k * max_games onwards, so pairs never share games.
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    pairs = list(combinations(range(len(decks)), 2))
+    estimates = {pair: PairEstimate(pair) for pair in pairs}
+    for k, pair in enumerate(pairs):
+        estimates[pair].next_seed = seed + k * max_games
+    initargs = (cards_path, abilities_path, None if cards_path else cards, list(decks), tuple(agents))
+
+    def next_task(estimate: PairEstimate) -> Optional[Tuple[Tuple[int, int], int, int]]:
+        base = seed + pairs.index(estimate.pair) * max_games
+        remaining = base + max_games - estimate.next_seed
+        if estimate.done or remaining <= 0:
+            return None
+        count = min(batch_size, remaining)
+        task = (estimate.pair, estimate.next_seed, count)
+        estimate.next_seed += count
+        return task
+
+    def finish(estimate: PairEstimate, batch: Dict[str, Any]) -> Dict[str, Any]:
+        estimate.merge(batch)
+        if estimate.converged(z, tolerance, min_games):
+            estimate.done = True
+        report = estimate.report(z, names)
+        report["final"] = estimate.done or estimate.games >= max_games
+        estimate.done = report["final"]
+        return report
+
+    if workers <= 1:
+        init_worker(*initargs)
+        for estimate in estimates.values():
+            while True:
+                task = next_task(estimate)
+                if task is None:
+                    break
+                yield finish(estimate, run_batch(*task))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=initargs) as executor:
+        # One FIFO of in-flight batches per pair, merged strictly in order
+        in_flight: Dict[Tuple[int, int], List[Future]] = {pair: [] for pair in pairs}
+        for estimate in estimates.values():
+            for _ in range(workers * 2):
+                task = next_task(estimate)
+                if task is None:
+                    break
+                in_flight[estimate.pair].append(executor.submit(run_batch, *task))
+        while any(in_flight.values()):
+            for pair, queue in in_flight.items():
+                if not queue:
+                    continue
+                batch = queue.pop(0).result()
+                estimate = estimates[pair]
+                if estimate.done:
+                    continue
+                yield finish(estimate, batch)
+                if estimate.done:
+                    for future in queue:
+                        future.cancel()
+                    queue.clear()
+                    continue
+                task = next_task(estimate)
+                if task is not None:
+                    queue.append(executor.submit(run_batch, *task))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Estimate win rates, damage per attack and block success between deck lists")
+    parser.add_argument("--cards", default="card_db/cards.json")
+    parser.add_argument("--abilities", default=None)
+    parser.add_argument("--deck", action="append", required=True, help="Deck JSON file; every pair of decks is evaluated")
+    parser.add_argument("--agents", default="greedy,greedy", help=f"Agents for the first and second deck of a pair, from {', '.join(AGENTS)}")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--min-games", type=int, default=1000)
+    parser.add_argument("--max-games", type=int, default=20000)
+    parser.add_argument("--tolerance", type=float, default=0.01, help="Stop a pair once its win rate CI half-width is at most this")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quiet", action="store_true", help="Only print the final report per pair")
+    args = parser.parse_args()
+
+    decks = []
+    for path in args.deck:
+        with open(path, "r", encoding="utf-8") as f:
+            decks.append(json.load(f))
+    if len(decks) == 1:
+        decks.append(decks[0])
+        args.deck.append(args.deck[0])
+    names = [os.path.splitext(os.path.basename(path))[0] for path in args.deck]
+
+    started = time.perf_counter()
+    games = 0
+    for report in evaluate(decks, names, args.cards, args.abilities, agents=tuple(args.agents.split(",")), workers=args.workers, batch_size=args.batch_size, min_games=args.min_games, max_games=args.max_games, tolerance=args.tolerance, confidence=args.confidence, seed=args.seed):
+        if report["final"]:
+            games += report["games"]
+        if report["final"] or not args.quiet:
+            print(json.dumps(report), flush=True)
+    elapsed = time.perf_counter() - started
+    print(f"Played {games} games in {elapsed:.1f}s ({games / elapsed:.0f} games/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,699 @@
+#!/usr/bin/env python3
+"""Headless UVS rules engine for simulating games without a browser.
+
+Mirrors the turn structure and attack sequence of index.html (playCard,
+startAttackSequence, useFoundationEnhance, attemptBlock, startDamageStep,
+distributeCardPool) with no alerts or DOM: all randomness comes from one
+seeded random.Random, so a seed and two deck lists always replay the same game.
+
+    pool = CardPool.load("card_db/cards.json")
+    game = Game(pool, [deck_a, deck_b], [GreedyAgent(), GreedyAgent()], seed=7)
+    result = game.play()
+
+Card stats are read the way the browser helpers read them (getCardSpeed and
+friends): nested attack/block objects first, then flattened fields, with the
+same defaults, so the cards.json written by scrape_uvsultra (flat control,
+speed, damage and zone, a nested block) loads as is. Stats the rules cannot do
+without (every card's check, and an attack's speed, damage and zone) are
+required instead of defaulting, so a card whose page lacks them fails to load
+rather than playing at zero speed from the Mid zone. Enhances come from AbilitySystem output, either an
+abilities_index.json mapping or one built from the cards on load, and are
+compiled once per card into (kind, amount) pairs so the game loop never looks
+at ability text. Only foundation enhances are simulated.
+
+State objects use __slots__ and zones are plain lists with the top of the deck
+at the end, which keeps a game in the low hundreds of microseconds.
+"""
+import argparse
+import cProfile
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ability_index import build_ability_index
+
+DEFAULT_VITALITY = 20
+DEFAULT_HAND_SIZE = 7
+CARD_POOL_LIMIT = 10
+MAX_TURNS = 200
+
+HAND_SIZE_RE = re.compile(r"Hand size (\d+)", re.I)
+VITALITY_RE = re.compile(r"Vitality (\d+)", re.I)
+MODIFIER_RE = re.compile(r"([+-]\d+) (damage|speed)", re.I)
+
+DECK_SIZE = 50
+# Cards in the --benchmark pool, parsed from the scraper's fixture pages
+BENCHMARK_CARD_COUNT = 12
+
+# Enhance kinds, in the order the browser checks the ability text
+DAMAGE = "damage"
+SPEED = "speed"
+SHUFFLE_DISCARD = "shuffle_discard"
+CHECK_BONUS = "check_bonus"
+MOMENTUM_ON_DAMAGE = "momentum_on_damage"
+MOMENTUM_TO_HAND = "momentum_to_hand"
+DRAW = "draw"
+
+
+def compile_enhance(text: str) -> Optional[Tuple[str, int]]:
+    """(kind, amount) for an enhance effect the engine simulates, else None."""
+    match = MODIFIER_RE.search(text)
+    if match:
+        return match.group(2).lower(), int(match.group(1))
+    if "Shuffle up to 3 cards" in text:
+        return SHUFFLE_DISCARD, 3
+    if "Your next check to play a card gets +1" in text:
+        return CHECK_BONUS, 1
+    if "add the top card of your deck to your momentum" in text:
+        return MOMENTUM_ON_DAMAGE, 1
+    if "add 1 card from your momentum to your hand" in text:
+        return MOMENTUM_TO_HAND, 1
+    if "draw 1 card" in text.lower():
+        return DRAW, 1
+    return None
+
+
+def _zone(value: Any) -> str:
+    return str(value).strip().title() if value else "Mid"
+
+
+def _first(*values: Any) -> Any:
+    """The first value that is set; unlike `or`, a 0 stat counts as set."""
+    for value in values:
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def _number(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class CardDef:
+    """Immutable game stats of one card, shared by every copy in every game."""
+
+    __slots__ = ("id", "name", "type", "difficulty", "check", "speed", "damage", "zone", "block", "block_zone", "enhance", "hand_size", "vitality")
+
+    def __init__(self, id: str, name: str, type: str, difficulty: int = 0, check: int = 0, speed: int = 0, damage: int = 0, zone: str = "Mid", block: int = 0, block_zone: str = "Mid", enhance: Optional[Tuple[str, int]] = None, hand_size: int = DEFAULT_HAND_SIZE, vitality: int = DEFAULT_VITALITY) -> None:
+        self.id = id
+        self.name = name
+        self.type = type
+        self.difficulty = difficulty
+        self.check = check
+        self.speed = speed
+        self.damage = damage
+        self.zone = zone
+        self.block = block
+        self.block_zone = block_zone
+        self.enhance = enhance
+        self.hand_size = hand_size
+        self.vitality = vitality
+
+    @classmethod
+    def from_card(cls, card: Dict[str, Any], abilities: Optional[Dict[str, Any]] = None) -> "CardDef":
+        """Stats from a card record plus its abilities_index entry.
+
+        Raises ValueError naming the missing fields when the record lacks a
+        stat the rules need.
+        """
+        attack = card.get("attack")
+        attack = attack if isinstance(attack, dict) else {"damage": attack}
+        block = card.get("block")
+        block = block if isinstance(block, dict) else {"modifier": block}
+        type_ = card.get("type") or "Card"
+        check = _first(card.get("control"), card.get("check"))
+        speed = _first(attack.get("speed"), card.get("speed"))
+        damage = _first(attack.get("damage"), card.get("damage"))
+        zone = _first(attack.get("zone"), card.get("zone"))
+        required = {"check": check}
+        if type_ == "Attack":
+            required.update(speed=speed, damage=damage, zone=zone)
+        missing = [name for name, value in required.items() if value is None and type_ != "Character"]
+        if missing:
+            raise ValueError(f"{card.get('id')}: {type_} card has no {', '.join(missing)}")
+        text = card.get("text") or ""
+        hand_size = HAND_SIZE_RE.search(text)
+        vitality = VITALITY_RE.search(text)
+        enhance = None
+        for parsed in (abilities or {}).get("enhances", []):
+            enhance = compile_enhance(parsed.get("effect") or "")
+            if enhance is not None:
+                break
+        return cls(
+            id=card["id"],
+            name=card.get("name") or card["id"],
+            type=type_,
+            difficulty=_number(card.get("difficulty", card.get("cost"))),
+            check=_number(check),
+            speed=_number(speed),
+            damage=_number(damage),
+            zone=_zone(zone),
+            block=_number(block.get("modifier")),
+            block_zone=_zone(block.get("zone") or card.get("blockZone")),
+            enhance=enhance,
+            hand_size=int(hand_size.group(1)) if hand_size else _number(card.get("handSize")) or DEFAULT_HAND_SIZE,
+            vitality=int(vitality.group(1)) if vitality else _number(card.get("vitality")) or DEFAULT_VITALITY,
+        )
+
+    def __repr__(self) -> str:
+        return f"CardDef({self.id!r}, {self.type})"
+
+
+class CardPool:
+    """CardDefs by id, built once from the normalized card database."""
+
+    __slots__ = ("cards",)
+
+    def __init__(self, cards: Dict[str, CardDef]) -> None:
+        self.cards = cards
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[Dict[str, Any]], abilities_index: Optional[Dict[str, Any]] = None) -> "CardPool":
+        """Pool of every card with an id; raises ValueError if any lacks the stats the rules need."""
+        cards = [card for card in cards if card.get("id")]
+        if abilities_index is None:
+            abilities_index = build_ability_index(cards)
+        defs: Dict[str, CardDef] = {}
+        errors = []
+        for card in cards:
+            try:
+                defs[card["id"]] = CardDef.from_card(card, abilities_index.get(str(card["id"])))
+            except ValueError as exc:
+                errors.append(str(exc))
+        if errors:
+            raise ValueError(
+                f"{len(errors)} of {len(cards)} cards lack game stats ({'; '.join(errors[:3])}{'; ...' if len(errors) > 3 else ''}). "
+                "Simulation needs check on every card and speed, damage and zone on attacks, as in the game's card data "
+                "and in scrape_uvsultra output for card pages that list them."
+            )
+        return cls(defs)
+
+    @classmethod
+    def load(cls, cards_path: str, abilities_path: Optional[str] = None) -> "CardPool":
+        """Load cards.json and, if present, abilities_index.json next to it."""
+        with open(cards_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        cards = data.get("cards", []) if isinstance(data, dict) else data
+        abilities_path = abilities_path or os.path.join(os.path.dirname(cards_path), "abilities_index.json")
+        abilities_index = None
+        if os.path.exists(abilities_path):
+            with open(abilities_path, "r", encoding="utf-8") as f:
+                abilities_index = json.load(f)
+        return cls.from_cards(cards, abilities_index)
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def __getitem__(self, card_id: str) -> CardDef:
+        return self.cards[card_id]
+
+    def deck(self, spec: Any) -> List[CardDef]:
+        """A deck from a list of card ids or an {id: copies} mapping."""
+        if isinstance(spec, dict):
+            return [self.cards[card_id] for card_id, copies in spec.items() for _ in range(copies)]
+        return [self.cards[card_id] for card_id in spec]
+
+    def sample_deck(self, size: int = DECK_SIZE) -> Dict[str, int]:
+        """The first Character plus equal copies of every other card, about size cards in all."""
+        characters = [card.id for card in self.cards.values() if card.type == "Character"]
+        others = [card.id for card in self.cards.values() if card.type != "Character"]
+        deck = {card_id: max(1, size // len(others)) for card_id in others} if others else {}
+        if characters:
+            deck[characters[0]] = 1
+        return deck
+
+
+class Foundation:
+    __slots__ = ("card", "committed")
+
+    def __init__(self, card: CardDef) -> None:
+        self.card = card
+        self.committed = False
+
+
+class Player:
+    """One player's vitality and zones; the top of the deck is the end of the list."""
+
+    __slots__ = ("index", "health", "hand_size", "character", "deck", "hand", "card_pool", "foundations", "discard", "momentum", "assets", "characters", "scored", "check_bonus", "attacks", "damage_dealt", "blocks_attempted", "blocks_succeeded")
+
+    def __init__(self, index: int, deck: List[CardDef], character: Optional[CardDef]) -> None:
+        self.index = index
+        self.character = character
+        self.health = character.vitality if character else DEFAULT_VITALITY
+        self.hand_size = character.hand_size if character else DEFAULT_HAND_SIZE
+        self.deck = deck
+        self.hand: List[CardDef] = []
+        self.card_pool: List[CardDef] = []
+        self.foundations: List[Foundation] = []
+        self.discard: List[CardDef] = []
+        self.momentum: List[CardDef] = []
+        self.assets: List[CardDef] = []
+        self.characters: List[CardDef] = []
+        self.scored: List[CardDef] = []
+        self.check_bonus = 0
+        self.attacks = 0
+        self.damage_dealt = 0
+        self.blocks_attempted = 0
+        self.blocks_succeeded = 0
+
+    def ready(self) -> List[Foundation]:
+        return [f for f in self.foundations if not f.committed]
+
+    def commit(self, count: int) -> bool:
+        """Commit `count` ready foundations if there are enough."""
+        ready = self.ready()
+        if len(ready) < count:
+            return False
+        for foundation in ready[:count]:
+            foundation.committed = True
+        return True
+
+    def draw(self, count: int) -> None:
+        deck, hand = self.deck, self.hand
+        for _ in range(min(count, len(deck))):
+            hand.append(deck.pop())
+
+
+class AttackSequence:
+    __slots__ = ("attack", "attacker", "defender", "damage_modifier", "speed_modifier", "block", "blocked", "momentum_on_damage", "damage_dealt")
+
+    def __init__(self, attack: CardDef, attacker: Player, defender: Player) -> None:
+        self.attack = attack
+        self.attacker = attacker
+        self.defender = defender
+        self.damage_modifier = 0
+        self.speed_modifier = 0
+        self.block: Optional[CardDef] = None
+        self.blocked = False
+        self.momentum_on_damage = 0
+        self.damage_dealt = 0
+
+    @property
+    def speed(self) -> int:
+        # Speed can't go below 1
+        return max(1, self.attack.speed + self.speed_modifier)
+
+    @property
+    def damage(self) -> int:
+        return self.attack.damage + self.damage_modifier
+
+
+class GameResult:
+    __slots__ = ("winner", "reason", "turns", "seed", "attacks", "damage", "blocks_attempted", "blocks_succeeded")
+
+    def __init__(self, winner: Optional[int], reason: str, turns: int, seed: Any, players: Sequence[Player]) -> None:
+        self.winner = winner
+        self.reason = reason
+        self.turns = turns
+        self.seed = seed
+        self.attacks = tuple(p.attacks for p in players)
+        self.damage = tuple(p.damage_dealt for p in players)
+        self.blocks_attempted = tuple(p.blocks_attempted for p in players)
+        self.blocks_succeeded = tuple(p.blocks_succeeded for p in players)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def can_block(attack_zone: str, block_zone: str) -> bool:
+    """Same zone, or either zone Mid; High and Low are not adjacent."""
+    return attack_zone == block_zone or attack_zone == "Mid" or block_zone == "Mid"
+
+
+class Agent:
+    """Decision hooks called by Game; the base agent ends its turn and never enhances or blocks."""
+
+    def choose_play(self, game: "Game", player: Player) -> Optional[int]:
+        """Hand index of the card to play, or None to end the turn."""
+        return None
+
+    def choose_enhance(self, game: "Game", player: Player) -> Optional[int]:
+        """Foundation index to use for its enhance, or None to pass."""
+        return None
+
+    def choose_block(self, game: "Game", player: Player) -> Optional[int]:
+        """Hand index of the card to block with, or None to take the attack."""
+        return None
+
+
+class GreedyAgent(Agent):
+    """Plays the hardest-hitting attack it can likely pay for, builds foundations otherwise,
+    uses damage and speed enhances in its own favour and blocks whenever the check is within reach.
+
+    A difficulty is within reach when it is at most expected_check plus the ready foundations.
+    """
+
+    def __init__(self, expected_check: int = 3) -> None:
+        self.expected_check = expected_check
+
+    def choose_play(self, game: "Game", player: Player) -> Optional[int]:
+        if not player.deck or len(player.card_pool) >= CARD_POOL_LIMIT:
+            return None
+        budget = self.expected_check + len(player.ready()) + player.check_bonus - len(player.card_pool)
+        best = None
+        best_score = -1
+        for i, card in enumerate(player.hand):
+            if card.difficulty > budget:
+                continue
+            if card.type == "Attack":
+                score = 100 + card.damage
+            elif card.type == "Foundation":
+                score = 10
+            elif card.type == "Asset":
+                score = 5
+            else:
+                continue
+            if score > best_score:
+                best, best_score = i, score
+        return best
+
+    def choose_enhance(self, game: "Game", player: Player) -> Optional[int]:
+        attacking = player is game.sequence.attacker
+        for i, foundation in enumerate(player.foundations):
+            if foundation.committed or foundation.card.enhance is None:
+                continue
+            kind, amount = foundation.card.enhance
+            if kind == DAMAGE and attacking and amount > 0:
+                return i
+            if kind == SPEED and (amount > 0) == attacking:
+                return i
+        return None
+
+    def choose_block(self, game: "Game", player: Player) -> Optional[int]:
+        sequence = game.sequence
+        zone = sequence.attack.zone
+        best = None
+        best_key = None
+        for i, card in enumerate(player.hand):
+            if not can_block(zone, card.block_zone):
+                continue
+            # Prefer full blocks (same zone), then the lowest block modifier
+            key = (card.block_zone != zone, card.block)
+            if best_key is None or key < best_key:
+                best, best_key = i, key
+        if best is None:
+            return None
+        difficulty = sequence.speed + player.hand[best].block + len(player.card_pool)
+        return best if difficulty <= self.expected_check + len(player.ready()) else None
+
+
+class RandomAgent(Agent):
+    """Uniformly random legal choices drawn from the game's RNG, so games stay reproducible."""
+
+    def __init__(self, play_rate: float = 0.7, enhance_rate: float = 0.3, block_rate: float = 0.7) -> None:
+        self.play_rate = play_rate
+        self.enhance_rate = enhance_rate
+        self.block_rate = block_rate
+
+    def choose_play(self, game: "Game", player: Player) -> Optional[int]:
+        if not player.hand or not player.deck or game.rng.random() >= self.play_rate:
+            return None
+        return game.rng.randrange(len(player.hand))
+
+    def choose_enhance(self, game: "Game", player: Player) -> Optional[int]:
+        usable = [i for i, f in enumerate(player.foundations) if not f.committed and f.card.enhance is not None]
+        if not usable or game.rng.random() >= self.enhance_rate:
+            return None
+        return game.rng.choice(usable)
+
+    def choose_block(self, game: "Game", player: Player) -> Optional[int]:
+        zone = game.sequence.attack.zone
+        legal = [i for i, card in enumerate(player.hand) if can_block(zone, card.block_zone)]
+        if not legal or game.rng.random() >= self.block_rate:
+            return None
+        return game.rng.choice(legal)
+
+
+class Game:
+    """One seeded game between two decks; play() runs it to the end and returns a GameResult."""
+
+    __slots__ = ("rng", "seed", "players", "agents", "active", "turn", "first_player", "max_turns", "sequence", "winner", "reason")
+
+    def __init__(self, pool: CardPool, decks: Sequence[Any], agents: Sequence[Agent], seed: Any = 0, first_player: int = 0, max_turns: int = MAX_TURNS) -> None:
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.agents = agents
+        self.players = []
+        for index, spec in enumerate(decks):
+            deck = list(spec) if isinstance(spec, list) and spec and isinstance(spec[0], CardDef) else pool.deck(spec)
+            character = next((card for card in deck if card.type == "Character"), None)
+            if character is not None:
+                deck.remove(character)
+            self.rng.shuffle(deck)
+            self.players.append(Player(index, deck, character))
+        self.first_player = first_player
+        self.active = first_player
+        self.turn = 1
+        self.max_turns = max_turns
+        self.sequence: Optional[AttackSequence] = None
+        self.winner: Optional[int] = None
+        self.reason = ""
+
+    def play(self) -> GameResult:
+        for player in self.players:
+            player.draw(player.hand_size)
+        while self.winner is None:
+            if self.turn > self.max_turns:
+                self.reason = "turn_limit"
+                break
+            self.play_turn()
+        return GameResult(self.winner, self.reason, self.turn, self.seed, self.players)
+
+    def _end(self, winner: int, reason: str) -> None:
+        if self.winner is None:
+            self.winner = winner
+            self.reason = reason
+
+    def play_turn(self) -> None:
+        player = self.players[self.active]
+        # The first player skips the Start Phase on turn 1
+        if not (self.turn == 1 and self.active == self.first_player):
+            if not player.deck:
+                self._end(1 - self.active, "deck_out")
+                return
+            for foundation in player.foundations:
+                foundation.committed = False
+            player.draw(player.hand_size - len(player.hand))
+        agent = self.agents[self.active]
+        while self.winner is None:
+            index = agent.choose_play(self, player)
+            if index is None or not self.play_card(player, index):
+                break
+        self.end_turn(player)
+
+    def play_card(self, player: Player, index: int) -> bool:
+        """Play a card from hand; False means the turn is over (a failed check ends it)."""
+        if len(player.card_pool) >= CARD_POOL_LIMIT or not player.deck:
+            return False
+        card = player.hand[index]
+        required = card.difficulty + len(player.card_pool) - player.check_bonus
+        player.check_bonus = 0
+        check_card = player.deck.pop()
+        player.discard.append(check_card)
+        shortfall = required - check_card.check
+        if shortfall > 0 and not player.commit(shortfall):
+            # Forced turn end
+            return False
+        del player.hand[index]
+        player.card_pool.append(card)
+        if card.type == "Attack":
+            self.attack(player, card)
+        return True
+
+    def attack(self, attacker: Player, card: CardDef) -> None:
+        defender = self.players[1 - attacker.index]
+        sequence = self.sequence = AttackSequence(card, attacker, defender)
+        attacker.attacks += 1
+
+        # Enhance step: attacker first, alternating until both pass in a row
+        current = attacker
+        passes = 0
+        while passes < 2:
+            choice = self.agents[current.index].choose_enhance(self, current)
+            if choice is None:
+                passes += 1
+            else:
+                self.use_enhance(current, current.foundations[choice])
+                passes = 0
+            current = defender if current is attacker else attacker
+
+        # Block step
+        choice = self.agents[defender.index].choose_block(self, defender)
+        if choice is not None:
+            self.block(defender, choice)
+
+        # Damage step
+        damage = sequence.damage
+        if sequence.blocked:
+            damage = 0 if sequence.block.block_zone == card.zone else (damage + 1) // 2
+        damage = max(0, damage)
+        sequence.damage_dealt = damage
+        if damage:
+            defender.health -= damage
+            attacker.damage_dealt += damage
+            for _ in range(sequence.momentum_on_damage):
+                if attacker.deck:
+                    attacker.momentum.append(attacker.deck.pop())
+            if defender.health <= 0:
+                self._end(attacker.index, "vitality")
+            # Attacks that dealt damage go to momentum at the end of the turn
+            attacker.scored.append(card)
+        self.sequence = None
+
+    def use_enhance(self, player: Player, foundation: Foundation) -> None:
+        kind, amount = foundation.card.enhance
+        sequence = self.sequence
+        if kind == DAMAGE:
+            sequence.damage_modifier += amount
+        elif kind == SPEED:
+            sequence.speed_modifier += amount
+        elif kind == SHUFFLE_DISCARD:
+            if player.discard:
+                player.deck.extend(player.discard[-amount:])
+                del player.discard[-amount:]
+                self.rng.shuffle(player.deck)
+        elif kind == CHECK_BONUS:
+            player.check_bonus = amount
+        elif kind == MOMENTUM_ON_DAMAGE:
+            if player is sequence.attacker:
+                sequence.momentum_on_damage += amount
+        elif kind == MOMENTUM_TO_HAND:
+            if player.momentum:
+                player.hand.append(player.momentum.pop())
+        elif kind == DRAW:
+            player.draw(amount)
+        foundation.committed = True
+
+    def block(self, defender: Player, index: int) -> None:
+        sequence = self.sequence
+        card = defender.hand[index]
+        if not can_block(sequence.attack.zone, card.block_zone):
+            return
+        del defender.hand[index]
+        defender.card_pool.append(card)
+        defender.blocks_attempted += 1
+        difficulty = sequence.speed + card.block + len(defender.card_pool) - 1
+        check = 0
+        if defender.deck:
+            check_card = defender.deck.pop()
+            defender.discard.append(check_card)
+            check = check_card.check
+        shortfall = difficulty - check
+        if shortfall <= 0 or defender.commit(shortfall):
+            sequence.blocked = True
+            sequence.block = card
+            defender.blocks_succeeded += 1
+        else:
+            defender.card_pool.pop()
+            defender.discard.append(card)
+
+    def end_turn(self, player: Player) -> None:
+        for card in player.card_pool:
+            if card.type == "Foundation":
+                player.foundations.append(Foundation(card))
+            elif card.type == "Asset":
+                player.assets.append(card)
+            elif card.type == "Character":
+                player.characters.append(card)
+            elif card in player.scored:
+                player.scored.remove(card)
+                player.momentum.append(card)
+            else:
+                player.discard.append(card)
+        player.card_pool.clear()
+        defender = self.players[1 - player.index]
+        defender.discard.extend(defender.card_pool)
+        defender.card_pool.clear()
+        self.active = 1 - self.active
+        self.turn += 1
+
+
+AGENTS = {"greedy": GreedyAgent, "random": RandomAgent, "passive": Agent}
+
+
+def play_games(pool: CardPool, decks: Sequence[Any], games: int, seed: int = 0, agents: Sequence[str] = ("greedy", "greedy")) -> List[GameResult]:
+    """Play `games` games with seeds seed..seed+games-1, alternating the first player."""
+    prepared = [pool.deck(spec) for spec in decks]
+    players = [AGENTS[name]() for name in agents]
+    return [Game(pool, prepared, players, seed=seed + i, first_player=i % 2).play() for i in range(games)]
+
+
+def summarize(results: Sequence[GameResult]) -> Dict[str, Any]:
+    wins = [sum(1 for r in results if r.winner == i) for i in range(2)]
+    reasons: Dict[str, int] = {}
+    for r in results:
+        reasons[r.reason] = reasons.get(r.reason, 0) + 1
+    return {
+        "games": len(results),
+        "wins": wins,
+        "draws": len(results) - sum(wins),
+        "reasons": reasons,
+        "mean_turns": round(sum(r.turns for r in results) / len(results), 2) if results else None,
+    }
+
+
+def fixture_cards(count: int = BENCHMARK_CARD_COUNT) -> List[Dict[str, Any]]:
+    """Normalized cards scraped from the replay server's fixture pages, without a server or network."""
+    # The scraper and its replay catalog live in uvsultra/, next to this file
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "uvsultra"))
+    from replay_server import ReplayCatalog
+    from scrape_uvsultra import parse_card
+
+    catalog = ReplayCatalog(card_count=count)
+    config = {"base_url": "https://www.uvsultra.online", "extractor": "lxml"}
+    return [parse_card(catalog.card_page(i), config).to_normalized() for i in range(1, count + 1)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Play simulated UVS games between two deck lists")
+    parser.add_argument("--cards", default="card_db/cards.json")
+    parser.add_argument("--abilities", default=None, help="abilities_index.json; defaults to the one next to --cards, else built from the cards")
+    parser.add_argument("--deck", action="append", default=None, help="JSON list of card ids or {id: copies}; give twice, or once for a mirror match")
+    parser.add_argument("--agents", default="greedy,greedy", help=f"Two of {', '.join(AGENTS)}")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", default=None, help="Write cProfile stats for the run to this path")
+    parser.add_argument("--benchmark", action="store_true", help="Time the engine on cards scraped from the fixture pages instead of --cards and --deck")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        pool = CardPool.from_cards(fixture_cards())
+        decks = [pool.sample_deck()]
+    elif not args.deck:
+        parser.error("--deck is required unless --benchmark is given")
+    else:
+        pool = CardPool.load(args.cards, args.abilities)
+        decks = []
+        for path in args.deck:
+            with open(path, "r", encoding="utf-8") as f:
+                decks.append(json.load(f))
+    if len(decks) == 1:
+        decks.append(decks[0])
+    agents = args.agents.split(",")
+
+    profile = cProfile.Profile() if args.profile else None
+    started = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    results = play_games(pool, decks, args.games, args.seed, agents)
+    if profile is not None:
+        profile.disable()
+        profile.dump_stats(args.profile)
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(results)
+    summary["seconds"] = round(elapsed, 3)
+    summary["games_per_second"] = round(len(results) / elapsed, 1) if elapsed else None
+    print(json.dumps(summary, indent=2), file=sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,6 +8,19 @@ class AbilitySystem {
         this.enhanceCosts = ['Commit', 'Flip', 'Discard', 'Remove', 'Destroy', 'Clear'];
         this.enhanceConditions = ['If this attack deals damage', 'If this attack is blocked', 'If you have'];
         this.responseTriggers = ['After this attack deals damage', 'After your attack resolves', 'At the start of'];
+        this.index = null;
+    }
+    
+    // Use abilities precomputed at ingest time (card_db/abilities_index.json, keyed by card id)
+    loadIndex(index) {
+        this.index = {};
+        for (const [cardId, entry] of Object.entries(index || {})) {
+            this.index[cardId] = {
+                enhances: (entry.enhances || []).map(a => ({type: 'enhance', cost: null, condition: null, ...a})),
+                responses: (entry.responses || []).map(a => ({type: 'response', trigger: null, ...a})),
+                static: (entry.static || []).map(a => ({type: 'static', ...a}))
+            };
+        }
     }
     
     parseAbility(abilityText) {
@@ -98,6 +111,11 @@ class AbilitySystem {
     }
     
     categorizeCardAbilities(card) {
+        // Cards in the precomputed index are looked up, not parsed
+        if (this.index && card.id != null && this.index[card.id]) {
+            return this.index[card.id];
+        }
+        
         const abilities = card.abilities || [];
         const categorized = {
             enhances: [],
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Exact check, block and attack odds for a deck or the whole catalog, vectorized with NumPy.
+
+A check reveals the top card of the deck, so its value is distributed like the
+check values of the deck's cards. Everything here follows from that
+distribution and the game engine's rules:
+
+    play:    passes when check >= difficulty + cards in pool - ready foundations
+    block:   legal when zones match or either is Mid; passes when
+             check >= max(1, speed) + block modifier + defender's pool - ready foundations
+    damage:  full unblocked, none on a same-zone block, half (rounded up) otherwise
+    draw:    chance at least one copy is among the first N cards (hypergeometric)
+
+Stats are loaded once into arrays (OddsTable) and each question is answered for
+every card, pool size and blocker at once with broadcasting. The reference_*
+functions are plain-Python loops over the same rules, used by the tests and
+by the benchmark:
+
+    python3 ingestors/odds.py --cards card_db/cards.json --deck decks/aggro.json --benchmark
+
+NumPy is optional for the rest of the repo; without it only the reference
+functions work.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # the reference implementation works without NumPy
+    np = None
+
+from game_engine import CARD_POOL_LIMIT, CardDef, CardPool, can_block
+
+ZONE_CODES = {"High": 0, "Mid": 1, "Low": 2}
+MID = ZONE_CODES["Mid"]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for vectorized odds (pip install numpy)")
+
+
+def check_survival(checks: Sequence[int]) -> "np.ndarray":
+    """S[t] = P(check >= t) for t = 0 .. max(check) + 1, over a deck's check values."""
+    _require_numpy()
+    values = np.asarray(checks, dtype=np.int64)
+    if values.size == 0:
+        return np.zeros(1)
+    counts = np.bincount(np.maximum(values, 0))
+    # Reverse cumulative sum, then a trailing 0 for thresholds above every check
+    tail = np.cumsum(counts[::-1])[::-1] / values.size
+    return np.append(tail, 0.0)
+
+
+def pass_probability(survival: "np.ndarray", threshold: "np.ndarray") -> "np.ndarray":
+    """P(check >= threshold) elementwise; thresholds at or below 0 always pass."""
+    return survival[np.clip(threshold, 0, len(survival) - 1)]
+
+
+class OddsTable:
+    """Card stats as parallel arrays, one row per card."""
+
+    def __init__(self, cards: Sequence[CardDef]) -> None:
+        _require_numpy()
+        self.cards = list(cards)
+        self.ids = [card.id for card in self.cards]
+        self.row = {card_id: i for i, card_id in enumerate(self.ids)}
+        # Zones outside High/Mid/Low get codes of their own and only match themselves
+        codes = dict(ZONE_CODES)
+        for card in self.cards:
+            for zone in (card.zone, card.block_zone):
+                codes.setdefault(zone, len(codes))
+        self.difficulty = np.array([c.difficulty for c in self.cards], dtype=np.int64)
+        self.check = np.array([c.check for c in self.cards], dtype=np.int64)
+        self.speed = np.array([max(1, c.speed) for c in self.cards], dtype=np.int64)
+        self.damage = np.array([max(0, c.damage) for c in self.cards], dtype=np.int64)
+        self.block = np.array([c.block for c in self.cards], dtype=np.int64)
+        self.zone = np.array([codes[c.zone] for c in self.cards], dtype=np.int64)
+        self.block_zone = np.array([codes[c.block_zone] for c in self.cards], dtype=np.int64)
+        self.is_attack = np.array([c.type == "Attack" for c in self.cards])
+
+    @classmethod
+    def from_pool(cls, pool: CardPool) -> "OddsTable":
+        return cls(list(pool.cards.values()))
+
+    def rows(self, card_ids: Sequence[str]) -> "np.ndarray":
+        return np.array([self.row[card_id] for card_id in card_ids], dtype=np.int64)
+
+    def play_odds(self, deck_checks: Sequence[int], pool_sizes: Sequence[int] = range(CARD_POOL_LIMIT), foundations: int = 0) -> "np.ndarray":
+        """[card, pool size] probability that playing the card passes its check."""
+        survival = check_survival(deck_checks)
+        pools = np.asarray(pool_sizes, dtype=np.int64)
+        return pass_probability(survival, self.difficulty[:, None] + pools[None, :] - foundations)
+
+    def block_odds(self, deck_checks: Sequence[int], attacks: Optional["np.ndarray"] = None, blockers: Optional["np.ndarray"] = None, pool: int = 0, foundations: int = 0) -> Dict[str, "np.ndarray"]:
+        """[attack, blocker] matrices: legal, success probability and expected damage taken.
+
+        Illegal pairs have success 0 and take full damage.
+        """
+        attacks = np.flatnonzero(self.is_attack) if attacks is None else attacks
+        blockers = np.arange(len(self.cards)) if blockers is None else blockers
+        survival = check_survival(deck_checks)
+        a_zone = self.zone[attacks][:, None]
+        b_zone = self.block_zone[blockers][None, :]
+        legal = (a_zone == b_zone) | (a_zone == MID) | (b_zone == MID)
+        threshold = self.speed[attacks][:, None] + self.block[blockers][None, :] + pool - foundations
+        success = np.where(legal, pass_probability(survival, threshold), 0.0)
+        damage = self.damage[attacks][:, None]
+        blocked_damage = np.where(a_zone == b_zone, 0, (damage + 1) // 2)
+        expected = damage * (1 - success) + blocked_damage * success
+        return {"legal": legal, "success": success, "expected_damage": expected}
+
+    def zone_block_odds(self, deck_checks: Sequence[int], blockers: "np.ndarray", attacks: Optional["np.ndarray"] = None, pool: int = 0, foundations: int = 0) -> Dict[str, Dict[str, float]]:
+        """Per attack zone: mean success over legal (attack, blocker) pairs and share of pairs that are legal."""
+        attacks = np.flatnonzero(self.is_attack) if attacks is None else attacks
+        odds = self.block_odds(deck_checks, attacks, blockers, pool, foundations)
+        zones = self.zone[attacks]
+        summary = {}
+        for name, code in ZONE_CODES.items():
+            in_zone = zones == code
+            legal = odds["legal"][in_zone]
+            if not legal.size:
+                continue
+            summary[name] = {
+                "attacks": int(in_zone.sum()),
+                "legal_share": round(float(legal.mean()), 4),
+                "success": round(float(odds["success"][in_zone][legal].mean()), 4) if legal.any() else 0.0,
+                "expected_damage": round(float(odds["expected_damage"][in_zone].mean()), 4),
+            }
+        return summary
+
+    def attack_resolves(self, deck_ids: Sequence[str], hand_size: int, pool: int = 0, foundations: int = 0) -> Dict[str, float]:
+        """For each distinct attack in the deck: P(a copy is in an opening hand of hand_size) x P(its check passes)."""
+        distinct, copies = np.unique(self.rows(deck_ids), return_counts=True)
+        attacks = self.is_attack[distinct]
+        distinct, copies = distinct[attacks], copies[attacks]
+        drawn = draw_odds(copies, len(deck_ids), hand_size)
+        deck_checks = self.check[self.rows(deck_ids)]
+        passes = pass_probability(check_survival(deck_checks), self.difficulty[distinct] + pool - foundations)
+        return {self.ids[row]: float(p) for row, p in zip(distinct, drawn * passes)}
+
+
+def draw_odds(copies: "np.ndarray", deck_size: int, hand_size: int) -> "np.ndarray":
+    """P(at least one of `copies` cards is among hand_size cards drawn from deck_size), per entry."""
+    _require_numpy()
+    copies = np.asarray(copies, dtype=np.float64)
+    i = np.arange(min(hand_size, deck_size), dtype=np.float64)
+    # P(no copy) = prod_i (deck - copies - i) / (deck - i)
+    none = np.prod(np.clip((deck_size - copies[:, None] - i) / (deck_size - i), 0.0, None), axis=1)
+    return 1.0 - none
+
+
+def reference_pass(checks: Sequence[int], threshold: int) -> float:
+    return sum(1 for c in checks if c >= threshold) / len(checks) if checks else 0.0
+
+
+def reference_play_odds(cards: Sequence[CardDef], deck_checks: Sequence[int], pool_sizes: Sequence[int] = range(CARD_POOL_LIMIT), foundations: int = 0) -> List[List[float]]:
+    return [[reference_pass(deck_checks, card.difficulty + pool - foundations) for pool in pool_sizes] for card in cards]
+
+
+def reference_block_odds(attacks: Sequence[CardDef], blockers: Sequence[CardDef], deck_checks: Sequence[int], pool: int = 0, foundations: int = 0) -> List[List[Dict[str, float]]]:
+    rows = []
+    for attack in attacks:
+        row = []
+        damage = max(0, attack.damage)
+        for blocker in blockers:
+            legal = can_block(attack.zone, blocker.block_zone)
+            success = reference_pass(deck_checks, max(1, attack.speed) + blocker.block + pool - foundations) if legal else 0.0
+            blocked_damage = 0 if attack.zone == blocker.block_zone else (damage + 1) // 2
+            row.append({"legal": legal, "success": success, "expected_damage": damage * (1 - success) + blocked_damage * success})
+        rows.append(row)
+    return rows
+
+
+def reference_draw_odds(copies: int, deck_size: int, hand_size: int) -> float:
+    none = 1.0
+    for i in range(min(hand_size, deck_size)):
+        none *= max(0.0, (deck_size - copies - i) / (deck_size - i))
+    return 1.0 - none
+
+
+def benchmark(table: OddsTable, deck_rows: "np.ndarray", repeat: int = 3) -> Dict[str, Any]:
+    """Best-of-repeat seconds, NumPy against the reference, for play odds over the whole table
+    and block odds of every attack against the deck's distinct cards."""
+    deck_checks = table.check[deck_rows].tolist()
+    blockers = np.unique(deck_rows)
+    attack_cards = [card for card in table.cards if card.type == "Attack"]
+    blocker_cards = [table.cards[row] for row in blockers]
+
+    def best(run: Any) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    results = {}
+    for name, vectorized, reference, items in (
+        ("play_odds", lambda: table.play_odds(deck_checks), lambda: reference_play_odds(table.cards, deck_checks), len(table.cards) * CARD_POOL_LIMIT),
+        ("block_odds", lambda: table.block_odds(deck_checks, blockers=blockers), lambda: reference_block_odds(attack_cards, blocker_cards, deck_checks), len(attack_cards) * len(blocker_cards)),
+    ):
+        fast, slow = best(vectorized), best(reference)
+        results[name] = {"items": items, "numpy_seconds": round(fast, 6), "reference_seconds": round(slow, 6), "speedup": round(slow / fast, 1) if fast else None}
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check, block and attack odds for a deck across the card catalog")
+    parser.add_argument("--cards", default="card_db/cards.json")
+    parser.add_argument("--abilities", default=None)
+    parser.add_argument("--deck", required=True, help="Deck JSON (card ids or {id: copies}); its check values drive every check")
+    parser.add_argument("--hand-size", type=int, default=7)
+    parser.add_argument("--pool", type=int, default=0, help="Cards already in the card pool")
+    parser.add_argument("--foundations", type=int, default=0, help="Ready foundations available to commit")
+    parser.add_argument("--benchmark", action="store_true", help="Time the NumPy and reference implementations over the catalog")
+    args = parser.parse_args()
+
+    if np is None:
+        print("numpy is required (pip install numpy)", file=sys.stderr)
+        return 1
+    pool = CardPool.load(args.cards, args.abilities)
+    with open(args.deck, "r", encoding="utf-8") as f:
+        deck_ids = [card.id for card in pool.deck(json.load(f))]
+    table = OddsTable.from_pool(pool)
+    deck_rows = table.rows(deck_ids)
+    deck_checks = table.check[deck_rows]
+
+    report: Dict[str, Any] = {
+        "attack_resolves": {k: round(v, 4) for k, v in sorted(table.attack_resolves(deck_ids, args.hand_size, args.pool, args.foundations).items(), key=lambda kv: -kv[1])},
+        "block_by_zone": table.zone_block_odds(deck_checks, np.unique(deck_rows), pool=args.pool, foundations=args.foundations),
+    }
+    if args.benchmark:
+        report["benchmark"] = benchmark(table, deck_rows)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
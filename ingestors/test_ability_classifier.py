@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test Ability Classifier
+Verifies that the precompiled phrase matcher gives the same results as the original linear scans
+"""
+
+import random
+
+from ability_system import AbilitySystem
+
+PHRASES = [
+    'Commit', 'Flip', 'Discard', 'Remove', 'Destroy', 'Clear',
+    'If this attack deals damage', 'If this attack is blocked', 'If you have',
+    'After this attack deals damage', 'After your attack resolves', 'At the start of',
+    'commit 1 foundation', 'CLEAR your card pool', 'this attack gets +1 speed', 'draw 1 card',
+    'if this attack deals', 'After this attack is blocked', 'your turn', 'Flipped', 'Removed',
+]
+PREFIXES = ['E:', 'Enhance:', 'R:', 'Response:', 'Enhance ', 'Blitz', '', '  E: ']
+
+
+def reference_parse(system, ability_text):
+    """The original linear-scan implementation of AbilitySystem.parse_ability"""
+    if not ability_text or not isinstance(ability_text, str):
+        return None
+    ability_text = ability_text.strip()
+    if ability_text.startswith('E:') or ability_text.startswith('Enhance:'):
+        text = ability_text[2:].strip() if ability_text.startswith('E:') else ability_text[8:].strip()
+        cost = next((c for c in system.enhance_costs if c.lower() in text.lower()), None)
+        condition = next((c for c in system.enhance_conditions if c.lower() in text.lower()), None)
+        return {'type': 'enhance', 'cost': cost, 'condition': condition, 'effect': text, 'original_text': ability_text}
+    elif ability_text.startswith('R:') or ability_text.startswith('Response:'):
+        text = ability_text[2:].strip() if ability_text.startswith('R:') else ability_text[9:].strip()
+        trigger = next((t for t in system.response_triggers if t.lower() in text.lower()), None)
+        return {'type': 'response', 'trigger': trigger, 'effect': text, 'original_text': ability_text}
+    else:
+        return {'type': 'static', 'effect': ability_text}
+
+
+def random_abilities(rng, count):
+    abilities = []
+    for _ in range(count):
+        body = ' '.join(rng.choice(PHRASES) for _ in range(rng.randint(0, 4)))
+        if rng.random() < 0.2:
+            # glue phrases together so matches overlap
+            body = body.replace(' ', '')
+        abilities.append(rng.choice(PREFIXES) + body)
+    return abilities
+
+
+def test_parse_matches_reference():
+    """Every generated ability parses exactly as the linear scan did"""
+    system = AbilitySystem()
+    rng = random.Random(1234)
+    for ability in random_abilities(rng, 5000) + ['', None, 42, 'E:', 'R:   ']:
+        assert system.parse_ability(ability) == reference_parse(system, ability), ability
+
+
+def test_prefix_phrases_match_reference():
+    """Phrases that share a prefix are all found, with list order deciding between them"""
+    system = AbilitySystem()
+    system.enhance_costs = ['Commit 2', 'Commit', 'Flip']
+    system.enhance_conditions = ['If you', 'If you have']
+    system.compile_matchers()
+    for ability in ['E: commit 2 foundations', 'E: Commit 1. If you have 3 cards', 'E: If you flip', 'E: commit']:
+        assert system.parse_ability(ability) == reference_parse(system, ability), ability
+
+
+def test_categorize_many_matches_reference():
+    """The batch API returns one categorization per card, in order"""
+    system = AbilitySystem()
+    rng = random.Random(99)
+    cards = [{'name': f'Card {i}', 'abilities': random_abilities(rng, rng.randint(0, 5))} for i in range(500)]
+    cards.append({'name': 'No abilities'})
+    results = system.categorize_many(cards)
+    assert len(results) == len(cards)
+    for card, categorized in zip(cards, results):
+        expected = {'enhances': [], 'responses': [], 'static': []}
+        for ability in card.get('abilities', []):
+            parsed = reference_parse(system, ability)
+            if parsed:
+                key = {'enhance': 'enhances', 'response': 'responses'}.get(parsed['type'], 'static')
+                expected[key].append(parsed)
+        assert categorized == expected
+
+
+def test_parse_cache():
+    """Repeated and re-spaced ability lines are served from the bounded parse cache"""
+    system = AbilitySystem(cache_size=2)
+    first = system.parse_ability('E: Commit 1 foundation')
+    first['cost'] = 'changed by caller'
+    assert system.parse_ability('  E: Commit 1 foundation\n') == reference_parse(system, 'E: Commit 1 foundation')
+    assert system.cache_stats()['hits'] == 1
+    assert system.cache_stats()['misses'] == 1
+
+    system.parse_ability('R: At the start of your turn')
+    system.parse_ability('Blitz')
+    stats = system.cache_stats()
+    assert stats['size'] == stats['max_size'] == 2
+
+    system.enhance_costs = ['Foundation']
+    system.compile_matchers()
+    assert system.parse_ability('E: Commit 1 foundation')['cost'] == 'Foundation'
+    assert system.cache_stats()['hits'] == 0
+
+
+def main():
+    """Main test function"""
+    test_parse_matches_reference()
+    test_prefix_phrases_match_reference()
+    test_categorize_many_matches_reference()
+    test_parse_cache()
+    print("✅ Precompiled ability matcher matches the reference scan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test Ability Index
+Verifies that abilities_index.json categorizes abilities exactly as the game's parseAbility does
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+from ability_index import build_ability_index, load_game_cards, write_ability_index
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GAME_JS = os.path.join(HERE, "game_startup_with_abilities.js")
+
+ABILITIES = [
+    'E: Commit 1 foundation: this attack gets +1 speed',
+    'Enhance: If this attack deals damage, draw 1 card',
+    'Enhance Flip 1 momentum: +2 damage',
+    'Enhanced attacks cannot be blocked',
+    'R: After this attack deals damage, clear your card pool',
+    'Response: At the start of your turn, draw 1 card',
+    'Response After your attack resolves, gain 1 health',
+    'Responsive blocks gain +1 speed',
+    'Blitz',
+    '   E:   Discard 1 card   ',
+]
+
+
+def test_enhance_and_response_prefixes():
+    """'Enhance ' and 'Response ' without a colon are enhances and responses, as in the game"""
+    index = build_ability_index([
+        {'id': 'a', 'abilities': ['Enhance Flip 1 momentum: +2 damage']},
+        {'id': 'b', 'text': 'Response At the start of your turn, draw 1 card\nEnhanced attacks cannot be blocked'},
+    ])
+    assert index['a'] == {'enhances': [{
+        'cost': 'Flip',
+        'effect': 'Flip 1 momentum: +2 damage',
+        'originalText': 'Enhance Flip 1 momentum: +2 damage',
+    }]}
+    assert index['b']['responses'] == [{
+        'trigger': 'At the start of',
+        'effect': 'At the start of your turn, draw 1 card',
+        'originalText': 'Response At the start of your turn, draw 1 card',
+    }]
+    assert index['b']['static'] == [{'effect': 'Enhanced attacks cannot be blocked'}]
+
+
+def run_game_js(script, data):
+    """Run script under node after the game's AbilitySystem class, with data as JSON on stdin"""
+    with open(GAME_JS, 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('class AbilitySystem {')
+    class_source = source[start:source.index('\n}\n', start) + 2]
+    script = class_source + 'const data = JSON.parse(require("fs").readFileSync(0, "utf8"));' + script
+    result = subprocess.run(['node', '-e', script], input=json.dumps(data), capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def js_categorize(abilities):
+    """Run the game's AbilitySystem.categorizeCardAbilities under node"""
+    return run_game_js('console.log(JSON.stringify(new AbilitySystem().categorizeCardAbilities({abilities: data})));', abilities)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+def test_index_matches_game_parser():
+    """Every index entry is the game's own parse with unset fields and the type dropped"""
+    expected = {
+        category: [{k: v for k, v in parsed.items() if k != 'type' and v is not None} for parsed in parsed_list]
+        for category, parsed_list in js_categorize(ABILITIES).items()
+        if parsed_list
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'abilities_index.json')
+        write_ability_index([{'id': 'card', 'abilities': ABILITIES}], path)
+        with open(path, 'r', encoding='utf-8') as f:
+            assert json.load(f) == {'card': expected}
+
+
+def test_game_cards_are_indexed_under_game_ids():
+    """GAME_DATA cards are indexed under the integer ids the game looks them up by"""
+    cards = load_game_cards()
+    index = build_ability_index(cards)
+    assert {str(card['id']) for card in cards if card.get('abilities')} == set(index)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+def test_game_uses_index_for_its_cards():
+    """With the index loaded the game categorizes its GAME_DATA cards without parsing them, to the same result"""
+    cards = load_game_cards()
+    results = run_game_js(
+        'const system = new AbilitySystem();'
+        'const parsed = data.cards.map(card => system.categorizeCardAbilities(card));'
+        'system.loadIndex(data.index);'
+        'system.parseAbility = () => { throw new Error("parsed at runtime"); };'
+        'const indexed = data.cards.filter(card => data.index[card.id]).map(card => system.categorizeCardAbilities(card));'
+        'console.log(JSON.stringify({parsed, indexed}));',
+        {'cards': cards, 'index': build_ability_index(cards)},
+    )
+    with_abilities = [i for i, card in enumerate(cards) if card.get('abilities')]
+    assert with_abilities and results['indexed'] == [results['parsed'][i] for i in with_abilities]
+
+
+def main():
+    """Main test function"""
+    test_enhance_and_response_prefixes()
+    test_game_cards_are_indexed_under_game_ids()
+    if shutil.which('node'):
+        test_index_matches_game_parser()
+        test_game_uses_index_for_its_cards()
+    print("✅ Ability index matches the game's parser")
+
+
+if __name__ == "__main__":
+    main()
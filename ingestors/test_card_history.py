@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test Card History
+Verifies deduplicated storage, as-of reconstruction and per-card timelines across ingest runs
+"""
+
+import copy
+import os
+import sys
+import tempfile
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from card_history import CardHistory, record_hash  # noqa: E402
+from scrape_uvsultra import Card  # noqa: E402
+
+
+def catalog(count):
+    return [
+        Card(
+            id=f"mha_{i:03d}", name=f"Card {i}", type="Attack", rarity="Common", cost=None, attack=None, health=None,
+            keywords=[], text="Breaker 2.", set_code="MHA", set_name="My Hero Academia", number=f"{i:03d}", image_url=None,
+        ).to_normalized()
+        for i in range(count)
+    ]
+
+
+def test_runs_store_only_changes():
+    """Unchanged runs add no records; a run stores just the changed, added and removed ids"""
+    with tempfile.TemporaryDirectory() as tmp:
+        history = CardHistory(tmp)
+        first = catalog(200)
+        assert history.commit(first, "r0")["new_objects"] == 200
+        size = os.path.getsize(history.objects_path)
+        unchanged = history.commit(copy.deepcopy(first), "r1")
+        assert unchanged["new_objects"] == 0 and unchanged["changed"] == {} and os.path.getsize(history.objects_path) == size
+
+        second = copy.deepcopy(first[:-1]) + catalog(201)[-1:]
+        second[5]["text"] = "Breaker 3."
+        run = history.commit(second, "r2")
+        assert (run["added"], run["modified"], run["removed"], run["new_objects"]) == (1, 1, ["mha_199"], 2)
+        assert run["changed"]["mha_005"] == record_hash(second[5])
+
+
+def test_as_of_and_timeline():
+    """Any run is rebuilt exactly after reopening; timelines name the fields that changed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        history = CardHistory(tmp)
+        runs = [catalog(50)]
+        runs.append(copy.deepcopy(runs[0]))
+        runs[1][3]["text"] = "Breaker 3."
+        runs[1][3]["set"]["number"] = "103"
+        runs.append([card for card in copy.deepcopy(runs[1]) if card["id"] != "mha_003"])
+        runs.append(copy.deepcopy(runs[1]))
+        for i, cards in enumerate(runs):
+            history.commit(cards, f"r{i}")
+
+        reopened = CardHistory(tmp, writable=False)
+        for i, cards in enumerate(runs):
+            rebuilt = reopened.as_of(f"r{i}")
+            assert sorted(rebuilt, key=lambda c: c["id"]) == sorted(cards, key=lambda c: c["id"])
+        assert reopened.as_of(-1) == reopened.as_of(3)
+
+        timeline = reopened.timeline("mha_003")
+        assert [(e["label"], e["status"]) for e in timeline] == [("r0", "added"), ("r1", "modified"), ("r2", "removed"), ("r3", "added")]
+        assert timeline[1]["fields"] == ["set.number", "text"]
+        assert [e["label"] for e in reopened.timeline("mha_004")] == ["r0"]
+
+
+def test_numeric_labels_and_partial_runs():
+    """A label made of digits resolves to its run; a partial last run line is dropped before the next commit"""
+    with tempfile.TemporaryDirectory() as tmp:
+        history = CardHistory(tmp)
+        history.commit(catalog(3), "20240501")
+        history.commit(catalog(4), "1")
+        assert history.resolve("20240501") == 0 and history.resolve("1") == 1
+        assert history.resolve("0") == 0 and history.resolve("-1") == 1 and history.resolve(0) == 0
+        with open(history.runs_path, "a", encoding="utf-8") as f:
+            f.write('{"label": "crashed", "cha')
+
+        reopened = CardHistory(tmp)
+        assert len(reopened) == 2
+        reopened.commit(catalog(5), "r2")
+        again = CardHistory(tmp, writable=False)
+        assert [run["label"] for run in again.runs] == ["20240501", "1", "r2"]
+        assert len(again.as_of("r2")) == 5
+
+
+def test_duplicate_ids_are_rejected():
+    """Two cards with one id fail the commit and record nothing, rather than keeping one of them"""
+    with tempfile.TemporaryDirectory() as tmp:
+        history = CardHistory(tmp)
+        cards = catalog(3)
+        clash = dict(cards[1], name="Another card")
+        with pytest.raises(ValueError, match=r"Card ids used by more than one card \(1\): mha_001 \(x2\)"):
+            history.commit(cards + [clash], "r0")
+        assert len(history) == 0 and not os.path.exists(history.runs_path)
+        assert history.commit(cards, "r0")["added"] == 3
+
+
+def main():
+    """Main test function"""
+    test_runs_store_only_changes()
+    test_as_of_and_timeline()
+    test_numeric_labels_and_partial_runs()
+    test_duplicate_ids_are_rejected()
+    print("✅ Card history verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test Card Schema
+Verifies the compiled validator against the card schema and the grouped, mergeable violation report
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from card_schema import DEFAULT_SCHEMA, SchemaError, compile_schema, load_validator, validate_batch, validate_cards  # noqa: E402
+from scrape_uvsultra import Card, OutputRejected, output_check, write_json_atomic  # noqa: E402
+
+
+def scraped_card(i, set_code=None):
+    return Card(
+        id=f"{i:03d}", name=f"Card {i}", type="Attack", rarity="Common", cost=None, attack=None, health=None,
+        keywords=["Powerful"], text="Breaker 2.", set_code=set_code, set_name="My Hero Academia", number=f"{i:03d}", image_url=None,
+    ).to_normalized()
+
+
+def test_scraped_cards_against_schema():
+    """Scraped cards fail only on the missing set code; a set code makes them valid"""
+    validate = load_validator()
+    assert validate(scraped_card(1)) == [("set.code", "expected string, got null")]
+    assert validate(scraped_card(1, set_code="MHA")) == []
+    card = scraped_card(2, set_code="MHA")
+    card.update(name="", cost=True, extra=1)
+    card["keywords"].append(3)
+    del card["image"]["url"]
+    assert sorted(validate(card)) == [
+        ("cost", "expected integer or null, got boolean"),
+        ("extra", "additional property not allowed"),
+        ("image.url", "required property missing"),
+        ("keywords[]", "expected string, got integer"),
+        ("name", "shorter than 1"),
+    ]
+
+
+def test_report_groups_by_field():
+    """Violations are counted per field and message with a few example ids; batches merge"""
+    cards = [scraped_card(i, set_code=None if i % 3 else "MHA") for i in range(30)]
+    cards[4]["rarity"] = None
+    report = validate_batch(cards, load_validator())
+    assert report.total == 30 and report.invalid == 20
+    assert report.field_counts() == {"set.code": 20, "rarity": 1}
+    assert report.examples["set.code"] == ["001", "002", "004", "005", "007"]
+    assert report.summary_lines()[0] == "Schema: 20 of 30 cards invalid"
+    pooled = validate_cards(cards, workers=2, batch_size=7)
+    assert pooled.to_dict() == report.to_dict()
+
+
+def test_unsupported_keywords_rejected():
+    """A schema keyword the compiler does not implement is an error, not a silent pass"""
+    with pytest.raises(SchemaError):
+        compile_schema({"type": "object", "properties": {"id": {"type": "string", "pattern": "^a"}}})
+    validate = compile_schema({"type": "string", "enum": ["Attack", "Action"]})
+    assert validate("Attack") == [] and validate("Asset") == [("", 'not one of "Attack", "Action"')]
+
+
+def test_invalid_output_keeps_previous_file():
+    """With --fail-on-invalid an invalid run never replaces cards.json; without it the file is written"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cards.json")
+        good = [scraped_card(i, set_code="MHA") for i in range(5)]
+        bad = good[:4] + [scraped_card(9)]
+        args = argparse.Namespace(no_validate=False, schema=DEFAULT_SCHEMA, validate_workers=1, fail_on_invalid=True)
+        assert write_json_atomic(path, good, output_check(args)) == 5
+        with pytest.raises(OutputRejected):
+            write_json_atomic(path, bad, output_check(args))
+        with open(path, "r", encoding="utf-8") as f:
+            assert json.load(f) == good
+        assert os.listdir(tmp) == ["cards.json"]
+        umask = os.umask(0)
+        os.umask(umask)
+        assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask, "the output is readable like any other file"
+        args.fail_on_invalid = False
+        write_json_atomic(path, bad, output_check(args))
+        with open(path, "r", encoding="utf-8") as f:
+            assert json.load(f) == bad
+
+
+def main():
+    """Main test function"""
+    test_scraped_cards_against_schema()
+    test_report_groups_by_field()
+    test_unsupported_keywords_rejected()
+    test_invalid_output_keeps_previous_file()
+    print("✅ Card schema validation verified")
+
+
+if __name__ == "__main__":
+    main()
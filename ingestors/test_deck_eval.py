@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test Deck Evaluation
+Verifies batch aggregation, confidence intervals, early stopping and that parallel runs match serial ones
+"""
+
+from deck_eval import evaluate, ratio_interval, wilson_interval
+from game_engine import CardPool, fixture_cards
+from test_game_engine import CARDS, DECK
+
+WEAK_DECK = {"char": 1, "jab": 5, "kick": 2, "dojo": 5, "focus": 38}
+
+
+def finals(reports):
+    return [report for report in reports if report["final"]]
+
+
+def test_intervals():
+    """Wilson intervals bracket the proportion; the damage ratio interval brackets the ratio"""
+    low, high = wilson_interval(30, 100, 1.96)
+    assert low < 0.3 < high and 0.2 < low and high < 0.4
+    assert wilson_interval(0, 0, 1.96) is None
+    side = {"attacks": 30, "damage": 60, "damage_sq": 400, "attacks_sq": 100, "damage_attacks": 200}
+    ratio, low, high = ratio_interval(side, 10, 1.96)
+    assert ratio == 2.0 and low <= ratio <= high
+
+
+def test_streams_and_stops_early():
+    """Running reports stream per batch and a lopsided pair stops before max_games"""
+    reports = list(evaluate([DECK, WEAK_DECK], ["strong", "weak"], cards=CARDS, batch_size=50, min_games=100, max_games=5000, tolerance=0.05))
+    final = finals(reports)
+    assert len(final) == 1 and len(reports) > 1
+    result = final[0]
+    assert result["converged"] and result["games"] < 5000
+    assert result["pair"] == ["strong", "weak"] and result["win_rate"] > 0.6
+    low, high = result["win_rate_ci"]
+    assert (high - low) / 2 <= 0.05
+    strong = result["decks"][0]
+    assert strong["mean_damage_per_attack"] > 0 and strong["mean_damage_per_attack_ci"][0] <= strong["mean_damage_per_attack"]
+
+
+def test_parallel_matches_serial():
+    """Merging batches in order makes the result independent of the worker count"""
+    options = dict(cards=CARDS, agents=("greedy", "random"), batch_size=40, min_games=80, max_games=400, tolerance=0.08, seed=5)
+    decks = [DECK, WEAK_DECK, DECK]
+    names = ["a", "b", "c"]
+    serial = finals(evaluate(decks, names, workers=1, **options))
+    parallel = finals(evaluate(decks, names, workers=2, **options))
+    key = lambda report: report["pair"]
+    assert len(serial) == 3
+    assert sorted(serial, key=key) == sorted(parallel, key=key)
+
+
+def test_scraped_cards():
+    """Decks of scraped, normalized cards evaluate like hand-written card data"""
+    cards = fixture_cards()
+    deck = CardPool.from_cards(cards).sample_deck()
+    reports = list(evaluate([deck, deck], ["a", "b"], cards=cards, batch_size=50, min_games=100, max_games=300, tolerance=0.2))
+    result = finals(reports)[0]
+    assert result["games"] >= 100 and 0 < result["win_rate"] < 1
+    assert all(side["mean_damage_per_attack"] > 0 for side in result["decks"])
+
+
+def main():
+    """Main test function"""
+    test_intervals()
+    test_streams_and_stops_early()
+    test_parallel_matches_serial()
+    test_scraped_cards()
+    print("✅ Deck evaluation verified")
+
+
+if __name__ == "__main__":
+    main()
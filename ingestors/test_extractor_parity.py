@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test Extractor Parity
+Verifies that the BeautifulSoup and lxml card page extractors produce identical cards
+"""
+
+import glob
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from scrape_uvsultra import parse_card, parse_detail_html  # noqa: E402
+
+FIXTURES = sorted(glob.glob(os.path.join(HERE, "fixtures", "uvsultra", "card_*.html")))
+CONFIG = {"base_url": "https://www.uvsultra.online"}
+
+
+def load_fixture(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_fixtures_present():
+    assert FIXTURES, "no card page fixtures found"
+
+
+def test_detail_fields_match():
+    """Both extractors return the same raw field dict for every fixture page"""
+    for path in FIXTURES:
+        html = load_fixture(path)
+        assert parse_detail_html(html, "lxml") == parse_detail_html(html, "soup"), os.path.basename(path)
+
+
+def test_cards_match():
+    """Both extractors build the same Card for every fixture page"""
+    for path in FIXTURES:
+        html = load_fixture(path)
+        soup_card = parse_card(html, dict(CONFIG, extractor="soup"))
+        lxml_card = parse_card(html, dict(CONFIG, extractor="lxml"))
+        assert soup_card == lxml_card, os.path.basename(path)
+
+
+def test_fixture_fields():
+    """Spot-check that the fixtures exercise real fields rather than matching on empties"""
+    card = parse_card(load_fixture(os.path.join(HERE, "fixtures", "uvsultra", "card_attack.html")), dict(CONFIG, extractor="lxml"))
+    assert card.name == "Full Power Kick"
+    assert card.set_name == "My Hero Academia"
+    assert card.number == "042"
+    assert (card.type, card.rarity) == ("Attack", "Common")
+    assert card.image_url == "https://www.uvsultra.online/images/cards/042-preview.jpg"
+    assert (card.difficulty, card.control, card.speed, card.damage, card.zone) == (4, 4, 5, 4, "high")
+    assert (card.block, card.block_zone) == (2, "mid")
+
+    missing = parse_card(load_fixture(os.path.join(HERE, "fixtures", "uvsultra", "card_empty.html")), dict(CONFIG, extractor="lxml"))
+    assert missing is None
+
+
+def main():
+    """Main test function"""
+    test_fixtures_present()
+    test_detail_fields_match()
+    test_cards_match()
+    test_fixture_fields()
+    print(f"✅ Extractors agree on {len(FIXTURES)} fixture pages")
+
+
+if __name__ == "__main__":
+    main()
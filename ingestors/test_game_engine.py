@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test Game Engine
+Verifies the headless rules engine: stat loading, checks, blocks, damage and seeded replays
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from game_engine import Agent, CardDef, CardPool, Game, can_block, play_games  # noqa: E402
+from replay_server import ReplayCatalog, ReplayServer  # noqa: E402
+from test_resume import run_scraper, write_config  # noqa: E402
+
+CARDS = [
+    {"id": "char", "name": "Hero", "type": "Character", "text": "Hand size 6. Vitality 12."},
+    {"id": "jab", "name": "Jab", "type": "Attack", "difficulty": 1, "check": 5, "attack": {"speed": 3, "damage": 2, "zone": "high"}, "block": {"modifier": 2, "zone": "high"}},
+    {"id": "kick", "name": "Kick", "type": "Attack", "difficulty": 3, "check": 3, "attack": {"speed": 5, "damage": 5, "zone": "low"}, "block": {"modifier": 3, "zone": "low"}},
+    {"id": "dojo", "name": "Dojo", "type": "Foundation", "difficulty": 0, "check": 4, "block": {"modifier": 1, "zone": "mid"}, "text": "E: Commit: Your attack gets +1 damage."},
+    {"id": "focus", "name": "Focus", "type": "Foundation", "difficulty": 1, "check": 6, "block": {"modifier": 4, "zone": "mid"}, "text": "E: Commit: Your opponent's attack gets -1 speed."},
+]
+DECK = {"char": 1, "jab": 15, "kick": 10, "dojo": 15, "focus": 10}
+
+
+def make_pool():
+    return CardPool.from_cards(CARDS)
+
+
+def test_card_stats():
+    """Stats follow the browser helpers and enhances compile from AbilitySystem output"""
+    pool = make_pool()
+    assert pool["char"].vitality == 12 and pool["char"].hand_size == 6
+    kick = pool["kick"]
+    assert (kick.speed, kick.damage, kick.zone, kick.block, kick.block_zone) == (5, 5, "Low", 3, "Low")
+    assert pool["dojo"].enhance == ("damage", 1)
+    assert pool["focus"].enhance == ("speed", -1)
+    flat = CardDef.from_card({"id": "x", "type": "Attack", "attack": 0, "cost": 2, "control": 3, "speed": 4, "zone": "high"})
+    assert (flat.damage, flat.difficulty, flat.check, flat.speed, flat.zone) == (0, 2, 3, 4, "High")
+    assert can_block("High", "Mid") and can_block("Low", "Low") and not can_block("High", "Low")
+
+
+def test_missing_stats_are_rejected():
+    """Records without check, speed or zone, like a scraped page that lists no stats, fail instead of playing as zeros"""
+    scraped = {"id": "mha_042", "name": "Full Power Kick", "type": "Attack", "cost": None, "attack": None, "health": None,
+               "text": "Breaker 2; Powerful.", "set": {"code": "MHA", "name": "My Hero Academia", "number": "042"}}
+    with pytest.raises(ValueError, match="mha_042: Attack card has no check, speed, damage, zone"):
+        CardDef.from_card(scraped)
+    with pytest.raises(ValueError, match="1 of 6 cards lack game stats"):
+        CardPool.from_cards(CARDS + [scraped])
+
+
+def test_scraped_cards_json_plays():
+    """The scraper's cards.json loads with the stats from the card pages and plays full games"""
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(ReplayCatalog(card_count=16, page_size=10)) as server:
+        output = os.path.join(tmp, "cards.json")
+        run_scraper("--config", write_config(server, tmp), "--output-json", output)
+        pool = CardPool.load(output)
+    assert len(pool) == 16
+    attacks = [card for card in pool.cards.values() if card.type == "Attack"]
+    assert attacks and all((a.difficulty, a.check, a.speed, a.damage, a.zone, a.block, a.block_zone) == (4, 4, 5, 4, "High", 2, "Mid") for a in attacks)
+    assert all(card.enhance == ("damage", 1) for card in pool.cards.values() if card.type == "Foundation")
+    deck = pool.sample_deck()
+    results = [r.to_dict() for r in play_games(pool, [deck, deck], 50, seed=2)]
+    assert all(r["reason"] in ("vitality", "deck_out") for r in results)
+    assert sum(sum(r["damage"]) for r in results) > 0
+
+
+def test_attack_sequence():
+    """Unblocked attacks deal full damage, half blocks round up, full blocks stop it"""
+    pool = make_pool()
+
+    class Scripted(Agent):
+        def __init__(self, block):
+            self.block = block
+
+        def choose_block(self, game, player):
+            return self.block
+
+    jab = pool["jab"]
+    results = []
+    for block_card in (None, pool["focus"], pool["jab"]):
+        game = Game(pool, [[jab] * 5, [jab] * 5], [Agent(), Scripted(0 if block_card else None)], seed=1)
+        attacker, defender = game.players
+        defender.hand = [block_card] if block_card else []
+        # Top of the defender's deck passes any block check
+        defender.deck = [CardDef("check", "Check", "Action", check=20)]
+        attacker.hand = [jab]
+        assert game.play_card(attacker, 0)
+        results.append(20 - defender.health)
+    # Focus blocks Mid (adjacent, half of 2 rounded up); Jab blocks High (same zone)
+    assert results == [2, 1, 0]
+
+
+def test_failed_check_commits_foundations():
+    """A failed check is paid for with ready foundations, else the turn is forced to end"""
+    pool = make_pool()
+    game = Game(pool, [DECK, DECK], [Agent(), Agent()], seed=3)
+    player = game.players[0]
+    player.deck = [CardDef("low", "Low", "Action", check=1)] * 2
+    player.hand = [pool["kick"], pool["kick"]]
+    player.foundations = []
+    assert not game.play_card(player, 0)
+    assert len(player.hand) == 2 and len(player.discard) == 1
+    game.end_turn(player)
+    for card in (pool["dojo"], pool["dojo"]):
+        player.card_pool.append(card)
+    game.end_turn(player)
+    assert len(player.foundations) == 2
+    assert game.play_card(player, 0)
+    assert all(f.committed for f in player.foundations)
+
+
+def test_seeded_games_replay():
+    """The same seed replays the same game; games always finish"""
+    pool = make_pool()
+    first = [r.to_dict() for r in play_games(pool, [DECK, DECK], 20, seed=11, agents=("greedy", "random"))]
+    second = [r.to_dict() for r in play_games(pool, [DECK, DECK], 20, seed=11, agents=("greedy", "random"))]
+    assert first == second
+    assert all(r["reason"] in ("vitality", "deck_out", "turn_limit") for r in first)
+    assert any(r["winner"] is not None for r in first)
+    assert sum(sum(r["attacks"]) for r in first) > 0
+
+
+def main():
+    """Main test function"""
+    test_card_stats()
+    test_missing_stats_are_rejected()
+    test_scraped_cards_json_plays()
+    test_attack_sequence()
+    test_failed_check_commits_foundations()
+    test_seeded_games_replay()
+    print("✅ Game engine verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test HTTP Cache
+Verifies that the caching session revalidates stale pages with 304s, keys POSTs by body, evicts least recently used entries and serves fresh hits without a rate-limit token
+"""
+
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from http_cache import ResponseCache  # noqa: E402
+from replay_server import ReplayCatalog, ReplayServer  # noqa: E402
+from scrape_uvsultra import TokenBucket, build_session, request_with_backoff  # noqa: E402
+
+
+def test_fresh_and_revalidated_responses():
+    """Fresh entries skip the network; stale ones are revalidated and a 304 serves the stored body"""
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(ReplayCatalog(card_count=5)) as server:
+        url = f"{server.base_url}/card.php?id=2"
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite"), ttl_seconds=3600)
+        session = build_session(cache)
+        first = session.get(url)
+        again = session.get(url)
+        assert not getattr(first, "from_cache", False) and again.from_cache
+        assert again.text == first.text and server.faults.stats["requests"] == 1
+
+        cache.ttl_seconds = 0
+        revalidated = session.get(url)
+        assert server.requests[-1][3]["If-None-Match"] == first.headers["ETag"]
+        assert server.faults.stats["not_modified"] == 1
+        assert revalidated.status_code == 200 and revalidated.text == first.text
+        assert not revalidated.from_cache, "a revalidation is a network round trip"
+        cache.close()
+
+
+def test_post_bodies_are_separate_entries():
+    """Listing pages fetched by POST are cached per form body"""
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(ReplayCatalog(card_count=30, page_size=10)) as server:
+        url = f"{server.base_url}/listing_cards.php"
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite"))
+        session = build_session(cache)
+        page2 = session.post(url, data={"page": 2, "js": 1})
+        page3 = session.post(url, data={"page": 3, "js": 1})
+        assert page2.text != page3.text
+        assert session.post(url, data={"js": 1, "page": 2}).text == page2.text
+        assert session.post(url, data={"page": 3, "js": 1}).from_cache
+        assert server.faults.stats["requests"] == 2
+        cache.close()
+
+
+def test_lru_eviction():
+    """Above max_bytes the least recently used entries go first"""
+    catalog = ReplayCatalog(card_count=5)
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(catalog) as server:
+        urls = [f"{server.base_url}/card.php?id={i}" for i in range(1, 5)]
+        sizes = [len(catalog.card_page(i).encode("utf-8")) for i in range(1, 5)]
+        # Room for every page but the second, which is the least recently used when the fourth arrives
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite"), max_bytes=sum(sizes) - sizes[1])
+        session = build_session(cache)
+        for url in urls[:3]:
+            session.get(url)
+        session.get(urls[0])
+        session.get(urls[3])
+        stored = {url for url in urls if cache.get(cache.make_key("GET", url)) is not None}
+        assert stored == {urls[0], urls[2], urls[3]}
+        cache.close()
+
+
+class CountingBucket(TokenBucket):
+    """Token bucket that counts the tokens taken"""
+
+    def __init__(self):
+        super().__init__(rate=1000.0)
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+        super().acquire()
+
+
+def test_fresh_hits_take_no_token():
+    """Only requests that go to the network take a rate-limit token; fresh cache hits do not"""
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(ReplayCatalog(card_count=5)) as server:
+        url = f"{server.base_url}/card.php?id=3"
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite"), ttl_seconds=3600)
+        session = build_session(cache)
+        limiter = CountingBucket()
+        first = request_with_backoff("GET", url, session, 0, limiter=limiter)
+        hits = [request_with_backoff("GET", url, session, 0, limiter=limiter) for _ in range(3)]
+        assert limiter.acquired == 1 and all(hit.from_cache and hit.text == first.text for hit in hits)
+        cache.ttl_seconds = 0
+        request_with_backoff("GET", url, session, 0, limiter=limiter)
+        assert limiter.acquired == 2, "a revalidation is a request and takes a token"
+        cache.close()
+
+
+def main():
+    """Main test function"""
+    test_fresh_and_revalidated_responses()
+    test_post_bodies_are_separate_entries()
+    test_lru_eviction()
+    test_fresh_hits_take_no_token()
+    print("✅ HTTP response cache verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test Image Derivatives
+Verifies resized JPEG and WebP variants, never upscaled, rendered once per distinct source image
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from PIL import Image  # noqa: E402
+
+from image_derivatives import build_derivatives  # noqa: E402
+
+
+def test_variants_and_reuse():
+    """Each width and format is rendered once per content; unchanged sources are not rendered again"""
+    with tempfile.TemporaryDirectory() as tmp:
+        images = os.path.join(tmp, "cards")
+        out = os.path.join(tmp, "derived")
+        os.makedirs(images)
+        Image.new("RGB", (300, 420), (200, 30, 30)).save(os.path.join(images, "a.jpg"), "JPEG")
+        Image.new("RGB", (100, 140), (30, 30, 200)).save(os.path.join(images, "b.png"))
+        shutil.copy(os.path.join(images, "a.jpg"), os.path.join(images, "c.jpg"))
+
+        manifest = build_derivatives(images, out, widths=(120, 240, 480), workers=1)
+        cards = manifest["cards"]
+        assert manifest["rendered"] == 2 and len(manifest["sources"]) == 2
+        assert cards["a"]["variants"] == cards["c"]["variants"]
+        assert sorted(cards["a"]["variants"]["webp"], key=int) == ["120", "240", "300"]
+        assert cards["a"]["variants"]["jpeg"]["300"] == os.path.join(images, "a.jpg"), "the source JPEG is served as is"
+        assert list(cards["b"]["variants"]["jpeg"]) == ["100"], "no variant is wider than its source"
+        with Image.open(cards["a"]["variants"]["webp"]["120"]) as img:
+            assert img.format == "WEBP" and img.size == (120, 168)
+        umask = os.umask(0)
+        os.umask(umask)
+        for path in list(cards["a"]["variants"]["webp"].values()) + [os.path.join(out, "manifest.json")]:
+            assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+
+        assert build_derivatives(images, out, widths=(120, 240, 480), workers=1)["rendered"] == 0
+        Image.new("RGB", (100, 140), (30, 200, 30)).save(os.path.join(images, "b.png"))
+        os.remove(cards["a"]["variants"]["webp"]["240"])
+        again = build_derivatives(images, out, widths=(120, 240, 480), workers=1)
+        assert again["rendered"] == 2
+        assert again["cards"]["b"]["hash"] != cards["b"]["hash"]
+        assert os.path.exists(cards["a"]["variants"]["webp"]["240"])
+
+
+def test_preview_images_are_keyed_by_card_id():
+    """Mirrored NNN-preview.jpg_<date> files are keyed by card id, like the sprite atlases; unmatched files keep their name"""
+    with tempfile.TemporaryDirectory() as tmp:
+        images = os.path.join(tmp, "cards")
+        os.makedirs(images)
+        for name in ["001-preview.jpg_20240802", "012-preview.jpg_20240802", "099-preview.jpg_20240802"]:
+            Image.new("RGB", (60, 84), (200, 30, 30)).save(os.path.join(images, name), "JPEG")
+        cards_path = os.path.join(tmp, "cards.json")
+        with open(cards_path, "w", encoding="utf-8") as f:
+            json.dump([
+                {"id": "mha_001", "set": {"code": "MHA", "number": "1"}},
+                {"id": "mha_012", "set": {"code": "MHA", "number": "012"}},
+            ], f)
+
+        manifest = build_derivatives(images, os.path.join(tmp, "derived"), widths=(30,), workers=1, cards_path=cards_path)
+        assert sorted(manifest["cards"]) == ["099-preview", "mha_001", "mha_012"]
+        assert manifest["rendered"] == 1, "equal images are still rendered once"
+
+
+def main():
+    """Main test function"""
+    test_variants_and_reuse()
+    test_preview_images_are_keyed_by_card_id()
+    print("✅ Image derivatives verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test Image Pipeline
+Verifies that card images are stored once per content, skipped on later runs and resumed from partial downloads
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from replay_server import ReplayCatalog, ReplayServer  # noqa: E402
+from scrape_uvsultra import ImagePipeline  # noqa: E402
+
+
+def stored_files(out_dir):
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(os.path.join(out_dir, "sha256"))
+        for name in names
+    )
+
+
+def test_images_are_stored_once():
+    """Repeated URLs are fetched once, equal bytes are stored once, and a later run fetches nothing"""
+    catalog = ReplayCatalog(card_count=5)
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(catalog) as server:
+        base = f"{server.base_url}/images/cards"
+        pipeline = ImagePipeline(tmp, delay=0, workers=3)
+        pipeline.submit("a", f"{base}/0001-mini.jpg")
+        pipeline.submit("b", f"{base}/0001-mini.jpg")
+        pipeline.submit("c", f"{base}/0001-mini.jpg?v=2")
+        pipeline.submit("d", f"{base}/0002-mini.jpg")
+        urls = pipeline.close()
+        assert pipeline.failed == 0
+        assert len(server.paths("/images/")) == 3
+        assert len(urls) == 3 and len(stored_files(tmp)) == 2
+        with open(os.path.join(tmp, "manifest.json"), "r", encoding="utf-8") as f:
+            cards = json.load(f)["cards"]
+        assert cards["a"] == cards["b"] == cards["c"] != cards["d"]
+        with open(cards["d"], "rb") as f:
+            assert f.read() == catalog.image("/images/cards/0002-mini.jpg")
+        umask = os.umask(0)
+        os.umask(umask)
+        assert os.stat(os.path.join(tmp, "manifest.json")).st_mode & 0o777 == 0o666 & ~umask
+
+        again = ImagePipeline(tmp, delay=0)
+        again.submit("e", f"{base}/0002-mini.jpg")
+        again.close()
+        assert len(server.paths("/images/")) == 3
+        assert again.manifest["cards"]["e"] == cards["d"]
+
+
+def test_partial_download_resumes():
+    """An interrupted download continues with a Range request from the bytes already on disk"""
+    catalog = ReplayCatalog(card_count=5)
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(catalog) as server:
+        url = f"{server.base_url}/images/cards/0003-mini.jpg"
+        full = catalog.image("/images/cards/0003-mini.jpg")
+        pipeline = ImagePipeline(tmp, delay=0)
+        partial = os.path.join(tmp, ".partial", hashlib.sha1(url.encode("utf-8")).hexdigest() + ".part")
+        with open(partial, "wb") as f:
+            f.write(full[:5000])
+        pipeline.submit("c3", url)
+        pipeline.close()
+        assert server.requests[-1][3]["Range"] == "bytes=5000-"
+        assert server.faults.stats["partial"] == 1
+        with open(pipeline.manifest["cards"]["c3"], "rb") as f:
+            assert f.read() == full
+        assert os.listdir(os.path.join(tmp, ".partial")) == []
+
+
+def main():
+    """Main test function"""
+    test_images_are_stored_once()
+    test_partial_download_resumes()
+    print("✅ Image pipeline verified")
+
+
+if __name__ == "__main__":
+    main()
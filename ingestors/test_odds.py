@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test Odds
+Verifies the vectorized check, block and draw odds against the pure-Python reference
+"""
+
+import random
+
+import pytest
+
+from game_engine import CardDef
+from odds import reference_block_odds, reference_draw_odds, reference_pass, reference_play_odds
+
+np = pytest.importorskip("numpy")
+
+from odds import OddsTable, check_survival, draw_odds  # noqa: E402
+
+ZONES = ["High", "Mid", "Low"]
+TYPES = ["Attack", "Attack", "Foundation", "Action", "Asset"]
+
+
+def random_cards(count, seed=3):
+    rng = random.Random(seed)
+    return [
+        CardDef(
+            f"c{i}", f"Card {i}", rng.choice(TYPES), difficulty=rng.randint(0, 6), check=rng.randint(0, 6),
+            speed=rng.randint(0, 8), damage=rng.randint(0, 7), zone=rng.choice(ZONES), block=rng.randint(0, 4), block_zone=rng.choice(ZONES),
+        )
+        for i in range(count)
+    ]
+
+
+def test_survival_and_draw():
+    """The check survival function and hypergeometric draw odds match direct counting"""
+    checks = [0, 1, 1, 3, 5, 5, 5]
+    survival = check_survival(checks)
+    assert [round(float(p), 6) for p in survival] == [round(reference_pass(checks, t), 6) for t in range(7)]
+    copies = np.array([0, 1, 3, 4, 50])
+    assert np.allclose(draw_odds(copies, 50, 7), [reference_draw_odds(int(c), 50, 7) for c in copies])
+    assert draw_odds(np.array([1]), 5, 7)[0] == 1.0
+
+
+def test_matches_reference():
+    """Play and block matrices equal the reference loops for every card, pool size and blocker"""
+    cards = random_cards(120)
+    table = OddsTable(cards)
+    deck_checks = [card.check for card in cards[:60]]
+    play = table.play_odds(deck_checks, foundations=1)
+    assert np.allclose(play, reference_play_odds(cards, deck_checks, foundations=1))
+
+    attacks = [card for card in cards if card.type == "Attack"]
+    odds = table.block_odds(deck_checks, pool=2, foundations=1)
+    reference = reference_block_odds(attacks, cards, deck_checks, pool=2, foundations=1)
+    for key in ("legal", "success", "expected_damage"):
+        assert np.allclose(odds[key], [[cell[key] for cell in row] for row in reference])
+
+
+def test_deck_summaries():
+    """Attack resolve odds combine draw and check odds; zone summaries cover the zones present"""
+    cards = random_cards(40)
+    table = OddsTable(cards)
+    deck = [card.id for card in cards[:20] for _ in range(2)]
+    resolves = table.attack_resolves(deck, hand_size=7)
+    deck_checks = [table.cards[table.row[card_id]].check for card_id in deck]
+    for card_id, p in resolves.items():
+        card = table.cards[table.row[card_id]]
+        assert card.type == "Attack"
+        assert p == pytest.approx(reference_draw_odds(2, 40, 7) * reference_pass(deck_checks, card.difficulty))
+    summary = table.zone_block_odds(deck_checks, table.rows(deck))
+    assert set(summary) <= set(ZONES) and all(0 <= zone["success"] <= 1 for zone in summary.values())
+
+
+def main():
+    """Main test function"""
+    test_survival_and_draw()
+    test_matches_reference()
+    test_deck_summaries()
+    print("✅ Odds verified")
+
+
+if __name__ == "__main__":
+    main()
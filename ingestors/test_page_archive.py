@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test Page Archive
+Verifies archived pages round-trip and re-parse to the same cards as a live parse
+"""
+
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from page_archive import PageArchive  # noqa: E402
+from replay_server import ReplayCatalog  # noqa: E402
+from scrape_uvsultra import parse_card, reparse_archive  # noqa: E402
+
+CONFIG = {"base_url": "https://www.uvsultra.online"}
+
+
+def test_put_dedupes_and_reloads():
+    """Unchanged pages are not stored twice; the newest version of a page wins after reopening"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        assert archive.put("u1", "<h1>one</h1>")
+        assert not archive.put("u1", "<h1>one</h1>")
+        assert archive.put("u2", "<h1>two</h1>")
+        assert archive.put("u1", "<h1>one, errata</h1>")
+        assert archive.put("u3", "<h1>removed</h1>")
+        archive.save_order(["u2", "u1"])
+        archive.close()
+
+        reopened = PageArchive(tmp, writable=False)
+        assert len(reopened) == 3
+        assert reopened.get("u1") == "<h1>one, errata</h1>"
+        assert [record["url"] for record in reopened.entries()] == ["u2", "u1"]
+        assert [record["url"] for record in reopened.entries(include_unlisted=True)] == ["u2", "u1", "u3"]
+
+
+def test_reopen_after_partial_index_line():
+    """A record cut off by a crash is dropped on reopening, and the next record starts on a fresh line"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        archive.put("u1", "<h1>one</h1>")
+        archive.close()
+        with open(os.path.join(tmp, "index.jsonl"), "a", encoding="utf-8") as f:
+            f.write('{"url": "u2", "off')
+
+        reopened = PageArchive(tmp)
+        assert "u2" not in reopened
+        assert reopened.put("u2", "<h1>two</h1>")
+        reopened.close()
+        again = PageArchive(tmp, writable=False)
+        assert len(again) == 2 and again.get("u2") == "<h1>two</h1>"
+
+
+def test_reparse_matches_live_parse():
+    """Re-parsing the archive, serially or with a process pool, gives the listed cards in listing order"""
+    catalog = ReplayCatalog(card_count=61)
+    urls = [f"https://www.uvsultra.online/card.php?id={i}" for i in range(60, 0, -1)]
+    expected = [parse_card(catalog.card_page(i), CONFIG).to_normalized() for i in range(60, 0, -1)]
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        for i in range(1, 62):
+            archive.put(f"https://www.uvsultra.online/card.php?id={i}", catalog.card_page(i))
+        archive.save_order(urls)
+        archive.close()
+        serial = list(reparse_archive(tmp, CONFIG, workers=1))
+        pooled = list(reparse_archive(tmp, CONFIG, workers=2, batch_size=7))
+        unlisted = list(reparse_archive(tmp, CONFIG, workers=1, include_unlisted=True))
+    assert [url for url, _ in serial] == urls
+    assert [url for url, _ in unlisted] == urls + ["https://www.uvsultra.online/card.php?id=61"]
+    assert [card for _, card in serial] == expected
+    assert pooled == serial
+
+
+def main():
+    """Main test function"""
+    test_put_dedupes_and_reloads()
+    test_reopen_after_partial_index_line()
+    test_reparse_matches_live_parse()
+    print("✅ Page archive and re-parse verified")
+
+
+if __name__ == "__main__":
+    main()
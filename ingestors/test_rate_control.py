@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test Adaptive Rate Control
+Verifies AIMD increases, decreases, ceilings and Retry-After handling
+"""
+
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from rate_control import AdaptiveController, parse_retry_after  # noqa: E402
+
+
+def test_additive_increase_stays_under_ceiling():
+    """Healthy responses grow rate and concurrency up to the configured ceilings"""
+    controller = AdaptiveController(rate=2.0, max_rate=5.0, max_concurrency=3)
+    for _ in range(500):
+        controller.in_flight += 1
+        controller.release(200, 0.05)
+    assert controller.rate == 5.0
+    assert controller.concurrency == 3
+    assert controller.decisions[-1]["action"] == "increase"
+
+
+def test_multiplicative_decrease_once_per_cooldown():
+    """A burst of 429s and 5xx halves the rate once; another halving waits for the cooldown"""
+    controller = AdaptiveController(rate=8.0, max_rate=8.0, max_concurrency=4, concurrency=4, min_rate=1.5, cooldown=60)
+    for status in (429, 503, 500):
+        controller.in_flight += 1
+        controller.release(status, 0.05)
+    assert controller.rate == 4.0
+    assert controller.concurrency == 2
+    controller.last_decrease -= 60
+    for _ in range(2):
+        controller.last_decrease -= 60
+        controller.in_flight += 1
+        controller.release(None, 0.05)
+    assert controller.rate == 1.5
+    assert controller.concurrency == 1
+    assert [d["action"] for d in controller.decisions].count("decrease") == 3
+
+
+def test_latency_rise_backs_off():
+    """Latency far above the observed baseline counts as congestion"""
+    controller = AdaptiveController(rate=4.0, max_rate=10.0, cooldown=0)
+    for _ in range(10):
+        controller.in_flight += 1
+        controller.release(200, 0.01)
+    before = controller.rate
+    controller.in_flight += 1
+    controller.release(200, 1.0)
+    assert controller.rate < before
+    assert "latency" in controller.decisions[-1]["reason"]
+
+
+def test_baseline_ignores_outliers_and_kinds():
+    """One fast response, fast responses of another kind and 4xx answers never make normal latency look congested"""
+    controller = AdaptiveController(rate=1.0, max_rate=10.0, cooldown=0)
+    controller.in_flight += 1
+    controller.release(200, 0.01)
+    for _ in range(50):
+        controller.in_flight += 1
+        controller.release(200, 0.005, kind="listing")
+    for _ in range(300):
+        controller.in_flight += 1
+        controller.release(200, 0.04)
+    assert not any(d["action"] == "decrease" for d in controller.decisions)
+    assert controller.rate == 10.0
+    assert controller.baseline() == 0.04 and controller.baseline("listing") == 0.005
+
+    controller = AdaptiveController(rate=2.0, max_rate=10.0)
+    for _ in range(20):
+        controller.in_flight += 1
+        controller.release(404, 0.001)
+    assert controller.rate == 2.0 and controller.baseline() is None and controller.in_flight == 0
+
+
+def test_retry_after_pauses_acquire():
+    """Retry-After holds every caller until it has passed"""
+    controller = AdaptiveController(rate=100.0, max_rate=100.0)
+    controller.acquire()
+    controller.release(429, 0.01, retry_after=0.2)
+    started = time.monotonic()
+    controller.acquire()
+    assert time.monotonic() - started >= 0.19
+    assert any(d["action"] == "pause" for d in controller.decisions)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def main():
+    """Main test function"""
+    test_additive_increase_stays_under_ceiling()
+    test_multiplicative_decrease_once_per_cooldown()
+    test_latency_rise_backs_off()
+    test_baseline_ignores_outliers_and_kinds()
+    test_retry_after_pauses_acquire()
+    test_parse_retry_after()
+    print("✅ Adaptive rate control verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test Replay Server
+Verifies that the scraper crawls the local UVS Ultra stand-in, including injected 429/5xx responses
+"""
+
+import os
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from replay_server import FaultInjector, ReplayCatalog, ReplayServer  # noqa: E402
+from scrape_uvsultra import ListingCrawler, TokenBucket, build_session, scrape_card, scrape_cards, scrape_list  # noqa: E402
+
+
+def test_listing_and_cards():
+    """GET page 1 and POST page=N cover the whole catalog; every card page parses to a distinct card"""
+    catalog = ReplayCatalog(card_count=45, page_size=10)
+    with ReplayServer(catalog) as server:
+        config = server.config()
+        session = build_session()
+        urls = scrape_list(config, session)
+        assert len(urls) == 45
+        assert urls[0] == f"{server.base_url}/card.php?id=1"
+        cards = [scrape_card(url, config, session) for url in urls[:6]]
+        assert all(card is not None for card in cards)
+        assert len({card.id for card in cards}) == 6
+        assert server.faults.stats["requests"] == 6 + catalog.page_count + 1
+
+
+def test_injected_errors_are_retried():
+    """Throttled and failing requests are retried until the page is served"""
+    faults = FaultInjector(throttle_rate=0.2, error_rate=0.1, seed=3)
+    with ReplayServer(ReplayCatalog(card_count=20, page_size=10), faults) as server:
+        config = server.config()
+        session = build_session()
+        cards = [scrape_card(f"{server.base_url}/card.php?id={i}", config, session) for i in range(1, 11)]
+    assert all(card is not None for card in cards)
+    assert faults.stats["throttled"] + faults.stats["errors"] > 0
+    assert faults.stats["ok"] == 10
+
+
+def test_parallel_listing_matches_serial():
+    """Probing for the last page and fetching the rest concurrently yields the serial order"""
+    for card_count in (1, 10, 11, 95, 333):
+        catalog = ReplayCatalog(card_count=card_count, page_size=10)
+        with ReplayServer(catalog) as server:
+            config = server.config()
+            serial = scrape_list(config, build_session())
+            crawler = ListingCrawler(config, build_session(), workers=4)
+            stream = iter(crawler)
+            first = next(stream)
+            assert crawler.pages.keys() == {1}, "page 1 links are yielded before probing"
+            parallel = [first] + list(stream)
+        assert parallel == serial
+        assert len(parallel) == card_count
+        assert crawler.last_page == catalog.page_count
+        assert crawler.estimated_total() == card_count
+
+
+def test_listing_respects_max_pages():
+    """No page past max_pages is fetched"""
+    with ReplayServer(ReplayCatalog(card_count=200, page_size=10)) as server:
+        crawler = ListingCrawler(server.config(), build_session(), workers=4, max_pages=7)
+        assert len(list(crawler)) == 70
+        assert crawler.last_page == 7
+        assert server.faults.stats["requests"] <= 7
+
+
+def test_parallel_listing_with_clamped_pages():
+    """A server that repeats the last page past the end still gives a bounded probe and the serial order"""
+    for card_count in (5, 10, 95, 333):
+        catalog = ReplayCatalog(card_count=card_count, page_size=10, clamp_pages=True)
+        with ReplayServer(catalog) as server:
+            config = server.config()
+            serial = scrape_list(config, build_session())
+            serial_requests = server.faults.stats["requests"]
+            crawler = ListingCrawler(config, build_session(), workers=4)
+            parallel = list(crawler)
+            probe_requests = server.faults.stats["requests"] - serial_requests
+        assert parallel == serial and len(parallel) == card_count
+        assert crawler.last_page == catalog.page_count
+        assert probe_requests <= catalog.page_count + 2 * catalog.page_count.bit_length() + 2
+
+
+def test_token_bucket_caps_all_threads():
+    """Threads sharing one bucket together stay under its rate"""
+    bucket = TokenBucket(rate=50.0)
+    started = time.monotonic()
+    threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # The first token is free; the other 19 arrive at 50/s
+    assert time.monotonic() - started >= 19 / 50 * 0.95
+
+
+def test_parallel_cards_keep_listing_order():
+    """Workers finishing out of order still yield cards in listing order, at the shared rate"""
+    faults = FaultInjector(jitter=0.03, seed=5)
+    with ReplayServer(ReplayCatalog(card_count=40, page_size=10), faults) as server:
+        config = server.config(rate_limit_seconds=0.02)
+        urls = [f"{server.base_url}/card.php?id={i}" for i in range(40, 0, -1)]
+        serial = [(url, card.id) for url, card in scrape_cards(urls, server.config(), build_session())]
+        server.requests.clear()
+        parallel = [(url, card.id) for url, card in scrape_cards(urls, config, build_session(), workers=4)]
+        times = sorted(t for t, _, _, _ in server.requests)
+    assert parallel == serial and [url for url, _ in parallel] == urls
+    # 40 requests drawn from one 50/s bucket, however many workers ask for them
+    assert times[-1] - times[0] >= 39 * 0.02 * 0.9
+
+
+def main():
+    """Main test function"""
+    test_listing_and_cards()
+    test_injected_errors_are_retried()
+    test_parallel_listing_matches_serial()
+    test_listing_respects_max_pages()
+    test_parallel_listing_with_clamped_pages()
+    test_token_bucket_caps_all_threads()
+    test_parallel_cards_keep_listing_order()
+    print("✅ Replay server crawl verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test Crawl Resume
+Verifies that an interrupted crawl, with JSON or streamed JSONL output, resumes and writes the same cards as a full crawl
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import yaml
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+import scrape_uvsultra  # noqa: E402
+from replay_server import ReplayCatalog, ReplayServer  # noqa: E402
+from scrape_uvsultra import CrawlCheckpoint, JsonlCardWriter, finalize_jsonl  # noqa: E402
+
+
+def run_scraper(*args):
+    """Run the scraper's command line in-process"""
+    argv = sys.argv
+    sys.argv = ["scrape_uvsultra.py", "--no-validate", "--no-abilities-index", *args]
+    try:
+        assert scrape_uvsultra.main() == 0
+    finally:
+        sys.argv = argv
+        # --max-pages reaches the listing crawler through the environment
+        os.environ.pop("UVS_MAX_PAGES", None)
+
+
+def write_config(server, tmp):
+    path = os.path.join(tmp, "config.yaml")
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(server.config(), f)
+    return path
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_resume_skips_recorded_pages():
+    """A resumed crawl fetches only the card pages missing from the checkpoint"""
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(ReplayCatalog(card_count=45, page_size=10)) as server:
+        config = write_config(server, tmp)
+        output = os.path.join(tmp, "cards.json")
+        run_scraper("--config", config, "--output-json", output, "--max-pages", "2")
+        assert len(load(output)) == 20
+        checkpoint = CrawlCheckpoint(os.path.join(tmp, "cards.checkpoint.jsonl"), resume=True)
+        checkpoint.close()
+        assert len(checkpoint) == 20
+
+        server.requests.clear()
+        run_scraper("--config", config, "--output-json", output, "--resume", "--workers", "3")
+        assert sorted(server.paths("/card.php")) == sorted(f"/card.php?id={i}" for i in range(21, 46))
+
+        fresh = os.path.join(tmp, "fresh", "cards.json")
+        run_scraper("--config", config, "--output-json", fresh)
+        assert load(output) == load(fresh) and len(load(fresh)) == 45
+
+
+def test_checkpoint_survives_partial_line():
+    """A line cut off by a crash is ignored, and appending starts on a fresh line"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoint.jsonl")
+        checkpoint = CrawlCheckpoint(path)
+        checkpoint.record("u1", {"id": "a"})
+        checkpoint.record("u2", None)
+        checkpoint.close()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"url": "u3", "ca')
+
+        resumed = CrawlCheckpoint(path, resume=True)
+        assert "u1" in resumed and "u2" in resumed and "u3" not in resumed
+        resumed.record("u3", {"id": "c"})
+        resumed.close()
+        again = CrawlCheckpoint(path, resume=True)
+        again.close()
+        assert again.cards(["u3", "u2", "u1"]) == [{"id": "c"}, {"id": "a"}]
+
+
+def test_streamed_output_resumes():
+    """--output-format jsonl streams cards as they are parsed and resumes into the same cards.json"""
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(ReplayCatalog(card_count=45, page_size=10)) as server:
+        config = write_config(server, tmp)
+        output = os.path.join(tmp, "cards.json")
+        run_scraper("--config", config, "--output-json", output, "--output-format", "jsonl", "--max-pages", "2")
+        with open(os.path.join(tmp, "cards.jsonl"), "r", encoding="utf-8") as f:
+            assert len(f.readlines()) == 20
+        server.requests.clear()
+        run_scraper("--config", config, "--output-json", output, "--output-format", "jsonl", "--resume")
+        assert len(server.paths("/card.php")) == 25
+
+        fresh = os.path.join(tmp, "fresh", "cards.json")
+        run_scraper("--config", config, "--output-json", fresh)
+        assert load(output) == load(fresh) and len(load(fresh)) == 45
+
+
+def test_finalize_drops_repeats_and_partial_lines():
+    """Finalizing skips a record repeated by a resume and a line cut off by a crash"""
+    cards = [{"id": f"c{i}", "image": {"url": f"https://example.test/{i}.jpg"}} for i in range(3)]
+    with tempfile.TemporaryDirectory() as tmp:
+        stream_path = os.path.join(tmp, "cards.jsonl")
+        writer = JsonlCardWriter(stream_path, fsync_every=2)
+        for card in cards[:2]:
+            writer.write(card)
+        writer.close()
+        with open(stream_path, "a", encoding="utf-8") as f:
+            f.write('{"id": "c2", "ima')
+
+        writer = JsonlCardWriter(stream_path, append=True)
+        for card in cards[1:]:
+            writer.write(card)
+        writer.close()
+        assert writer.count == 2
+
+        output = os.path.join(tmp, "cards.json")
+        local = {"https://example.test/0.jpg": "assets/images/cards/0.jpg"}
+        assert finalize_jsonl(stream_path, output, local) == 3
+        written = load(output)
+        assert [card["id"] for card in written] == ["c0", "c1", "c2"]
+        assert written[0]["image"] == {"url": "assets/images/cards/0.jpg"} and written[1] == cards[1]
+        with open(output, "r", encoding="utf-8") as f:
+            assert f.read() == json.dumps(written, indent=2, ensure_ascii=False)
+
+
+def main():
+    """Main test function"""
+    test_resume_skips_recorded_pages()
+    test_checkpoint_survives_partial_line()
+    test_streamed_output_resumes()
+    test_finalize_drops_repeats_and_partial_lines()
+    print("✅ Crawl resume verified")
+
+
+if __name__ == "__main__":
+    main()
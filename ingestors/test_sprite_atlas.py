@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test Sprite Atlas
+Verifies shelf packing stays within the size cap and atlases hold every card at its manifest rectangle
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "uvsultra"))
+
+from PIL import Image  # noqa: E402
+
+from sprite_atlas import build_atlases, pack_shelves  # noqa: E402
+
+COLOURS = [(200, 30, 30), (30, 200, 30), (30, 30, 200), (220, 220, 40), (40, 220, 220)]
+
+
+def test_pack_shelves():
+    """Boxes never overlap or cross the cap; overflow opens another atlas"""
+    sizes = [(f"c{i}", 100, 140 if i % 3 else 150) for i in range(30)]
+    pages = pack_shelves(sizes, max_size=512, padding=2)
+    assert sum(len(page["placements"]) for page in pages) == 30 and [len(page["placements"]) for page in pages] == [15, 15]
+    for page in pages:
+        assert page["width"] <= 512 and page["height"] <= 512
+        boxes = page["placements"]
+        for i, (_, x, y, w, h) in enumerate(boxes):
+            for _, x2, y2, w2, h2 in boxes[i + 1:]:
+                assert x + w <= x2 or x2 + w2 <= x or y + h <= y2 or y2 + h2 <= y
+    with pytest.raises(ValueError):
+        pack_shelves([("big", 600, 10)], max_size=512)
+
+
+def test_build_atlases_by_set():
+    """Cards are grouped by set, drawn at their rectangles, and unchanged sets are not repacked"""
+    with tempfile.TemporaryDirectory() as tmp:
+        images = os.path.join(tmp, "cards")
+        out = os.path.join(tmp, "atlases")
+        os.makedirs(images)
+        cards = []
+        for i, colour in enumerate(COLOURS):
+            Image.new("RGB", (50, 70), colour).save(os.path.join(images, f"card{i}.png"))
+            cards.append({"id": f"card{i}", "set": {"code": None, "name": "Set A" if i < 3 else "Set B"}})
+        cards_path = os.path.join(tmp, "cards.json")
+        with open(cards_path, "w", encoding="utf-8") as f:
+            json.dump(cards, f)
+
+        manifest = build_atlases(images, out, cards_path, tile_width=20, max_size=64, padding=1, fmt="jpeg", workers=1)
+        assert sorted(manifest["groups"]) == ["set-a", "set-b"] and len(manifest["cards"]) == 5
+        for i, colour in enumerate(COLOURS):
+            tile = manifest["cards"][f"card{i}"]
+            assert manifest["atlases"][tile["atlas"]]["group"] == ("set-a" if i < 3 else "set-b")
+            with Image.open(os.path.join(out, tile["atlas"])) as atlas:
+                pixel = atlas.convert("RGB").getpixel((tile["x"] + tile["w"] // 2, tile["y"] + tile["h"] // 2))
+            assert all(abs(a - b) < 24 for a, b in zip(pixel, colour))
+
+        Image.new("RGB", (50, 70), (0, 0, 0)).save(os.path.join(images, "card4.png"))
+        again = build_atlases(images, out, cards_path, tile_width=20, max_size=64, padding=1, fmt="jpeg", workers=1)
+        assert again["packed"] == ["set-b"]
+        assert sorted(os.listdir(out)) == sorted(list(again["atlases"]) + ["manifest.json"])
+
+
+def test_preview_images_map_to_card_ids():
+    """Mirrored NNN-preview.jpg_<date> files are keyed by the card with that set number, as getImageUrl names them"""
+    with tempfile.TemporaryDirectory() as tmp:
+        images = os.path.join(tmp, "cards")
+        out = os.path.join(tmp, "atlases")
+        os.makedirs(images)
+        for name, colour in zip(["001-preview.jpg_20240802", "001B-preview.jpg_20240802", "012-preview.jpg_20240802"], COLOURS):
+            Image.new("RGB", (50, 70), colour).save(os.path.join(images, name), "JPEG")
+        cards = [
+            {"id": "mha_001", "set": {"code": "MHA", "number": "1"}},
+            {"id": "mha_012", "set": {"code": "MHA", "number": "012"}},
+        ]
+        cards_path = os.path.join(tmp, "cards.json")
+        with open(cards_path, "w", encoding="utf-8") as f:
+            json.dump(cards, f)
+
+        manifest = build_atlases(images, out, cards_path, tile_width=20, max_size=64, padding=1, fmt="jpeg", workers=1)
+        assert sorted(manifest["cards"]) == ["001B-preview", "mha_001", "mha_012"]
+        assert sorted(manifest["groups"]) == ["cards", "mha"]
+        assert manifest["atlases"][manifest["cards"]["mha_012"]["atlas"]]["group"] == "mha"
+        umask = os.umask(0)
+        os.umask(umask)
+        for name in os.listdir(out):
+            assert os.stat(os.path.join(out, name)).st_mode & 0o777 == 0o666 & ~umask
+
+
+def main():
+    """Main test function"""
+    test_pack_shelves()
+    test_build_atlases_by_set()
+    test_preview_images_map_to_card_ids()
+    print("✅ Sprite atlases verified")
+
+
+if __name__ == "__main__":
+    main()
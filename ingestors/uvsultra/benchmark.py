@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Offline benchmarks for the UVS Ultra ingestor.
+
+Crawl stages run against a local replay server (see replay_server.py) instead
+of uvsultra.online; parsing stages run on the same generated card pages
+in-process. Results are written as JSON so runs can be compared over time:
+
+    python3 ingestors/uvsultra/benchmark.py --cards 2000 --output bench/today.json
+    python3 ingestors/uvsultra/benchmark.py --cards 2000 --compare bench/today.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from card_schema import DEFAULT_SCHEMA, load_validator, validate_batch
+from replay_server import DEFAULT_FIXTURES, FaultInjector, ReplayCatalog, ReplayServer
+from scrape_uvsultra import build_session, extract_keywords, parse_card, parse_detail_fields, parse_detail_fields_lxml, scrape_card, scrape_cards, scrape_list
+
+# AbilitySystem lives one level up, next to ability_index
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ability_system import AbilitySystem  # noqa: E402
+
+RESULTS_VERSION = 1
+
+
+def measure(run: Callable[[], int], repeat: int) -> Dict[str, Any]:
+    """Time run() `repeat` times; run returns the number of items it processed."""
+    timings: List[float] = []
+    items = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = run()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "items": items,
+        "repeat": repeat,
+        "best_seconds": round(best, 6),
+        "median_seconds": round(statistics.median(timings), 6),
+        "items_per_second": round(items / best, 2) if best else None,
+        "us_per_item": round(best / items * 1e6, 2) if items else None,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    catalog = ReplayCatalog(args.fixtures, args.cards, args.page_size)
+    pages = [catalog.card_page(card_id) for card_id in range(1, args.cards + 1)]
+    config = {"base_url": "http://127.0.0.1"}
+    cards = [card for card in (parse_card(page, config) for page in pages) if card is not None]
+    texts = [card.text for card in cards]
+    normalized = [card.to_normalized() for card in cards]
+    validator = load_validator(DEFAULT_SCHEMA)
+    ability_cards = [{"abilities": [line for line in (card.text or "").split("\n") if line.strip()]} for card in cards]
+
+    results: Dict[str, Any] = {}
+
+    def parse_soup() -> int:
+        for page in pages:
+            parse_detail_fields(BeautifulSoup(page, "lxml"))
+        return len(pages)
+
+    def parse_lxml() -> int:
+        for page in pages:
+            parse_detail_fields_lxml(page)
+        return len(pages)
+
+    def keywords() -> int:
+        for text in texts:
+            extract_keywords(text)
+        return len(texts)
+
+    def categorize_cold() -> int:
+        abilities = AbilitySystem(cache_size=0)
+        for card in ability_cards:
+            abilities.categorize_card_abilities(card)
+        return len(ability_cards)
+
+    def categorize_cached() -> int:
+        abilities = AbilitySystem()
+        for card in ability_cards:
+            abilities.categorize_card_abilities(card)
+        return len(ability_cards)
+
+    def validate() -> int:
+        validate_batch(normalized, validator)
+        return len(normalized)
+
+    results["parse_detail_fields.soup"] = measure(parse_soup, args.repeat)
+    results["parse_detail_fields.lxml"] = measure(parse_lxml, args.repeat)
+    results["extract_keywords"] = measure(keywords, args.repeat)
+    results["categorize_card_abilities.uncached"] = measure(categorize_cold, args.repeat)
+    results["categorize_card_abilities.cached"] = measure(categorize_cached, args.repeat)
+    results["validate_cards"] = measure(validate, args.repeat)
+
+    faults = FaultInjector(args.latency, args.jitter, args.throttle_rate, args.error_rate, seed=args.seed)
+    with ReplayServer(catalog, faults) as server:
+        server_config = server.config()
+        card_urls: List[str] = []
+
+        def crawl_listing() -> int:
+            card_urls[:] = scrape_list(server_config, build_session())
+            return len(card_urls)
+
+        results["scrape_list"] = measure(crawl_listing, args.repeat)
+        results["scrape_list"]["pages"] = catalog.page_count
+        if args.workers > 1:
+            def crawl_listing_parallel() -> int:
+                return len(scrape_list(server_config, build_session(), workers=args.workers))
+
+            results[f"scrape_list.workers{args.workers}"] = measure(crawl_listing_parallel, args.repeat)
+        detail_urls = card_urls[: args.detail_cards]
+
+        def crawl_cards() -> int:
+            session = build_session()
+            for url in detail_urls:
+                scrape_card(url, server_config, session)
+            return len(detail_urls)
+
+        results["scrape_card"] = measure(crawl_cards, args.repeat)
+        if args.workers > 1:
+            def crawl_cards_parallel() -> int:
+                return sum(1 for _ in scrape_cards(detail_urls, server_config, build_session(), workers=args.workers))
+
+            results[f"scrape_cards.workers{args.workers}"] = measure(crawl_cards_parallel, args.repeat)
+        server_stats = dict(faults.stats)
+
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "params": {
+            "cards": args.cards,
+            "page_size": args.page_size,
+            "detail_cards": len(detail_urls),
+            "repeat": args.repeat,
+            "workers": args.workers,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "throttle_rate": args.throttle_rate,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+        },
+        "server": server_stats,
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """One line per benchmark with the change in best time against a baseline run."""
+    lines = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or not before.get("us_per_item") or not result.get("us_per_item"):
+            lines.append(f"{name:40s} {result.get('us_per_item')} us/item (no baseline)")
+            continue
+        change = (result["us_per_item"] - before["us_per_item"]) / before["us_per_item"] * 100
+        lines.append(f"{name:40s} {before['us_per_item']:>10.1f} -> {result['us_per_item']:>10.1f} us/item ({change:+.1f}%)")
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the UVS Ultra ingestor against a local replay server")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--cards", type=int, default=2000, help="Catalog size served and parsed")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--detail-cards", type=int, default=500, help="Card pages fetched by the scrape_card benchmarks")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4, help="Also benchmark scrape_list and scrape_cards with this many workers (1 to skip)")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write results JSON here instead of stdout")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for line in compare(report, baseline):
+            print(line, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Content-addressed history of normalized cards across ingest runs.
+
+    objects.jsonl   one line per distinct card record: "<sha256>\\t<json>"
+    runs.jsonl      one line per run: what changed since the previous run
+
+A record's hash is the SHA-256 of its canonical JSON (sorted keys), so a card
+that comes back unchanged is stored once no matter how many runs see it. A
+run line lists only the ids whose hash changed ({id: hash}) and the ids that
+disappeared, so both files grow with the number of changed cards, not with
+the catalog size.
+
+Opening the store reads runs.jsonl and only the hash prefix of each object
+line, building the per-card timeline index and object offsets. as_of(run)
+replays the changes up to that run and reads just the objects it needs:
+
+    history = CardHistory(".cache/uvsultra-history")
+    history.commit(cards, label="2024-05-01")
+    cards = history.as_of("2024-05-01")
+    for entry in history.timeline("mha_001"):
+        print(entry["run"], entry["status"], entry["fields"])
+
+Reconstructed cards come back in the order their ids were first seen.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+OBJECTS_NAME = "objects.jsonl"
+RUNS_NAME = "runs.jsonl"
+
+RunRef = Union[int, str]
+
+
+def record_hash(card: Dict[str, Any]) -> str:
+    return hashlib.sha256(canonical_json(card).encode("utf-8")).hexdigest()
+
+
+def canonical_json(card: Dict[str, Any]) -> str:
+    return json.dumps(card, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def changed_fields(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> List[str]:
+    """Top-level fields that differ, with nested objects (set, image) compared per key."""
+    old, new = old or {}, new or {}
+    fields = []
+    for name in sorted(set(old) | set(new)):
+        before, after = old.get(name), new.get(name)
+        if before == after:
+            continue
+        if isinstance(before, dict) and isinstance(after, dict):
+            fields.extend(f"{name}.{key}" for key in sorted(set(before) | set(after)) if before.get(key) != after.get(key))
+        else:
+            fields.append(name)
+    return fields
+
+
+class CardHistory:
+    """Deduplicated card records plus per-run change manifests, append-only."""
+
+    def __init__(self, path: str, writable: bool = True) -> None:
+        self.path = path
+        self.writable = writable
+        self.objects_path = os.path.join(path, OBJECTS_NAME)
+        self.runs_path = os.path.join(path, RUNS_NAME)
+        # hash -> (byte offset, length) of the object line
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        self.runs: List[Dict[str, Any]] = []
+        # card id -> [(run index, hash or None when removed)], oldest first
+        self.changes: Dict[str, List[Tuple[int, Optional[str]]]] = {}
+        # Latest manifest, id -> hash, in first-seen order
+        self.current: Dict[str, str] = {}
+        if writable:
+            os.makedirs(path, exist_ok=True)
+        elif not os.path.exists(self.runs_path):
+            raise FileNotFoundError(f"No card history at {self.runs_path}")
+        self._load()
+
+    def _load(self) -> None:
+        if os.path.exists(self.objects_path):
+            with open(self.objects_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    # A crash mid-write leaves at most one partial last line
+                    if not line.endswith(b"\n"):
+                        break
+                    if line[64:65] == b"\t":
+                        self.offsets[line[:64].decode("ascii")] = (offset, len(line))
+                    offset += len(line)
+            if self.writable and offset < os.path.getsize(self.objects_path):
+                # Drop the partial line so the next append starts on a line boundary
+                with open(self.objects_path, "r+b") as f:
+                    f.truncate(offset)
+        if not os.path.exists(self.runs_path):
+            return
+        with open(self.runs_path, "rb") as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    run = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._apply(run)
+        if self.writable and offset < os.path.getsize(self.runs_path):
+            with open(self.runs_path, "r+b") as f:
+                f.truncate(offset)
+
+    def _apply(self, run: Dict[str, Any]) -> None:
+        index = len(self.runs)
+        run["run"] = index
+        self.runs.append(run)
+        for card_id, digest in run.get("changed", {}).items():
+            self.current[card_id] = digest
+            self.changes.setdefault(card_id, []).append((index, digest))
+        for card_id in run.get("removed", ()):
+            self.current.pop(card_id, None)
+            self.changes.setdefault(card_id, []).append((index, None))
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    def commit(self, cards: Iterable[Dict[str, Any]], label: Optional[str] = None) -> Dict[str, Any]:
+        """Record one ingest run; returns its run line with added/changed/removed/new-object counts.
+
+        Raises ValueError, recording nothing, if two cards share an id: a run
+        keeps one version per id, so either would silently hide the other.
+        """
+        manifest: Dict[str, str] = {}
+        new_objects: Dict[str, str] = {}
+        duplicates: Dict[str, int] = {}
+        for card in cards:
+            text = canonical_json(card)
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            card_id = str(card["id"])
+            if card_id in manifest:
+                duplicates[card_id] = duplicates.get(card_id, 1) + 1
+            manifest[card_id] = digest
+            if digest not in self.offsets and digest not in new_objects:
+                new_objects[digest] = text
+        if duplicates:
+            listed = ", ".join(f"{card_id} (x{count})" for card_id, count in sorted(duplicates.items())[:10])
+            raise ValueError(f"Card ids used by more than one card ({len(duplicates)}): {listed}{', ...' if len(duplicates) > 10 else ''}")
+
+        changed = {card_id: digest for card_id, digest in manifest.items() if self.current.get(card_id) != digest}
+        removed = [card_id for card_id in self.current if card_id not in manifest]
+        added = sum(1 for card_id in changed if card_id not in self.current)
+
+        # Objects first, so a run line never points at a missing record
+        if new_objects:
+            with open(self.objects_path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                for digest, text in new_objects.items():
+                    line = f"{digest}\t{text}\n".encode("utf-8")
+                    f.write(line)
+                    self.offsets[digest] = (offset, len(line))
+                    offset += len(line)
+        run = {
+            "label": label or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "created_at": int(time.time()),
+            "cards": len(manifest),
+            "added": added,
+            "modified": len(changed) - added,
+            "new_objects": len(new_objects),
+            "changed": changed,
+            "removed": removed,
+        }
+        with open(self.runs_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+        self._apply(run)
+        return run
+
+    def resolve(self, ref: RunRef) -> int:
+        """Run index for a label (latest run with it) or an index (negative counts from the latest).
+
+        A string is looked up as a label first, so a label such as "20240501"
+        is never taken for a run index; other digit strings are indexes.
+        """
+        if isinstance(ref, str):
+            for run in reversed(self.runs):
+                if run["label"] == ref:
+                    return run["run"]
+            if not ref.lstrip("-").isdigit():
+                raise KeyError(f"No run labelled {ref!r}")
+        index = int(ref)
+        if index < 0:
+            index += len(self.runs)
+        if 0 <= index < len(self.runs):
+            return index
+        raise KeyError(f"No run {ref} (history has {len(self.runs)})")
+
+    def manifest(self, ref: RunRef = -1) -> Dict[str, str]:
+        """id -> hash as of a run."""
+        index = self.resolve(ref)
+        if index == len(self.runs) - 1:
+            return dict(self.current)
+        manifest: Dict[str, str] = {}
+        for run in self.runs[:index + 1]:
+            manifest.update(run.get("changed", {}))
+            for card_id in run.get("removed", ()):
+                manifest.pop(card_id, None)
+        return manifest
+
+    def load(self, digests: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Records for the given hashes, read in file order through one handle."""
+        wanted = sorted(set(digests), key=lambda d: self.offsets[d][0])
+        records: Dict[str, Dict[str, Any]] = {}
+        with open(self.objects_path, "rb") as f:
+            for digest in wanted:
+                offset, length = self.offsets[digest]
+                f.seek(offset)
+                records[digest] = json.loads(f.read(length)[65:])
+        return records
+
+    def as_of(self, ref: RunRef = -1) -> List[Dict[str, Any]]:
+        """The card database exactly as a run saw it."""
+        manifest = self.manifest(ref)
+        records = self.load(manifest.values())
+        return [records[digest] for digest in manifest.values()]
+
+    def timeline(self, card_id: str) -> List[Dict[str, Any]]:
+        """Each run where the card was added, modified or removed, with the fields that changed."""
+        entries = []
+        previous: Optional[Dict[str, Any]] = None
+        changes = self.changes.get(card_id, [])
+        records = self.load(digest for _, digest in changes if digest is not None)
+        for index, digest in changes:
+            card = records.get(digest) if digest is not None else None
+            if card is None:
+                status = "removed"
+            elif previous is None:
+                status = "added"
+            else:
+                status = "modified"
+            run = self.runs[index]
+            entries.append({
+                "run": index,
+                "label": run["label"],
+                "created_at": run["created_at"],
+                "status": status,
+                "hash": digest,
+                "fields": changed_fields(previous, card) if status == "modified" else [],
+                "card": card,
+            })
+            previous = card
+        return entries
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": len(self.runs),
+            "cards": len(self.current),
+            "objects": len(self.offsets),
+            "objects_bytes": os.path.getsize(self.objects_path) if os.path.exists(self.objects_path) else 0,
+            "runs_bytes": os.path.getsize(self.runs_path) if os.path.exists(self.runs_path) else 0,
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Versioned, deduplicated history of normalized card runs")
+    parser.add_argument("history", metavar="DIR")
+    sub = parser.add_subparsers(dest="command", required=True)
+    commit = sub.add_parser("commit", help="Record a cards.json as a new run")
+    commit.add_argument("cards_json")
+    commit.add_argument("--label", default=None)
+    sub.add_parser("log", help="List runs with their change counts")
+    as_of = sub.add_parser("as-of", help="Write the cards as of a run (label, else index)")
+    as_of.add_argument("run")
+    as_of.add_argument("--output", "-o", default=None, help="Output JSON (default: stdout)")
+    timeline = sub.add_parser("timeline", help="Show when a card was added, changed and removed")
+    timeline.add_argument("card_id")
+    args = parser.parse_args()
+
+    history = CardHistory(args.history, writable=args.command == "commit")
+    if args.command == "commit":
+        with open(args.cards_json, "r", encoding="utf-8") as f:
+            run = history.commit(json.load(f), args.label)
+        print(f"Run {run['run']} ({run['label']}): {run['cards']} cards, {run['added']} added, {run['modified']} modified, {len(run['removed'])} removed, {run['new_objects']} new records")
+    elif args.command == "log":
+        for run in history.runs:
+            print(f"{run['run']:5d}  {run['label']:22s} {run['cards']:7d} cards  +{run['added']} ~{run['modified']} -{len(run['removed'])}")
+        print(json.dumps(history.stats()), file=sys.stderr)
+    elif args.command == "as-of":
+        cards = history.as_of(args.run)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(cards, f, ensure_ascii=False, indent=2)
+            print(f"Wrote {len(cards)} cards as of run {history.resolve(args.run)} to {args.output}", file=sys.stderr)
+        else:
+            print(json.dumps(cards, ensure_ascii=False, indent=2))
+    else:
+        entries = history.timeline(args.card_id)
+        if not entries:
+            print(f"No history for {args.card_id}", file=sys.stderr)
+            return 1
+        for entry in entries:
+            detail = ", ".join(entry["fields"])
+            print(f"{entry['run']:5d}  {entry['label']:22s} {entry['status']:8s} {detail}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
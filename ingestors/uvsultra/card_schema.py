@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Compiled validation of normalized cards against card_db/schema/cards.schema.json.
+
+compile_schema() turns the JSON Schema into nested closures once, so checking
+a card is a handful of isinstance calls and dict lookups rather than a walk
+over the schema per record. It covers the draft-07 keywords the card schema
+uses (type, required, properties, additionalProperties, items, minLength,
+maxLength, enum, uniqueItems) and raises SchemaError on any other keyword
+instead of silently not checking it.
+
+    validator = load_validator("card_db/schema/cards.schema.json")
+    report = validate_batch(cards, validator)
+    print("\\n".join(report.summary_lines()))
+
+Violations are grouped by field path (set.code, keywords[]) and message,
+with counts and a few example card ids.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_SCHEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "card_db", "schema", "cards.schema.json")
+EXAMPLES_PER_FIELD = 5
+
+Errors = List[Tuple[str, str]]
+Check = Callable[[Any, str, Errors], None]
+
+TYPES: Dict[str, Tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list,),
+    "null": (type(None),),
+}
+# Keywords that carry no constraint
+ANNOTATIONS = {"$schema", "$id", "title", "description", "$comment", "examples", "default"}
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def _type_name(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    for name in ("integer", "number", "string", "object", "array"):
+        if isinstance(value, TYPES[name]):
+            return name
+    return type(value).__name__
+
+
+def _compile_type(spec: Any) -> Check:
+    names = [spec] if isinstance(spec, str) else list(spec)
+    unknown = [name for name in names if name not in TYPES]
+    if unknown:
+        raise SchemaError(f"Unknown type {unknown[0]!r}")
+    python_types = tuple(t for name in names for t in TYPES[name])
+    # bool is an int subclass but only matches "boolean"
+    allow_bool = "boolean" in names
+    message = "expected " + " or ".join(names)
+
+    def check(value: Any, path: str, errors: Errors) -> None:
+        if not isinstance(value, python_types) or (isinstance(value, bool) and not allow_bool):
+            errors.append((path, f"{message}, got {_type_name(value)}"))
+
+    return check
+
+
+def _compile(schema: Dict[str, Any], path: str = "") -> Check:
+    unsupported = set(schema) - ANNOTATIONS - {"type", "required", "properties", "additionalProperties", "items", "minLength", "maxLength", "enum", "uniqueItems"}
+    if unsupported:
+        raise SchemaError(f"Unsupported schema keyword(s) at {path or '<root>'}: {', '.join(sorted(unsupported))}")
+    checks: List[Check] = []
+    if "type" in schema:
+        checks.append(_compile_type(schema["type"]))
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+        listed = ", ".join(json.dumps(v) for v in allowed)
+
+        def check_enum(value: Any, path: str, errors: Errors) -> None:
+            if value not in allowed:
+                errors.append((path, f"not one of {listed}"))
+
+        checks.append(check_enum)
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    if min_length is not None or max_length is not None:
+        low = min_length or 0
+        high = max_length if max_length is not None else float("inf")
+
+        def check_length(value: Any, path: str, errors: Errors) -> None:
+            if isinstance(value, str):
+                if len(value) < low:
+                    errors.append((path, f"shorter than {low}"))
+                elif len(value) > high:
+                    errors.append((path, f"longer than {high}"))
+
+        checks.append(check_length)
+    if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+        checks.append(_compile_object(schema, path))
+    if "items" in schema or schema.get("uniqueItems"):
+        checks.append(_compile_array(schema, path))
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value: Any, path: str, errors: Errors) -> None:
+        for check in checks:
+            check(value, path, errors)
+
+    return check_all
+
+
+def _compile_object(schema: Dict[str, Any], path: str) -> Check:
+    # Paths never contain array indexes, so every field path is known at compile time
+    required = tuple((name, _join(path, name)) for name in schema.get("required", ()))
+    properties = tuple((name, _join(path, name), _compile(sub, _join(path, name))) for name, sub in schema.get("properties", {}).items())
+    additional = schema.get("additionalProperties", True)
+    if isinstance(additional, dict):
+        raise SchemaError(f"Unsupported schema keyword(s) at {path or '<root>'}: additionalProperties schema")
+    known = frozenset(name for name, _, _ in properties)
+
+    def check(value: Any, path: str, errors: Errors) -> None:
+        if not isinstance(value, dict):
+            return
+        for name, field in required:
+            if name not in value:
+                errors.append((field, "required property missing"))
+        for name, field, check_property in properties:
+            if name in value:
+                check_property(value[name], field, errors)
+        if additional is False and not known.issuperset(value):
+            for name in value:
+                if name not in known:
+                    errors.append((_join(path, name), "additional property not allowed"))
+
+    return check
+
+
+def _compile_array(schema: Dict[str, Any], path: str) -> Check:
+    items = _compile(schema["items"], path + "[]") if "items" in schema else None
+    unique = bool(schema.get("uniqueItems"))
+
+    def check(value: Any, path: str, errors: Errors) -> None:
+        if not isinstance(value, list):
+            return
+        if items is not None:
+            item_path = path + "[]"
+            for item in value:
+                items(item, item_path, errors)
+        if unique:
+            seen = [json.dumps(item, sort_keys=True) for item in value]
+            if len(set(seen)) != len(seen):
+                errors.append((path, "items are not unique"))
+
+    return check
+
+
+def _join(path: str, name: str) -> str:
+    return f"{path}.{name}" if path else name
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], Errors]:
+    """A function returning the (field path, message) violations of one record."""
+    check = _compile(schema)
+
+    def validate(record: Any) -> Errors:
+        errors: Errors = []
+        check(record, "", errors)
+        return errors
+
+    return validate
+
+
+def load_validator(path: str = DEFAULT_SCHEMA) -> Callable[[Any], Errors]:
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_schema(json.load(f))
+
+
+class ValidationReport:
+    """Violation counts per field and message, mergeable across batches."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.invalid = 0
+        self.fields: Dict[str, Dict[str, int]] = {}
+        self.examples: Dict[str, List[str]] = {}
+
+    def add(self, card_id: Any, errors: Errors) -> None:
+        self.total += 1
+        if not errors:
+            return
+        self.invalid += 1
+        for path, message in errors:
+            messages = self.fields.setdefault(path, {})
+            messages[message] = messages.get(message, 0) + 1
+            examples = self.examples.setdefault(path, [])
+            if len(examples) < EXAMPLES_PER_FIELD and str(card_id) not in examples:
+                examples.append(str(card_id))
+
+    def merge(self, other: "ValidationReport") -> None:
+        self.total += other.total
+        self.invalid += other.invalid
+        for path, messages in other.fields.items():
+            mine = self.fields.setdefault(path, {})
+            for message, count in messages.items():
+                mine[message] = mine.get(message, 0) + count
+        for path, examples in other.examples.items():
+            mine_examples = self.examples.setdefault(path, [])
+            mine_examples.extend(e for e in examples if e not in mine_examples)
+            del mine_examples[EXAMPLES_PER_FIELD:]
+
+    def field_counts(self) -> Dict[str, int]:
+        return {path: sum(messages.values()) for path, messages in self.fields.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "invalid": self.invalid,
+            "fields": {
+                path: {"count": sum(messages.values()), "messages": dict(sorted(messages.items(), key=lambda m: -m[1])), "examples": self.examples.get(path, [])}
+                for path, messages in sorted(self.fields.items(), key=lambda f: -sum(f[1].values()))
+            },
+        }
+
+    def summary_lines(self) -> List[str]:
+        lines = [f"Schema: {self.invalid} of {self.total} cards invalid"]
+        for path, field in self.to_dict()["fields"].items():
+            detail = "; ".join(f"{message} x{count}" for message, count in field["messages"].items())
+            lines.append(f"  {path:16s} {field['count']:7d}  {detail} (e.g. {', '.join(field['examples'])})")
+        return lines
+
+
+def validate_batch(cards: Iterable[Dict[str, Any]], validator: Callable[[Any], Errors]) -> ValidationReport:
+    report = ValidationReport()
+    add = report.add
+    for card in cards:
+        add(card.get("id") if isinstance(card, dict) else None, validator(card))
+    return report
+
+
+# Compiled once per worker process by _init_worker
+_WORKER_VALIDATOR: Optional[Callable[[Any], Errors]] = None
+
+
+def _init_worker(schema_path: str) -> None:
+    global _WORKER_VALIDATOR
+    _WORKER_VALIDATOR = load_validator(schema_path)
+
+
+def _validate_in_worker(cards: List[Dict[str, Any]]) -> ValidationReport:
+    return validate_batch(cards, _WORKER_VALIDATOR)
+
+
+def validate_cards(cards: List[Dict[str, Any]], schema_path: str = DEFAULT_SCHEMA, workers: int = 1, batch_size: int = 2000) -> ValidationReport:
+    """Validate in batches; with workers > 1 batches run on a process pool that compiles the schema once per process."""
+    if workers <= 1 or len(cards) <= batch_size:
+        return validate_batch(cards, load_validator(schema_path))
+    report = ValidationReport()
+    batches = [cards[i:i + batch_size] for i in range(0, len(cards), batch_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(schema_path,)) as executor:
+        for partial in executor.map(_validate_in_worker, batches):
+            report.merge(partial)
+    return report
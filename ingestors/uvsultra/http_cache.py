@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class ResponseCache:
+    """SQLite-backed HTTP response cache with conditional revalidation.
+
+    Entries are keyed by method, URL and form body. Entries younger than
+    ttl_seconds are served without touching the network; older ones are
+    revalidated with If-None-Match / If-Modified-Since. The store is capped at
+    max_bytes of body data and evicts least recently used entries first.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 3600.0, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.db.commit()
+
+    @staticmethod
+    def make_key(method: str, url: str, data: Optional[Dict[str, Any]] = None) -> str:
+        body = urlencode(sorted(data.items())) if data else ""
+        return hashlib.sha256(f"{method.upper()} {url}\n{body}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT url, headers, encoding, body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        url, headers, encoding, body, etag, last_modified, stored_at = row
+        return {
+            "url": url,
+            "headers": json.loads(headers),
+            "encoding": encoding,
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": stored_at,
+        }
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["stored_at"] < self.ttl_seconds
+
+    def put(self, key: str, resp: requests.Response) -> None:
+        body = resp.content
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    resp.url,
+                    json.dumps(dict(resp.headers)),
+                    resp.encoding,
+                    body,
+                    resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"),
+                    now,
+                    now,
+                    len(body),
+                ),
+            )
+            self._evict()
+            self.db.commit()
+
+    def touch(self, key: str, headers: CaseInsensitiveDict) -> None:
+        """Mark an entry as revalidated after a 304, picking up new validators."""
+        with self.lock:
+            now = time.time()
+            self.db.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ?,"
+                " etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (now, now, headers.get("ETag"), headers.get("Last-Modified"), key),
+            )
+            self.db.commit()
+
+    def _evict(self) -> None:
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
+
+
+def build_cached_response(entry: Dict[str, Any]) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = entry["body"]
+    resp.headers = CaseInsensitiveDict(entry["headers"])
+    resp.encoding = entry["encoding"]
+    resp.url = entry["url"]
+    resp.from_cache = True
+    return resp
+
+
+class CachingSession(requests.Session):
+    """requests.Session that answers from a ResponseCache and revalidates stale entries.
+
+    Only successful (200) responses are stored. Responses served without a
+    network round trip carry from_cache = True.
+    """
+
+    def __init__(self, cache: ResponseCache) -> None:
+        super().__init__()
+        self.cache = cache
+
+    def fresh_response(self, method: str, url: str, data: Optional[Dict[str, Any]] = None) -> Optional[requests.Response]:
+        """The stored response if its entry is still fresh, else None; never touches the network."""
+        entry = self.cache.get(self.cache.make_key(method, url, data))
+        if entry is not None and self.cache.is_fresh(entry):
+            return build_cached_response(entry)
+        return None
+
+    def request(self, method: str, url: str, data: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> requests.Response:
+        key = self.cache.make_key(method, url, data)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return build_cached_response(entry)
+
+        headers = dict(headers or {})
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = super().request(method, url, data=data, headers=headers, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            self.cache.touch(key, resp.headers)
+            cached = build_cached_response(entry)
+            cached.from_cache = False
+            return cached
+        if resp.status_code == 200:
+            self.cache.put(key, resp)
+        return resp
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+DEFAULT_WIDTHS = (120, 240, 480)
+FORMATS = {
+    "webp": {"format": "WEBP", "ext": ".webp", "options": {"quality": 80, "method": 4}},
+    "jpeg": {"format": "JPEG", "ext": ".jpg", "options": {"quality": 82, "optimize": True, "progressive": True}},
+}
+# Download date some mirrors append to image names, e.g. 001-preview.jpg_20240802
+DATE_SUFFIX = re.compile(r"_\d{8}$")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def discover_sources(images_dir: str) -> Dict[str, str]:
+    """Map card key -> source image path.
+
+    Uses the download manifest written by ImagePipeline when present, otherwise
+    every file directly under images_dir keyed by its name up to the first dot.
+    """
+    manifest_path = os.path.join(images_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return dict(json.load(f).get("cards", {}))
+    sources = {}
+    for name in sorted(os.listdir(images_dir)):
+        path = os.path.join(images_dir, name)
+        if os.path.isfile(path) and not name.startswith("."):
+            sources[name.split(".")[0]] = path
+    return sources
+
+
+def load_cards(cards_path: Optional[str]) -> List[Dict[str, Any]]:
+    if not cards_path or not os.path.exists(cards_path):
+        return []
+    with open(cards_path, "r", encoding="utf-8") as f:
+        return [card for card in json.load(f) if isinstance(card, dict) and "id" in card]
+
+
+def preview_name(card: Dict[str, Any]) -> Optional[str]:
+    """The card's image path as the UI's getImageUrl builds it: <code>/<pad3(number)>-preview.jpg."""
+    card_set = card.get("set") or {}
+    code, number = card_set.get("code"), card_set.get("number")
+    if not code or not number:
+        return None
+    return f"{code}/{re.sub(r'[^0-9]', '', str(number)).zfill(3)}-preview.jpg"
+
+
+def image_card_ids(cards: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Map image names to card ids, by <code>/<file> and, where only one card has it, by <file> alone."""
+    ids: Dict[str, str] = {}
+    by_file: Dict[str, List[str]] = {}
+    for card in cards:
+        name = preview_name(card)
+        if name:
+            ids[name] = str(card["id"])
+            by_file.setdefault(name.split("/", 1)[1], []).append(str(card["id"]))
+    for name, card_ids in by_file.items():
+        if len(card_ids) == 1:
+            ids.setdefault(name, card_ids[0])
+    return ids
+
+
+def source_key(key: str, path: str, images_dir: str, ids: Dict[str, str]) -> str:
+    """Card id for a source image when its name matches a card, else the key it was discovered under."""
+    name = DATE_SUFFIX.sub("", os.path.relpath(path, images_dir).replace(os.sep, "/"))
+    return ids.get(name) or ids.get(os.path.basename(name)) or key
+
+
+def card_sources(images_dir: str, cards: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Map card id -> source image path, for images whose name matches a card; others keep their discovered key."""
+    ids = image_card_ids(cards)
+    return {source_key(key, path, images_dir, ids): path for key, path in discover_sources(images_dir).items()}
+
+
+def save_atomic(img: Image.Image, path: str, fmt: str, options: Dict[str, Any]) -> None:
+    tmp_path = path + ".tmp"
+    try:
+        img.save(tmp_path, fmt, **options)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def render_variants(source: str, digest: str, out_dir: str, widths: Tuple[int, ...]) -> Dict[str, Any]:
+    """Generate every width/format variant for one source image (runs in a worker process)."""
+    target_dir = os.path.join(out_dir, digest[:2])
+    os.makedirs(target_dir, exist_ok=True)
+    with Image.open(source) as img:
+        source_is_jpeg = img.format == "JPEG"
+        img = img.convert("RGB")
+        width, height = img.size
+        variants: Dict[str, Dict[str, str]] = {name: {} for name in FORMATS}
+        # Never upscale; the largest variant is capped at the source width
+        for target in sorted({min(w, width) for w in widths}):
+            resized = img if target == width else img.resize((target, max(1, round(height * target / width))), Image.LANCZOS)
+            for name, spec in FORMATS.items():
+                if name == "jpeg" and target == width and source_is_jpeg:
+                    # Re-encoding the original JPEG at full size only loses quality
+                    variants[name][str(target)] = source
+                    continue
+                path = os.path.join(target_dir, f"{digest}-{target}w{spec['ext']}")
+                if not os.path.exists(path):
+                    save_atomic(resized, path, spec["format"], spec["options"])
+                variants[name][str(target)] = path
+    return {"width": width, "height": height, "variants": variants}
+
+
+def is_complete(entry: Optional[Dict[str, Any]], widths: Tuple[int, ...]) -> bool:
+    if not entry:
+        return False
+    expected = {str(min(w, entry["width"])) for w in widths}
+    for name in FORMATS:
+        paths = entry["variants"].get(name, {})
+        if set(paths) != expected or not all(os.path.exists(p) for p in paths.values()):
+            return False
+    return True
+
+
+def build_derivatives(images_dir: str, out_dir: str, widths: Tuple[int, ...] = DEFAULT_WIDTHS, workers: Optional[int] = None, manifest_path: Optional[str] = None, cards_path: Optional[str] = None) -> Dict[str, Any]:
+    """Generate thumbnails and WebP variants for every card image and write the manifest.
+
+    Manifest cards are keyed by card id when cards_path names the card that
+    goes with an image. Work is keyed by the SHA-256 of each source file, so
+    only new or changed images are rendered and shared images are rendered once.
+    """
+    manifest_path = manifest_path or os.path.join(out_dir, "manifest.json")
+    previous: Dict[str, Any] = {"sources": {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    cards: Dict[str, Dict[str, Any]] = {}
+    sources: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[str, str] = {}
+    for key, path in card_sources(images_dir, load_cards(cards_path)).items():
+        if not os.path.exists(path):
+            continue
+        digest = file_sha256(path)
+        cards[key] = {"hash": digest}
+        if digest in sources or digest in pending:
+            continue
+        entry = previous["sources"].get(digest)
+        if is_complete(entry, widths):
+            sources[digest] = entry
+        else:
+            pending[digest] = path
+
+    os.makedirs(out_dir, exist_ok=True)
+    if pending:
+        digests = list(pending)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(
+                render_variants,
+                [pending[d] for d in digests],
+                digests,
+                [out_dir] * len(digests),
+                [tuple(widths)] * len(digests),
+                chunksize=8,
+            )
+            for digest, result in zip(digests, results):
+                sources[digest] = dict(result, source=pending[digest])
+
+    for key, card in cards.items():
+        entry = sources[card["hash"]]
+        card.update({"width": entry["width"], "height": entry["height"], "variants": entry["variants"]})
+
+    manifest = {"widths": list(widths), "cards": cards, "sources": sources}
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    manifest["rendered"] = len(pending)
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate card image thumbnails and WebP variants")
+    parser.add_argument("--images-dir", default="assets/images/cards")
+    parser.add_argument("--out-dir", default="assets/images/derived")
+    parser.add_argument("--cards", default="card_db/cards.json", help="Cards JSON used to key images by card id (file names when missing)")
+    parser.add_argument("--widths", default=",".join(str(w) for w in DEFAULT_WIDTHS), help="Comma-separated target widths in pixels")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    widths: List[int] = sorted({int(w) for w in args.widths.split(",") if w.strip()})
+    manifest = build_derivatives(args.images_dir, args.out_dir, tuple(widths), args.workers, cards_path=args.cards)
+    print(f"Rendered {manifest['rendered']} new images; {len(manifest['cards'])} cards in {args.out_dir}/manifest.json", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
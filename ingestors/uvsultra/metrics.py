@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""Per-stage counters, latency histograms and optional cProfile capture for ingest runs.
+
+The scraper records into the module-level METRICS registry:
+
+    with METRICS.time("parse"):
+        card = parse_card(html, config)
+    METRICS.inc("retries_total", stage="fetch")
+
+Stages in use are listing, fetch and image_fetch (one observation per HTTP attempt),
+parse, image (a whole image download) and serialize. Sleep time is counted
+per stage in sleep_seconds_total. At the end of a run the registry is
+written as JSON or Prometheus text; with profiling enabled each stage also
+gets its own cProfile dump.
+"""
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds in seconds, Prometheus style; the last bucket is +Inf
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_PREFIX = "uvs_ingest_"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with count, sum, min and max."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, seconds: float) -> None:
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out = []
+        running = 0
+        for bound, count in zip([str(b) for b in BUCKETS] + ["+Inf"], self.counts):
+            running += count
+            out.append((bound, running))
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, running in self.cumulative():
+            if running >= rank:
+                return self.max if bound == "+Inf" else min(float(bound), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.total, 6),
+            "mean_seconds": round(self.total / self.count, 6) if self.count else None,
+            "min_seconds": round(self.min, 6) if self.min is not None else None,
+            "max_seconds": round(self.max, 6) if self.max is not None else None,
+            "p50_seconds": self.quantile(0.5),
+            "p95_seconds": self.quantile(0.95),
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class Metrics:
+    """Thread-safe registry of stage histograms and labelled counters."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.stages: Dict[str, Histogram] = {}
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.profiling = False
+        self.profiles: Dict[str, List[cProfile.Profile]] = {}
+        self.local = threading.local()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.started = time.monotonic()
+            self.stages = {}
+            self.counters = {}
+            self.profiles = {}
+
+    def enable_profiling(self) -> None:
+        self.profiling = True
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self.lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Sum of a counter over every series matching the given labels."""
+        wanted = {(k, str(v)) for k, v in labels.items()}
+        with self.lock:
+            return sum(v for key, v in self.counters.get(name, {}).items() if wanted <= set(key))
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Observe the duration of the block under stage; profile it when profiling is on.
+
+        Only the outermost timed block in a thread is profiled, so a stage that
+        calls another (an image download issuing HTTP requests) is profiled as a whole.
+        """
+        profile = None
+        if self.profiling and not getattr(self.local, "profiling", False):
+            profile = self._thread_profile(stage)
+            try:
+                profile.enable()
+                self.local.profiling = True
+            except ValueError:
+                # Another profiler owns this interpreter (Python 3.12+ sys.monitoring)
+                profile = None
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profile is not None:
+                profile.disable()
+                self.local.profiling = False
+            self.observe(stage, elapsed)
+
+    def _thread_profile(self, stage: str) -> cProfile.Profile:
+        # A Profile must not be enabled in two threads at once, so each thread gets its own per stage
+        profiles = getattr(self.local, "profiles", None)
+        if profiles is None:
+            profiles = self.local.profiles = {}
+        profile = profiles.get(stage)
+        if profile is None:
+            profile = profiles[stage] = cProfile.Profile()
+            with self.lock:
+                self.profiles.setdefault(stage, []).append(profile)
+        return profile
+
+    def progress(self, done: int, total: Optional[int], since: Optional[float] = None, resumed: int = 0) -> str:
+        """'Parsed N/M cards' progress line with throughput and, when the total is known, ETA.
+
+        Cards counted in resumed came from a checkpoint and do not count towards the rate.
+        """
+        elapsed = time.monotonic() - (since if since is not None else self.started)
+        rate = (done - resumed) / elapsed if elapsed > 0 else 0.0
+        line = f"Parsed {done}/{total} cards ({rate:.1f} cards/s" if total is not None else f"Parsed {done} cards ({rate:.1f} cards/s"
+        if rate > 0 and total is not None and total > done:
+            eta = int((total - done) / rate)
+            line += f", ETA {eta // 3600}h{eta % 3600 // 60:02d}m{eta % 60:02d}s" if eta >= 3600 else f", ETA {eta // 60}m{eta % 60:02d}s"
+        return line + ")"
+
+    def snapshot(self, cards: Optional[int] = None) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        with self.lock:
+            report: Dict[str, Any] = {
+                "elapsed_seconds": round(elapsed, 3),
+                "stages": {stage: h.to_dict() for stage, h in sorted(self.stages.items())},
+                "counters": {
+                    name: [dict(key, value=round(value, 6)) for key, value in sorted(series.items())]
+                    for name, series in sorted(self.counters.items())
+                },
+            }
+        if cards is not None:
+            report["cards"] = cards
+            report["cards_per_second"] = round(cards / elapsed, 3) if elapsed > 0 else None
+        return report
+
+    def to_prometheus(self, cards: Optional[int] = None) -> str:
+        snapshot = self.snapshot(cards)
+        lines = []
+        name = f"{METRIC_PREFIX}stage_seconds"
+        lines.append(f"# HELP {name} Time spent per ingest stage")
+        lines.append(f"# TYPE {name} histogram")
+        for stage, hist in snapshot["stages"].items():
+            for bound, count in hist["buckets"].items():
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {hist["sum_seconds"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {hist["count"]}')
+        for counter, series in snapshot["counters"].items():
+            full = f"{METRIC_PREFIX}{counter}"
+            lines.append(f"# TYPE {full} counter")
+            for entry in series:
+                labels = ",".join(f'{k}="{v}"' for k, v in entry.items() if k != "value")
+                lines.append(f"{full}{{{labels}}} {entry['value']}" if labels else f"{full} {entry['value']}")
+        lines.append(f"# TYPE {METRIC_PREFIX}elapsed_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}elapsed_seconds {snapshot['elapsed_seconds']}")
+        if cards is not None:
+            # The scraper counts cards itself; only write the total when it did not
+            if "cards_total" not in snapshot["counters"]:
+                lines.append(f"# TYPE {METRIC_PREFIX}cards_total counter")
+                lines.append(f"{METRIC_PREFIX}cards_total {cards}")
+            lines.append(f"# TYPE {METRIC_PREFIX}cards_per_second gauge")
+            lines.append(f"{METRIC_PREFIX}cards_per_second {snapshot['cards_per_second']}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: str, fmt: Optional[str] = None, cards: Optional[int] = None) -> None:
+        """Write the report as JSON or Prometheus text (chosen by fmt, else by a .prom/.txt extension)."""
+        if fmt is None:
+            fmt = "prometheus" if path.endswith((".prom", ".txt")) else "json"
+        text = self.to_prometheus(cards) if fmt == "prometheus" else json.dumps(self.snapshot(cards), indent=2) + "\n"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def dump_profiles(self, out_dir: str) -> List[str]:
+        """Write one <stage>.prof per profiled stage, merged across threads."""
+        os.makedirs(out_dir, exist_ok=True)
+        written = []
+        with self.lock:
+            profiles = {stage: list(items) for stage, items in self.profiles.items()}
+        for stage, items in sorted(profiles.items()):
+            stats = None
+            for profile in items:
+                try:
+                    stats = pstats.Stats(profile) if stats is None else stats.add(profile)
+                except TypeError:
+                    # The profile never ran (enable() was refused)
+                    continue
+            if stats is None:
+                continue
+            path = os.path.join(out_dir, f"{stage}.prof")
+            stats.dump_stats(path)
+            written.append(path)
+        return written
+
+
+METRICS = Metrics()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+DATA_NAME = "pages.bin"
+INDEX_NAME = "index.jsonl"
+ORDER_NAME = "order.json"
+
+
+class PageArchive:
+    """Append-only, compressed archive of raw card pages for offline re-parsing.
+
+    pages.bin holds one gzip member per stored page and index.jsonl one line
+    per record with its URL, byte offset, length and SHA-256. The newest record
+    for a URL wins; a page whose content matches its newest record is not
+    stored again, so re-crawls only grow the archive by what changed.
+    Pages are written by concurrent workers in completion order, so the crawl
+    saves the listing order in order.json and entries() follows it. Pages of
+    cards that have left the listing stay in the archive but are not entries
+    unless asked for.
+    """
+
+    def __init__(self, path: str, writable: bool = True) -> None:
+        self.path = path
+        self.data_path = os.path.join(path, DATA_NAME)
+        self.index_path = os.path.join(path, INDEX_NAME)
+        self.order_path = os.path.join(path, ORDER_NAME)
+        self.lock = threading.Lock()
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.data = None
+        self.index = None
+        if writable:
+            os.makedirs(path, exist_ok=True)
+        elif not os.path.exists(self.index_path):
+            raise FileNotFoundError(f"No page archive index at {self.index_path}")
+        if os.path.exists(self.index_path):
+            self._load(writable)
+        if writable:
+            self.data = open(self.data_path, "ab")
+            self.index = open(self.index_path, "a", encoding="utf-8")
+
+    def _load(self, writable: bool) -> None:
+        with open(self.index_path, "rb") as f:
+            offset = 0
+            for line in f:
+                # A crash mid-write leaves at most one partial last line
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.records[record["url"]] = record
+        if writable and offset < os.path.getsize(self.index_path):
+            # Drop the partial line so the next record starts on a line boundary
+            with open(self.index_path, "r+b") as f:
+                f.truncate(offset)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.records
+
+    def put(self, url: str, html: str) -> bool:
+        """Store a page unless it is unchanged since its last record; returns whether it was written."""
+        body = html.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        with self.lock:
+            previous = self.records.get(url)
+            if previous is not None and previous["sha256"] == digest:
+                return False
+            payload = gzip.compress(body, compresslevel=6, mtime=0)
+            self.data.seek(0, os.SEEK_END)
+            offset = self.data.tell()
+            self.data.write(payload)
+            self.data.flush()
+            record = {"url": url, "offset": offset, "length": len(payload), "sha256": digest, "fetched_at": int(time.time())}
+            self.index.write(json.dumps(record) + "\n")
+            self.index.flush()
+            self.records[url] = record
+            return True
+
+    def get(self, url: str) -> Optional[str]:
+        record = self.records.get(url)
+        if record is None:
+            return None
+        if self.data is not None:
+            with self.lock:
+                self.data.flush()
+        return read_record(self.data_path, record["offset"], record["length"])
+
+    def save_order(self, urls: List[str]) -> None:
+        """Record the listing order of the latest crawl."""
+        tmp_path = self.order_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(urls, f)
+        os.replace(tmp_path, self.order_path)
+
+    def entries(self, include_unlisted: bool = False) -> List[Dict[str, Any]]:
+        """Newest record per URL in the saved listing order, or in archive order if none was saved.
+
+        include_unlisted appends the URLs missing from the listing, in archive order.
+        """
+        if not os.path.exists(self.order_path):
+            return list(self.records.values())
+        with open(self.order_path, "r", encoding="utf-8") as f:
+            order = json.load(f)
+        ordered = [self.records[url] for url in dict.fromkeys(order) if url in self.records]
+        if not include_unlisted:
+            return ordered
+        listed = set(order)
+        return ordered + [record for url, record in self.records.items() if url not in listed]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.entries())
+
+    def close(self) -> None:
+        for fh in (self.data, self.index):
+            if fh is not None:
+                fh.close()
+        self.data = self.index = None
+
+
+def read_record(data_path: str, offset: int, length: int) -> str:
+    with open(data_path, "rb") as f:
+        f.seek(offset)
+        return gzip.decompress(f.read(length)).decode("utf-8")
+
+
+def iter_records(data_path: str, records: List[Dict[str, Any]]) -> Iterator[str]:
+    """Decompressed pages for index records, read through one file handle."""
+    with open(data_path, "rb") as f:
+        for record in records:
+            f.seek(record["offset"])
+            yield gzip.decompress(f.read(record["length"])).decode("utf-8")
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""AIMD request rate and concurrency control driven by server feedback.
+
+AdaptiveController is a drop-in for the scraper's TokenBucket: acquire()
+before a request, then release() with the response status and latency.
+Healthy responses raise the rate additively (by `increase` requests/s per
+second of traffic) and widen the in-flight window by one per window of
+successes, up to the configured ceilings. A 429, a 5xx, a connection error
+or latency well above the observed baseline cuts both multiplicatively, at
+most once per cooldown so one burst of errors counts as one congestion
+signal. A Retry-After header pauses every caller until it has passed. Other
+4xx responses say nothing about server load and change neither.
+
+The latency baseline is kept per request kind (listing pages, card pages,
+images), as a low percentile of that kind's recent responses rather than an
+all-time minimum, so one unusually fast response cannot make normal latency
+look like congestion for the rest of the run.
+
+Every change is recorded in `decisions` (and appended to a JSONL log when
+log_path is set) so the ceiling can be tuned from real runs.
+"""
+import email.utils
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Recent latencies per request kind that the baseline is taken from
+BASELINE_WINDOW = 100
+# No latency judgement until a kind has this many samples
+BASELINE_MIN_SAMPLES = 10
+BASELINE_PERCENTILE = 0.1
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header given as delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class AdaptiveController:
+    """Thread-safe AIMD limiter over request rate and in-flight requests."""
+
+    def __init__(self, rate: float, max_rate: float, max_concurrency: int = 1, min_rate: Optional[float] = None, concurrency: int = 1, increase: float = 1.0, decrease: float = 0.5, latency_factor: float = 3.0, cooldown: float = 1.0, log_path: Optional[str] = None) -> None:
+        if max_rate <= 0:
+            raise ValueError("max_rate must be positive")
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate if min_rate is not None else rate / 10, max_rate)
+        self.rate = max(self.min_rate, min(rate, max_rate))
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = max(1, min(concurrency, self.max_concurrency))
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.last_decrease = float("-inf")
+        self.window_successes = 0
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.ewma: Dict[str, float] = {}
+        self.logged_rate = self.rate
+        self.started = time.monotonic()
+        self.cond = threading.Condition()
+        self.decisions: List[Dict[str, Any]] = []
+        self.log = open(log_path, "a", encoding="utf-8") if log_path else None
+        self._decide("start", "initial")
+
+    def acquire(self) -> None:
+        """Block until a rate token and an in-flight slot are free and no pause is in effect."""
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(1.0, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.blocked_until:
+                    wait: Optional[float] = self.blocked_until - now
+                elif self.in_flight >= self.concurrency:
+                    wait = None  # woken by release()
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+                self.cond.wait(wait)
+
+    def release(self, status: Optional[int], latency: float, retry_after: Optional[float] = None, cached: bool = False, kind: str = "default") -> None:
+        """Report the outcome of an acquired request; status None means it failed without a response.
+
+        kind groups requests whose latencies are comparable, e.g. the scraper's stage name.
+        """
+        with self.cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if status is None or status == 429 or status >= 500:
+                if retry_after:
+                    until = now + retry_after
+                    if until > self.blocked_until:
+                        self.blocked_until = until
+                        self._decide("pause", f"Retry-After {retry_after:g}s on HTTP {status}")
+                self._back_off(now, "connection error" if status is None else f"HTTP {status}")
+            elif status < 400 and not cached:
+                ewma, baseline = self._observe_latency(kind, latency)
+                if baseline is not None and ewma > baseline * self.latency_factor:
+                    self._back_off(now, f"{kind} latency {ewma * 1000:.0f}ms vs baseline {baseline * 1000:.0f}ms")
+                else:
+                    self._grow()
+            self.cond.notify_all()
+
+    def baseline(self, kind: str = "default") -> Optional[float]:
+        """Low percentile of the kind's recent latencies; None until there are enough samples."""
+        window = self.latencies.get(kind)
+        if window is None or len(window) < BASELINE_MIN_SAMPLES:
+            return None
+        return sorted(window)[int(len(window) * BASELINE_PERCENTILE)]
+
+    def _observe_latency(self, kind: str, latency: float) -> Tuple[float, Optional[float]]:
+        window = self.latencies.setdefault(kind, deque(maxlen=BASELINE_WINDOW))
+        window.append(latency)
+        previous = self.ewma.get(kind)
+        ewma = self.ewma[kind] = latency if previous is None else 0.8 * previous + 0.2 * latency
+        return ewma, self.baseline(kind)
+
+    def _back_off(self, now: float, reason: str) -> None:
+        if now - self.last_decrease < self.cooldown:
+            return
+        self.last_decrease = now
+        self.window_successes = 0
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.concurrency = max(1, int(self.concurrency * self.decrease))
+        # Start measuring congestion afresh once the window has shrunk
+        self.ewma.clear()
+        self._decide("decrease", reason)
+
+    def _grow(self) -> None:
+        # Per response, so the rate climbs by `increase` per second of traffic at the current rate
+        self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+        self.window_successes += 1
+        grew = False
+        if self.window_successes >= self.concurrency and self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+            self.window_successes = 0
+            grew = True
+        # Log growth in steps of 10% to keep the decision log readable
+        if grew or self.rate >= self.logged_rate * 1.1 or (self.rate == self.max_rate and self.logged_rate < self.max_rate):
+            self._decide("increase", "healthy responses")
+
+    def _decide(self, action: str, reason: str) -> None:
+        decision = {
+            "t": round(time.monotonic() - self.started, 3),
+            "action": action,
+            "reason": reason,
+            "rate": round(self.rate, 3),
+            "concurrency": self.concurrency,
+        }
+        self.logged_rate = self.rate
+        self.decisions.append(decision)
+        if self.log is not None:
+            self.log.write(json.dumps(decision) + "\n")
+            self.log.flush()
+
+    def summary(self) -> Dict[str, Any]:
+        with self.cond:
+            counts: Dict[str, int] = {}
+            for decision in self.decisions:
+                counts[decision["action"]] = counts.get(decision["action"], 0) + 1
+            return {
+                "rate": round(self.rate, 3),
+                "concurrency": self.concurrency,
+                "max_rate": self.max_rate,
+                "max_concurrency": self.max_concurrency,
+                "peak_rate": round(max([self.rate] + [d["rate"] for d in self.decisions]), 3),
+                "decisions": counts,
+            }
+
+    def close(self) -> None:
+        if self.log is not None:
+            self.log.close()
+            self.log = None
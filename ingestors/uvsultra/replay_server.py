@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Local stand-in for uvsultra.online that serves recorded pages, for offline benchmarks and tests.
+
+The catalog is `card_count` cards, `page_size` per listing page. The first
+listing page is served for GET listing_cards.php and later pages for
+POST page=N&js=1, as the live site does. `card.php?id=N` serves a recorded
+`card_<N>.html` from the fixtures directory when present, otherwise one of the
+recorded card pages with its title and number rewritten so every id is a
+distinct card. Anything under /images/ is a stand-in image of fixed
+pseudo-random bytes per path (query strings ignored) that honours
+`Range: bytes=N-`. Responses carry an ETag and answer a matching
+If-None-Match with 304. Latency and 429/5xx responses can be injected.
+
+    python3 ingestors/uvsultra/replay_server.py --cards 2000 --latency 0.05 --throttle-rate 0.02
+"""
+import argparse
+import glob
+import hashlib
+import html
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "uvsultra")
+
+TITLE_RE = re.compile(r"(<div class=\"card_title\">\s*<h1>)(.*?)(</h1>)", re.S)
+NUMBER_RE = re.compile(r"<span>#\s*\w+</span>")
+TAG_RE = re.compile(r"<[^>]+>")
+RANGE_RE = re.compile(r"bytes=(\d+)-")
+IMAGE_BYTES = 24 * 1024
+
+LISTING_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Card listing - UVS Ultra</title></head>
+<body>
+  <div class="container">
+    <div id="cards" class="row">
+{items}
+    </div>
+  </div>
+</body>
+</html>
+"""
+LISTING_ITEM = """      <div class="col-md-2 card_image" onclick="window.location='card.php?id={card_id}'">
+        <img class="mini_image" src="/images/cards/{card_id:04d}-mini.jpg" alt="{name}">
+      </div>"""
+
+
+class ReplayCatalog:
+    """Listing and card pages for a synthetic catalog built from recorded fixtures."""
+
+    def __init__(self, fixtures_dir: str = DEFAULT_FIXTURES, card_count: int = 2000, page_size: int = 50, clamp_pages: bool = False) -> None:
+        self.fixtures_dir = fixtures_dir
+        # Like some paginated sites, answer pages past the end with the last page
+        self.clamp_pages = clamp_pages
+        self.card_count = card_count
+        self.page_size = page_size
+        self.templates: List[str] = []
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, "card_*.html"))):
+            with open(path, "r", encoding="utf-8") as f:
+                page = f.read()
+            # Only pages with a title can be turned into distinct cards
+            if TITLE_RE.search(page):
+                self.templates.append(page)
+        if not self.templates:
+            raise ValueError(f"No card page fixtures in {fixtures_dir}")
+
+    @property
+    def page_count(self) -> int:
+        return (self.card_count + self.page_size - 1) // self.page_size
+
+    def _recorded(self, name: str) -> Optional[str]:
+        path = os.path.join(self.fixtures_dir, name)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        return None
+
+    def card_name(self, card_id: int) -> str:
+        template = self.templates[card_id % len(self.templates)]
+        title = " ".join(html.unescape(TAG_RE.sub("", TITLE_RE.search(template).group(2))).split())
+        return f"{title} {card_id}"
+
+    def listing_items(self, page: int) -> str:
+        start = (page - 1) * self.page_size + 1
+        end = min(self.card_count, page * self.page_size)
+        return "\n".join(
+            LISTING_ITEM.format(card_id=card_id, name=html.escape(self.card_name(card_id)))
+            for card_id in range(start, end + 1)
+        )
+
+    def listing_page(self, page: int) -> str:
+        recorded = self._recorded(f"listing_{page}.html")
+        if recorded is not None:
+            return recorded
+        if page < 1:
+            return ""
+        if self.clamp_pages:
+            page = min(page, max(1, self.page_count))
+        items = self.listing_items(page)
+        # The site answers js=1 requests with just the card fragment
+        return LISTING_PAGE.format(items=items) if page == 1 else items
+
+    def card_page(self, card_id: int) -> Optional[str]:
+        recorded = self._recorded(f"card_{card_id}.html")
+        if recorded is not None:
+            return recorded
+        if not 1 <= card_id <= self.card_count:
+            return None
+        template = self.templates[card_id % len(self.templates)]
+        page = TITLE_RE.sub(lambda m: m.group(1) + html.escape(self.card_name(card_id)) + m.group(3), template, count=1)
+        return NUMBER_RE.sub(f"<span>#{card_id:04d}</span>", page, count=1)
+
+    def image(self, path: str) -> bytes:
+        """Stand-in image bytes for a path: a JPEG start marker and seeded noise."""
+        return b"\xff\xd8\xff\xe0" + random.Random(path).randbytes(IMAGE_BYTES - 4)
+
+
+class FaultInjector:
+    """Seeded latency and error injection shared by all handler threads."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, throttle_rate: float = 0.0, error_rate: float = 0.0, retry_after: int = 0, seed: int = 0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "partial": 0, "not_modified": 0, "throttled": 0, "errors": 0, "not_found": 0}
+
+    def decide(self) -> Tuple[float, Optional[int]]:
+        """Delay for this request and the injected status code, if any."""
+        with self.lock:
+            self.stats["requests"] += 1
+            delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self.rng.random()
+        if roll < self.throttle_rate:
+            return delay, 429
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 503
+        return delay, None
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.stats[key] += 1
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    server_version = "UVSReplay/1.0"
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this keep-alive clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: object) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        self._handle(None)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        self._handle({k: v[-1] for k, v in parse_qs(body).items()})
+
+    def _handle(self, form: Optional[Dict[str, str]]) -> None:
+        self.server.record(self.command, self.path, self.headers)
+        faults: FaultInjector = self.server.faults
+        delay, status = faults.decide()
+        if delay:
+            time.sleep(delay)
+        if status is not None:
+            faults.count("throttled" if status == 429 else "errors")
+            headers = {"Retry-After": str(faults.retry_after)} if status == 429 else {}
+            self._send(status, "Too Many Requests" if status == 429 else "Service Unavailable", headers)
+            return
+
+        catalog: ReplayCatalog = self.server.catalog
+        parts = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        page: Optional[Union[str, bytes]] = None
+        if parts.path.endswith("/listing_cards.php"):
+            page = catalog.listing_page(int(form.get("page", "1")) if form else 1)
+        elif parts.path.endswith("/card.php") and query.get("id", "").isdigit():
+            page = catalog.card_page(int(query["id"]))
+        elif parts.path.startswith("/images/"):
+            page = catalog.image(parts.path)
+        if page is None:
+            faults.count("not_found")
+            self._send(404, "Not Found")
+            return
+        data = page.encode("utf-8") if isinstance(page, str) else page
+        content_type = "text/html; charset=utf-8" if isinstance(page, str) else "image/jpeg"
+        etag = '"' + hashlib.sha1(data).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            faults.count("not_modified")
+            self._send(304, b"", {"ETag": etag}, content_type)
+            return
+        ranged = RANGE_RE.fullmatch(self.headers.get("Range") or "")
+        if ranged and int(ranged.group(1)) < len(data):
+            start = int(ranged.group(1))
+            faults.count("partial")
+            self._send(206, data[start:], {"ETag": etag, "Content-Range": f"bytes {start}-{len(data) - 1}/{len(data)}"}, content_type)
+            return
+        faults.count("ok")
+        self._send(200, data, {"ETag": etag}, content_type)
+
+    def _send(self, status: int, body: Union[str, bytes], headers: Optional[Dict[str, str]] = None, content_type: str = "text/html; charset=utf-8") -> None:
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, catalog: ReplayCatalog, faults: Optional[FaultInjector] = None, host: str = "127.0.0.1", port: int = 0, verbose: bool = False) -> None:
+        super().__init__((host, port), ReplayHandler)
+        self.catalog = catalog
+        self.faults = faults or FaultInjector()
+        self.verbose = verbose
+        self.thread: Optional[threading.Thread] = None
+        # (monotonic time, method, path, headers) of every request, for tests
+        self.requests: List[Tuple[float, str, str, Dict[str, str]]] = []
+        self.requests_lock = threading.Lock()
+
+    def record(self, method: str, path: str, headers: Mapping[str, str]) -> None:
+        with self.requests_lock:
+            self.requests.append((time.monotonic(), method, path, dict(headers)))
+
+    def paths(self, prefix: str = "/") -> List[str]:
+        """Paths requested so far that start with prefix, in arrival order."""
+        with self.requests_lock:
+            return [path for _, _, path, _ in self.requests if path.startswith(prefix)]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def config(self, **overrides: object) -> Dict[str, object]:
+        """Scraper config pointing at this server."""
+        config = {
+            "base_url": self.base_url,
+            "list_url": f"{self.base_url}/listing_cards.php",
+            "card_link_selector": "div.card_image",
+            "rate_limit_seconds": 0,
+        }
+        config.update(overrides)
+        return config
+
+    def start(self) -> "ReplayServer":
+        self.thread = threading.Thread(target=self.serve_forever, name="uvs-replay", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve recorded UVS Ultra pages locally")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--cards", type=int, default=2000, help="Catalog size")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--clamp-pages", action="store_true", help="Answer listing pages past the end with the last page instead of an empty one")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency up to this many seconds")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    catalog = ReplayCatalog(args.fixtures, args.cards, args.page_size, args.clamp_pages)
+    faults = FaultInjector(args.latency, args.jitter, args.throttle_rate, args.error_rate, args.retry_after, args.seed)
+    server = ReplayServer(catalog, faults, args.host, args.port, args.verbose)
+    print(f"Serving {catalog.card_count} cards on {catalog.page_count} pages at {server.base_url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Stats: {faults.stats}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
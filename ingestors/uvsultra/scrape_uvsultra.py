@@ -1,17 +1,29 @@
 #!/usr/bin/env python3
 import argparse
+import hashlib
 import json
 import os
 import re
 import sys
+import threading
 import time
 import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import requests
 import yaml
 from bs4 import BeautifulSoup
+from lxml import etree
+
+from card_history import CardHistory
+from card_schema import DEFAULT_SCHEMA, validate_cards
+from http_cache import CachingSession, ResponseCache
+from metrics import METRICS
+from page_archive import PageArchive, iter_records
+from rate_control import AdaptiveController, parse_retry_after
 
 
 @dataclass
@@ -29,6 +41,13 @@ class Card:
     set_name: Optional[str]
     number: Optional[str]
     image_url: Optional[str]
+    difficulty: Optional[int] = None
+    control: Optional[int] = None
+    speed: Optional[int] = None
+    damage: Optional[int] = None
+    zone: Optional[str] = None
+    block: Optional[int] = None
+    block_zone: Optional[str] = None
 
     def to_normalized(self) -> Dict[str, Any]:
         return {
@@ -47,6 +66,12 @@ class Card:
                 "number": self.number,
             },
             "image": {"url": self.image_url},
+            "difficulty": self.difficulty,
+            "control": self.control,
+            "speed": self.speed,
+            "damage": self.damage,
+            "zone": self.zone,
+            "block": {"modifier": self.block, "zone": self.block_zone},
         }
 
 
@@ -55,28 +80,90 @@ def load_yaml(path: str) -> Dict[str, Any]:
         return yaml.safe_load(f)
 
 
-def request_with_backoff(method: str, url: str, session: requests.Session, delay: float, *, data: Optional[Dict[str, Any]] = None, max_attempts: int = 5) -> requests.Response:
+class TokenBucket:
+    """Thread-safe token bucket shared by all workers to cap the overall request rate."""
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_delay(cls, delay: float) -> Optional["TokenBucket"]:
+        if delay <= 0:
+            return None
+        return cls(rate=1.0 / delay)
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def request_with_backoff(method: str, url: str, session: requests.Session, delay: float, *, data: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, stream: bool = False, max_attempts: int = 5, limiter: Optional[Union[TokenBucket, AdaptiveController]] = None, stage: str = "fetch") -> requests.Response:
+    if isinstance(session, CachingSession):
+        # A fresh cache hit never reaches the site, so it takes no rate token
+        cached = session.fresh_response(method, url, data)
+        if cached is not None:
+            METRICS.inc("requests_total", stage=stage, status=cached.status_code)
+            return cached
+    adaptive = isinstance(limiter, AdaptiveController)
     attempt = 0
     while True:
+        retry_after = None
         try:
-            resp = session.request(method=method, url=url, data=data, timeout=30)
+            if limiter is not None:
+                waited = time.perf_counter()
+                limiter.acquire()
+                METRICS.inc("sleep_seconds_total", time.perf_counter() - waited, stage=stage)
+            started = time.perf_counter()
+            try:
+                with METRICS.time(stage):
+                    resp = session.request(method=method, url=url, data=data, headers=headers, stream=stream, timeout=30)
+            except Exception:
+                if adaptive:
+                    limiter.release(None, time.perf_counter() - started, kind=stage)
+                raise
             status = resp.status_code
+            METRICS.inc("requests_total", stage=stage, status=status)
+            if status == 429 or status >= 500:
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            if adaptive:
+                limiter.release(status, time.perf_counter() - started, retry_after, cached=getattr(resp, "from_cache", False), kind=stage)
             if status == 429 or status >= 500:
                 raise requests.HTTPError(f"HTTP {status}")
             resp.raise_for_status()
-            # base delay plus jitter to be polite
-            time.sleep(delay + random.uniform(0, min(0.2, delay)))
+            if limiter is None and not getattr(resp, "from_cache", False):
+                # base delay plus jitter to be polite
+                pause = delay + random.uniform(0, min(0.2, delay))
+                METRICS.inc("sleep_seconds_total", pause, stage=stage)
+                time.sleep(pause)
             return resp
         except Exception:
             attempt += 1
             if attempt >= max_attempts:
+                METRICS.inc("failures_total", stage=stage)
                 raise
+            METRICS.inc("retries_total", stage=stage)
+            # With the adaptive controller this comes on top of its rate cut and Retry-After pause
             backoff = (delay * (2 ** (attempt - 1))) + random.uniform(0, 0.25)
+            if retry_after is not None:
+                backoff = max(backoff, retry_after)
+            METRICS.inc("sleep_seconds_total", backoff, stage=stage)
             time.sleep(backoff)
 
 
-def fetch_html(url: str, session: requests.Session, rate_limit_seconds: float) -> BeautifulSoup:
-    resp = request_with_backoff("GET", url, session, rate_limit_seconds)
+def fetch_html(url: str, session: requests.Session, rate_limit_seconds: float, limiter: Optional[Union[TokenBucket, AdaptiveController]] = None) -> BeautifulSoup:
+    resp = request_with_backoff("GET", url, session, rate_limit_seconds, limiter=limiter)
     return BeautifulSoup(resp.text, "lxml")
 
 
@@ -169,50 +256,206 @@ def find_next_page(soup: BeautifulSoup, base_url: str, pagination_selector: Opti
     return None
 
 
-def scrape_list(config: Dict[str, Any], session: requests.Session) -> List[str]:
-    base_url = config["base_url"].rstrip("/")
+def listing_max_pages() -> Optional[int]:
+    mp = os.getenv("UVS_MAX_PAGES")
+    try:
+        return int(mp) if mp else None
+    except ValueError:
+        return None
+
+
+def fetch_listing_page(page: int, config: Dict[str, Any], session: requests.Session, limiter: Optional[Union[TokenBucket, AdaptiveController]] = None) -> List[str]:
+    """Card URLs on one listing page: page 1 via GET, later pages via POST page=N&js=1."""
     url = config["list_url"]
-    link_sel = config["card_link_selector"]
     delay = float(config.get("rate_limit_seconds", 0.6))
+    if page == 1:
+        resp = request_with_backoff("GET", url, session, delay, limiter=limiter, stage="listing")
+    else:
+        resp = request_with_backoff("POST", url, session, delay, data={"page": str(page), "js": "1"}, limiter=limiter, stage="listing")
+    soup = BeautifulSoup(resp.text, "lxml")
+    return discover_card_links_from_listing(soup, config["base_url"].rstrip("/"), config["card_link_selector"])
 
-    seen = set()
-    card_urls: List[str] = []
 
-    # First page via GET
-    soup = fetch_html(url, session, delay)
-    new_urls = discover_card_links_from_listing(soup, base_url, link_sel)
-    for href in new_urls:
-        if href not in seen:
-            seen.add(href)
-            card_urls.append(href)
-
-    # Subsequent pages via POST with page=2..N and js=1 until empty
-    page = 2
-    max_pages = None
-    try:
-        from os import getenv
-        mp = getenv("UVS_MAX_PAGES")
-        max_pages = int(mp) if mp else None
-    except Exception:
-        max_pages = None
-    while True:
-        if max_pages is not None and page > max_pages:
-            break
-        resp = request_with_backoff("POST", url, session, delay, data={"page": str(page), "js": "1"})
-        page_soup = BeautifulSoup(resp.text, "lxml")
-        page_urls = discover_card_links_from_listing(page_soup, base_url, link_sel)
-        if not page_urls:
-            break
-        added = 0
-        for href in page_urls:
-            if href not in seen:
-                seen.add(href)
-                card_urls.append(href)
-                added += 1
-        if added == 0:
-            break
-        page += 1
-    return card_urls
+# Listing pages probed while looking for the last page, so a server that never returns an empty page cannot keep it going
+MAX_LISTING_PROBES = 32
+
+
+class ListingCrawler:
+    """Stream card URLs from the paginated listing, in listing order.
+
+    Page 1 is fetched with GET and its links are yielded straight away. With
+    workers > 1 the last page is then located by probing pages 2, 4, 8, ...
+    until one comes back empty (or repeats the previous probe, for servers
+    that clamp the page number) and bisecting between the last full and first
+    empty probe, and the remaining pages are fetched by a thread pool that
+    shares one limiter. If the last page still has links (the catalog grew
+    meanwhile), later pages are walked one by one until one adds nothing, which
+    is also how workers == 1 walks the whole listing. Pages past max_pages are
+    never fetched.
+    """
+
+    def __init__(self, config: Dict[str, Any], session: requests.Session, workers: int = 1, limiter: Optional[Union[TokenBucket, AdaptiveController]] = None, max_pages: Optional[int] = None) -> None:
+        self.config = config
+        self.session = session
+        self.workers = workers
+        if limiter is None and workers > 1:
+            limiter = TokenBucket.from_delay(float(config.get("rate_limit_seconds", 0.6)))
+        self.limiter = limiter
+        self.max_pages = max_pages
+        self.pages: Dict[int, List[str]] = {}
+        self.seen: set = set()
+        self.last_page: Optional[int] = None
+        self.probed_last_page: Optional[int] = None
+        self.finished = False
+        self.owner: Optional[int] = None
+        self.local = threading.local()
+
+    def _session(self) -> requests.Session:
+        # The iterating thread uses the caller's session, pool threads their own
+        if threading.get_ident() == self.owner:
+            return self.session
+        if not hasattr(self.local, "session"):
+            self.local.session = build_session(getattr(self.session, "cache", None))
+        return self.local.session
+
+    def fetch(self, page: int) -> List[str]:
+        urls = self.pages.get(page)
+        if urls is None:
+            urls = fetch_listing_page(page, self.config, self._session(), self.limiter)
+            self.pages[page] = urls
+        return urls
+
+    def _past_end(self, page: int, clamped: Optional[frozenset]) -> bool:
+        """Whether a probed page is beyond the listing: no links, only page 1's links, or the clamped last page."""
+        urls = frozenset(self.fetch(page))
+        return not urls or (page > 1 and urls <= frozenset(self.pages[1])) or urls == clamped
+
+    def find_last_page(self) -> int:
+        """Highest page with links, by exponential probing and then bisection.
+
+        Some servers answer every page past the end with the last page again.
+        When two successive probes return the same links, those links mark the
+        end and bisection looks for the first page that returns them. Probing
+        stops after MAX_LISTING_PROBES pages either way; the walk after the
+        concurrent fetch picks up anything beyond.
+        """
+        before, full = 1, 1
+        full_urls = frozenset(self.fetch(1))
+        clamped: Optional[frozenset] = None
+        empty: Optional[int] = None
+        page = 2
+        for _ in range(MAX_LISTING_PROBES):
+            capped = self.max_pages is not None and page >= self.max_pages
+            if capped:
+                page = self.max_pages
+                if page <= full:
+                    return full
+            if self._past_end(page, None):
+                empty = page
+                break
+            urls = frozenset(self.pages[page])
+            if urls == full_urls:
+                # full is at or past the end; the real last page is in (before, full]
+                clamped = urls
+                break
+            before, full, full_urls = full, page, urls
+            if capped:
+                return full
+            page *= 2
+        if clamped is not None:
+            low, high = before, full
+            while high - low > 1:
+                mid = (low + high) // 2
+                if self._past_end(mid, clamped):
+                    high = mid
+                else:
+                    low = mid
+            return high
+        if empty is None:
+            return full
+        while empty - full > 1:
+            mid = (full + empty) // 2
+            if self._past_end(mid, None):
+                empty = mid
+            else:
+                full = mid
+        return full
+
+    def estimated_total(self) -> Optional[int]:
+        """Card URL count: exact once the listing is done, else extrapolated from page 1 and the probed last page."""
+        if self.finished:
+            return len(self.seen)
+        if self.probed_last_page is not None and self.pages.get(1):
+            return max(len(self.seen), self.probed_last_page * len(self.pages[1]))
+        return None
+
+    def _emit(self, urls: List[str]) -> Iterator[str]:
+        for url in urls:
+            if url not in self.seen:
+                self.seen.add(url)
+                yield url
+
+    def _walk(self, page: int) -> Iterator[str]:
+        while self.max_pages is None or page <= self.max_pages:
+            urls = self.fetch(page)
+            before = len(self.seen)
+            yield from self._emit(urls)
+            self.pages.pop(page, None)
+            if len(self.seen) == before:
+                break
+            self.last_page = page
+            page += 1
+
+    def __iter__(self) -> Iterator[str]:
+        self.owner = threading.get_ident()
+        yield from self._emit(self.fetch(1))
+        self.last_page = 1
+        if self.workers <= 1:
+            yield from self._walk(2)
+            self.finished = True
+            return
+
+        last = self.find_last_page()
+        self.last_page = self.probed_last_page = last
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {page: pool.submit(self.fetch, page) for page in range(2, last + 1) if page not in self.pages}
+            for page in range(2, last + 1):
+                urls = futures[page].result() if page in futures else self.pages[page]
+                yield from self._emit(urls)
+                # Keep only the URL set once a page has been yielded
+                self.pages.pop(page, None)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        # Look past the end again in case cards were added while the pages were fetched
+        self.pages.pop(last + 1, None)
+        yield from self._walk(last + 1)
+        self.finished = True
+
+
+def scrape_list(config: Dict[str, Any], session: requests.Session, workers: int = 1, limiter: Optional[Union[TokenBucket, AdaptiveController]] = None) -> List[str]:
+    return list(ListingCrawler(config, session, workers, limiter, listing_max_pages()))
+
+
+CARD_TYPES = ("Character", "Action", "Asset", "Attack", "Foundation")
+# Game stats in the cd2 division, e.g. "Difficulty 4 Control 4 Block +2 Mid Speed 5 High Damage 4";
+# a zone after Block is the block zone, after Speed or Damage the attack zone
+STAT_RE = re.compile(r"\b(Difficulty|Control|Speed|Damage|Block)\s*:?\s*([+-]?\d+)(?:\s+(High|Mid|Low)\b)?", re.I)
+CARD_RARITIES = ("Common", "Uncommon", "Rare", "Ultra Rare", "Promo", "Starter", "Secret Rare")
+
+
+def parse_stats(text: Optional[str]) -> Dict[str, Any]:
+    """Difficulty, control, speed, damage, zone, block and block_zone from the stats text; None where absent."""
+    stats: Dict[str, Any] = {"difficulty": None, "control": None, "speed": None, "damage": None, "zone": None, "block": None, "block_zone": None}
+    for label, value, zone in STAT_RE.findall(text or ""):
+        label = label.lower()
+        if stats[label] is None:
+            stats[label] = int(value)
+        if zone:
+            key = "block_zone" if label == "block" else "zone" if label in ("speed", "damage") else None
+            if key and stats[key] is None:
+                stats[key] = zone.lower()
+    return stats
 
 
 def parse_detail_fields(soup: BeautifulSoup) -> Dict[str, Optional[str]]:
@@ -232,9 +475,9 @@ def parse_detail_fields(soup: BeautifulSoup) -> Dict[str, Optional[str]]:
             number = m_num.group(1)
         tokens = [s.strip() for s in division.stripped_strings]
         for tok in tokens:
-            if tok in ("Character", "Action", "Asset", "Attack", "Foundation") and not type_:
+            if tok in CARD_TYPES and not type_:
                 type_ = tok
-            if tok in ("Common", "Uncommon", "Rare", "Ultra Rare", "Promo", "Starter", "Secret Rare") and not rarity:
+            if tok in CARD_RARITIES and not rarity:
                 rarity = tok
 
     if not (type_ and rarity):
@@ -247,6 +490,9 @@ def parse_detail_fields(soup: BeautifulSoup) -> Dict[str, Optional[str]]:
             if len(parts) >= 2 and not rarity:
                 rarity = parts[-1]
 
+    stats_node = soup.select_one("div.card_division.cd2")
+    stats = " ".join(stats_node.stripped_strings) if stats_node else None
+
     image_url = select_text(soup, "img.preview_image::attr(src)")
     text = None
     text_node = soup.select_one("div.card_text, div.card_rules, div.card-description")
@@ -261,14 +507,121 @@ def parse_detail_fields(soup: BeautifulSoup) -> Dict[str, Optional[str]]:
         "rarity": rarity,
         "image_url": image_url,
         "text": text,
+        "stats": stats,
     }
 
 
-def scrape_card(url: str, config: Dict[str, Any], session: requests.Session) -> Optional[Card]:
-    delay = float(config.get("rate_limit_seconds", 0.6))
-    soup = fetch_html(url, session, delay)
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Precompiled equivalents of the CSS selectors used by parse_detail_fields
+XPATH_NAME = etree.XPath(f"(//div[{_has_class('card_title')}]//h1)[1]")
+XPATH_DIVISION = etree.XPath(f"(//div[{_has_class('card_division')}][{_has_class('cd1')}])[1]")
+XPATH_FIRST_LINK = etree.XPath("(.//a)[1]")
+XPATH_STATS = etree.XPath(f"(//div[{_has_class('card_division')}][{_has_class('cd2')}])[1]")
+XPATH_INFO = etree.XPath(f"(//*[{_has_class('card-important-info')}])[1]")
+XPATH_IMAGE = etree.XPath(f"(//img[{_has_class('preview_image')}])[1]")
+XPATH_TEXT = etree.XPath(
+    f"(//div[{_has_class('card_text')}] | //div[{_has_class('card_rules')}] | //div[{_has_class('card-description')}])[1]"
+)
+SKIPPED_TEXT_TAGS = ("script", "style", "template")
+
+
+def _lxml_strings(node: Any) -> Iterator[str]:
+    """Yield stripped text nodes in document order, like BeautifulSoup.stripped_strings."""
+    if node.text and not callable(node.tag):
+        text = node.text.strip()
+        if text:
+            yield text
+    for child in node:
+        if isinstance(child.tag, str) and child.tag not in SKIPPED_TEXT_TAGS:
+            yield from _lxml_strings(child)
+        if child.tail:
+            tail = child.tail.strip()
+            if tail:
+                yield tail
+
+
+def _lxml_first(xpath: etree.XPath, node: Any) -> Any:
+    found = xpath(node)
+    return found[0] if found else None
+
+
+def parse_detail_fields_lxml(html: str) -> Dict[str, Optional[str]]:
+    """lxml/XPath implementation of parse_detail_fields working on raw HTML.
+
+    Skips building a BeautifulSoup tree; output is identical for the same page.
+    """
+    root = etree.fromstring(html, etree.HTMLParser()) if html.strip() else None
+    if root is None:
+        root = etree.Element("html")
 
-    fields = parse_detail_fields(soup)
+    name_node = _lxml_first(XPATH_NAME, root)
+    name = "".join(_lxml_strings(name_node)) if name_node is not None else None
+    set_name = None
+    number = None
+    division = _lxml_first(XPATH_DIVISION, root)
+    type_ = None
+    rarity = None
+    if division is not None:
+        a = _lxml_first(XPATH_FIRST_LINK, division)
+        if a is not None:
+            set_name = "".join(_lxml_strings(a))
+        tokens = list(_lxml_strings(division))
+        m_num = re.search(r"#\s*(\w+)", " ".join(tokens))
+        if m_num:
+            number = m_num.group(1)
+        for tok in tokens:
+            if tok in CARD_TYPES and not type_:
+                type_ = tok
+            if tok in CARD_RARITIES and not rarity:
+                rarity = tok
+
+    if not (type_ and rarity):
+        info = _lxml_first(XPATH_INFO, root)
+        if info is not None:
+            parts = " ".join(_lxml_strings(info)).split()
+            if len(parts) >= 1 and not type_:
+                type_ = parts[0]
+            if len(parts) >= 2 and not rarity:
+                rarity = parts[-1]
+
+    stats_node = _lxml_first(XPATH_STATS, root)
+    stats = " ".join(_lxml_strings(stats_node)) if stats_node is not None else None
+
+    image = _lxml_first(XPATH_IMAGE, root)
+    image_url = image.get("src") if image is not None else None
+    text = None
+    text_node = _lxml_first(XPATH_TEXT, root)
+    if text_node is not None:
+        text = "\n".join(_lxml_strings(text_node))
+
+    return {
+        "name": name,
+        "set_name": set_name,
+        "number": number,
+        "type": type_ or "Card",
+        "rarity": rarity,
+        "image_url": image_url,
+        "text": text,
+        "stats": stats,
+    }
+
+
+EXTRACTORS = ("soup", "lxml")
+
+
+def parse_detail_html(html: str, extractor: str = "soup") -> Dict[str, Optional[str]]:
+    if extractor == "lxml":
+        return parse_detail_fields_lxml(html)
+    if extractor != "soup":
+        raise ValueError(f"Unknown extractor: {extractor}")
+    return parse_detail_fields(BeautifulSoup(html, "lxml"))
+
+
+def parse_card(html: str, config: Dict[str, Any]) -> Optional[Card]:
+    fields = parse_detail_html(html, config.get("extractor", "soup"))
     name = fields["name"] or ""
     if not name:
         return None
@@ -283,6 +636,7 @@ def scrape_card(url: str, config: Dict[str, Any], session: requests.Session) ->
     cost = None
     attack = None
     health = None
+    stats = parse_stats(fields.get("stats"))
 
     keywords = extract_keywords(text)
 
@@ -305,28 +659,485 @@ def scrape_card(url: str, config: Dict[str, Any], session: requests.Session) ->
         set_name=set_name,
         number=number,
         image_url=image_url,
+        **stats,
     )
 
 
+def scrape_card(url: str, config: Dict[str, Any], session: requests.Session, limiter: Optional[Union[TokenBucket, AdaptiveController]] = None, archive: Optional[PageArchive] = None) -> Optional[Card]:
+    delay = float(config.get("rate_limit_seconds", 0.6))
+    resp = request_with_backoff("GET", url, session, delay, limiter=limiter)
+    if archive is not None:
+        archive.put(url, resp.text)
+    with METRICS.time("parse"):
+        return parse_card(resp.text, config)
+
+
+def build_session(cache: Optional[ResponseCache] = None) -> requests.Session:
+    session = CachingSession(cache) if cache is not None else requests.Session()
+    session.headers.update({
+        "User-Agent": "CardIngestor/1.0 (+practice; permission granted)",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    })
+    return session
+
+
+def build_adaptive_controller(config: Dict[str, Any], workers: int, log_path: Optional[str] = None) -> AdaptiveController:
+    """AIMD controller starting at rate_limit_seconds and capped by max_rate_per_second and workers.
+
+    Without max_rate_per_second the starting rate is also the ceiling, so the
+    controller only ever slows down below the configured politeness delay.
+    """
+    delay = float(config.get("rate_limit_seconds", 0.6))
+    rate = 1.0 / delay if delay > 0 else float(config.get("max_rate_per_second", 10.0))
+    max_rate = float(config.get("max_rate_per_second", rate))
+    min_rate = config.get("min_rate_per_second")
+    return AdaptiveController(rate, max_rate, max_concurrency=workers, min_rate=float(min_rate) if min_rate is not None else None, log_path=log_path)
+
+
+def scrape_cards(card_urls: Iterable[str], config: Dict[str, Any], session: requests.Session, workers: int = 1, limiter: Optional[Union[TokenBucket, AdaptiveController]] = None, archive: Optional[PageArchive] = None) -> Iterator[Tuple[str, Optional[Card]]]:
+    """Yield (url, card) pairs in the same order as card_urls, which may be a lazy stream.
+
+    With workers > 1 detail pages are fetched by a thread pool; every worker
+    draws from one limiter (by default a token bucket at rate_limit_seconds,
+    or the given TokenBucket or AdaptiveController) so the overall rate stays
+    bounded. Each thread gets its own session.
+    """
+    if workers <= 1:
+        for url in card_urls:
+            yield url, scrape_card(url, config, session, limiter, archive)
+        return
+
+    if limiter is None:
+        limiter = TokenBucket.from_delay(float(config.get("rate_limit_seconds", 0.6)))
+    local = threading.local()
+
+    def worker(url: str) -> Optional[Card]:
+        if not hasattr(local, "session"):
+            local.session = build_session(getattr(session, "cache", None))
+        return scrape_card(url, config, local.session, limiter, archive)
+
+    # Keep a bounded window of in-flight futures and yield them in submission order
+    window = workers * 4
+    pending: deque = deque()
+    urls = iter(card_urls)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for url in urls:
+            pending.append((url, pool.submit(worker, url)))
+            if len(pending) >= window:
+                break
+        while pending:
+            url, future = pending.popleft()
+            yield url, future.result()
+            next_url = next(urls, None)
+            if next_url is not None:
+                pending.append((next_url, pool.submit(worker, next_url)))
+
+
+def reparse_records(data_path: str, records: List[Dict[str, Any]], config: Dict[str, Any]) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+    """Parse a batch of archived pages; runs in a worker process."""
+    results = []
+    for record, html in zip(records, iter_records(data_path, records)):
+        card = parse_card(html, config)
+        results.append((record["url"], card.to_normalized() if card else None))
+    return results
+
+
+def reparse_archive(archive_dir: str, config: Dict[str, Any], workers: Optional[int] = None, batch_size: int = 250, include_unlisted: bool = False) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """Yield (url, normalized card) for the archived pages of the last listing, in its order, parsed by a process pool.
+
+    include_unlisted also re-parses archived pages that are no longer listed.
+    """
+    archive = PageArchive(archive_dir, writable=False)
+    records = archive.entries(include_unlisted)
+    batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+    if workers == 1 or len(batches) <= 1:
+        for batch in batches:
+            yield from reparse_records(archive.data_path, batch, config)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(reparse_records, [archive.data_path] * len(batches), batches, [config] * len(batches)):
+            yield from results
+
+
 def ensure_dir(path: str) -> None:
     if not path:
         return
     os.makedirs(path, exist_ok=True)
 
 
-def download_image(url: str, out_dir: str, session: requests.Session, rate_limit_seconds: float) -> Optional[str]:
-    try:
-        ensure_dir(out_dir)
-        filename = re.sub(r"[^a-zA-Z0-9._-]", "_", url.split("/")[-1]) or "card.jpg"
-        out_path = os.path.join(out_dir, filename)
-        if not os.path.exists(out_path):
-            resp = request_with_backoff("GET", url, session, rate_limit_seconds)
-            with open(out_path, "wb") as f:
-                f.write(resp.content)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+
+
+class ImagePipeline:
+    """Background image download stage with content-addressed storage.
+
+    Card images are queued with submit() and fetched by a bounded thread pool
+    with its own rate limiter, so downloads never hold up the card crawl.
+    Bytes are stored once under <out_dir>/sha256/<ab>/<digest><ext>, however
+    many URLs or cards point at them. Interrupted downloads are kept under
+    <out_dir>/.partial and resumed with an HTTP Range request. The manifest maps
+    card ids and source URLs to local paths and lets later runs skip URLs that
+    are already stored.
+    """
+
+    def __init__(self, out_dir: str, delay: float, workers: int = 4, manifest_path: Optional[str] = None, cache: Optional[ResponseCache] = None) -> None:
+        self.out_dir = out_dir
+        self.delay = delay
+        self.manifest_path = manifest_path or os.path.join(out_dir, "manifest.json")
+        self.cache = cache
+        self.limiter = TokenBucket.from_delay(delay)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.manifest: Dict[str, Dict[str, str]] = {"cards": {}, "urls": {}}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest.update(json.load(f))
+        self.inflight: Dict[str, Any] = {}
+        self.failed = 0
+        ensure_dir(os.path.join(out_dir, ".partial"))
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    def submit(self, card_id: str, url: str) -> None:
+        with self.lock:
+            path = self.manifest["urls"].get(url)
+            if path and os.path.exists(path):
+                self.manifest["cards"][card_id] = path
+                return
+            future = self.inflight.get(url)
+            if future is None:
+                future = self.pool.submit(self._download, url)
+                self.inflight[url] = future
+        future.add_done_callback(lambda f: self._record(card_id, url, f))
+
+    def _record(self, card_id: str, url: str, future: Any) -> None:
+        with self.lock:
+            path = future.result() if future.exception() is None else None
+            if path is None:
+                self.failed += 1
+                METRICS.inc("images_failed_total")
+                return
+            self.manifest["urls"][url] = path
+            self.manifest["cards"][card_id] = path
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self.local, "session"):
+            self.local.session = build_session(self.cache)
+        return self.local.session
+
+    def _download(self, url: str) -> Optional[str]:
+        with METRICS.time("image"):
+            return self._fetch_image(url)
+
+    def _fetch_image(self, url: str) -> Optional[str]:
+        partial = os.path.join(self.out_dir, ".partial", hashlib.sha1(url.encode("utf-8")).hexdigest() + ".part")
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        try:
+            resp = request_with_backoff("GET", url, self._session(), self.delay, headers=headers, stream=True, limiter=self.limiter, stage="image_fetch")
+            with open(partial, "ab" if resp.status_code == 206 else "wb") as f:
+                for chunk in resp.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+        except Exception:
+            # A rejected range leaves nothing worth resuming from
+            if offset and os.path.exists(partial):
+                os.remove(partial)
+            return None
+        return self._store(partial, url)
+
+    def _store(self, partial: str, url: str) -> str:
+        digest = hashlib.sha256()
+        with open(partial, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        hexdigest = digest.hexdigest()
+        ext = os.path.splitext(url.split("?")[0])[1].lower()
+        if ext not in IMAGE_EXTENSIONS:
+            ext = ".jpg"
+        out_path = os.path.join(self.out_dir, "sha256", hexdigest[:2], hexdigest + ext)
+        if os.path.exists(out_path):
+            os.remove(partial)
+        else:
+            ensure_dir(os.path.dirname(out_path))
+            os.replace(partial, out_path)
         return out_path
-    except Exception:
+
+    def save_manifest(self) -> None:
+        with self.lock:
+            data = json.dumps(self.manifest, ensure_ascii=False, indent=2, sort_keys=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.manifest_path)
+
+    def close(self) -> Dict[str, str]:
+        """Wait for queued downloads, write the manifest and return url -> local path."""
+        self.pool.shutdown(wait=True)
+        self.save_manifest()
+        return dict(self.manifest["urls"])
+
+
+def localize_images(cards: Iterable[Dict[str, Any]], image_paths: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    """Point each card's image.url at its downloaded copy when there is one."""
+    for card in cards:
+        url = (card.get("image") or {}).get("url")
+        if url in image_paths:
+            card = dict(card, image={"url": image_paths[url]})
+        yield card
+
+
+def open_jsonl(path: str, append: bool = False) -> Any:
+    ensure_dir(os.path.dirname(path))
+    fh = open(path, "a" if append else "w", encoding="utf-8")
+    # A crash can leave a partial last line; start appending on a fresh one
+    if append and fh.tell() > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                fh.write("\n")
+    return fh
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+class JsonlCardWriter:
+    """Streams normalized cards to a JSONL file as they are produced.
+
+    Every record is flushed so readers can tail the file; the data is fsynced
+    every fsync_every records and on close.
+    """
+
+    def __init__(self, path: str, append: bool = False, fsync_every: int = 100) -> None:
+        self.path = path
+        self.fsync_every = fsync_every
+        self.count = 0
+        self.fh = open_jsonl(path, append=append)
+
+    def write(self, card: Dict[str, Any]) -> None:
+        self.fh.write(json.dumps(card, ensure_ascii=False) + "\n")
+        self.fh.flush()
+        self.count += 1
+        if self.count % self.fsync_every == 0:
+            os.fsync(self.fh.fileno())
+
+    def close(self) -> None:
+        self.fh.flush()
+        os.fsync(self.fh.fileno())
+        self.fh.close()
+
+
+class OutputRejected(Exception):
+    """The new output failed its check; the previous file was left in place."""
+
+
+def write_json_atomic(path: str, cards: Iterable[Dict[str, Any]], accept: Optional[Callable[[str], bool]] = None) -> int:
+    """Write cards as a pretty JSON array via a temp file and rename.
+
+    Output matches json.dump(cards, indent=2) but records are serialized one
+    at a time, and readers only ever see the old or the complete new file.
+    accept, when given, is called with the complete temp file before the
+    rename; if it returns False the temp file is removed and OutputRejected
+    is raised.
+    """
+    out_dir = os.path.dirname(path) or "."
+    ensure_dir(out_dir)
+    tmp_path = path + ".tmp"
+    count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for card in cards:
+                body = json.dumps(card, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                f.write(("[\n  " if count == 0 else ",\n  ") + body)
+                count += 1
+            f.write("\n]" if count else "[]")
+            f.flush()
+            os.fsync(f.fileno())
+        if accept is not None and not accept(tmp_path):
+            raise OutputRejected(f"{path} was not replaced")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def finalize_jsonl(stream_path: str, output_json: str, image_paths: Optional[Dict[str, str]] = None, accept: Optional[Callable[[str], bool]] = None) -> int:
+    """Convert a JSONL card stream into the pretty cards.json the site loads."""
+
+    def unique_records() -> Iterator[Dict[str, Any]]:
+        # A crash between the stream and checkpoint writes can repeat a record on resume
+        seen = set()
+        for card in iter_jsonl(stream_path):
+            digest = hashlib.sha1(json.dumps(card, sort_keys=True).encode("utf-8")).digest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+            yield card
+
+    return write_json_atomic(output_json, localize_images(unique_records(), image_paths or {}), accept)
+
+
+class CrawlCheckpoint:
+    """Append-only JSONL log of every card URL processed, so a crawl can resume.
+
+    Each line is {"url": ..., "card": <normalized card or null>}. A null card
+    marks a page that was fetched but yielded no card, so it is skipped too.
+    With keep_cards=False only the URLs are held in memory.
+    """
+
+    def __init__(self, path: str, resume: bool = False, keep_cards: bool = True) -> None:
+        self.path = path
+        self.keep_cards = keep_cards
+        self.records: Dict[str, Optional[Dict[str, Any]]] = {}
+        if resume and os.path.exists(path):
+            self._load()
+        self.fh = open_jsonl(path, append=resume)
+
+    def _load(self) -> None:
+        for record in iter_jsonl(self.path):
+            self.records[record["url"]] = record.get("card") if self.keep_cards else None
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def record(self, url: str, card: Optional[Dict[str, Any]]) -> None:
+        self.records[url] = card if self.keep_cards else None
+        self.fh.write(json.dumps({"url": url, "card": card}, ensure_ascii=False) + "\n")
+        self.fh.flush()
+
+    def cards(self, card_urls: List[str]) -> List[Dict[str, Any]]:
+        """Assemble the final card list in listing order from the store."""
+        cards = []
+        for url in card_urls:
+            card = self.records.get(url)
+            if card:
+                cards.append(card)
+        return cards
+
+    def close(self) -> None:
+        self.fh.close()
+
+
+def write_abilities_index(output_json: str) -> None:
+    # ability_index lives one level up, next to ability_system
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from ability_index import GAME_JS, write_ability_index
+
+    index_path = os.path.join(os.path.dirname(output_json), "abilities_index.json")
+    with open(output_json, "r", encoding="utf-8") as f:
+        # The game plays its GAME_DATA deck, so those cards are indexed under the game's ids as well
+        index = write_ability_index(json.load(f), index_path, GAME_JS)
+    print(f"Wrote abilities for {len(index)} cards to {index_path}")
+
+
+def output_check(args: argparse.Namespace) -> Optional[Callable[[str], bool]]:
+    """The accept hook for write_json_atomic: validate the new cards before they replace the output.
+
+    Violations are always printed; with --fail-on-invalid any invalid card
+    rejects the new file so the previous output stays untouched.
+    """
+    if args.no_validate:
         return None
 
+    def accept(path: str) -> bool:
+        with open(path, "r", encoding="utf-8") as f:
+            cards = json.load(f)
+        with METRICS.time("validate"):
+            report = validate_cards(cards, args.schema, workers=args.validate_workers)
+        METRICS.inc("cards_invalid_total", report.invalid)
+        for line in report.summary_lines():
+            print(line, file=sys.stderr)
+        return not (args.fail_on_invalid and report.invalid)
+
+    return accept
+
+
+def write_rejected(args: argparse.Namespace) -> int:
+    print(f"Invalid cards with --fail-on-invalid: kept the previous {args.output_json}; history and abilities index not updated", file=sys.stderr)
+    finish_metrics(args)
+    return 1
+
+
+def record_history(args: argparse.Namespace) -> None:
+    """--history: add the written cards to the versioned history as a new run."""
+    if not args.history:
+        return
+    with open(args.output_json, "r", encoding="utf-8") as f:
+        cards = json.load(f)
+    with METRICS.time("history"):
+        history = CardHistory(args.history)
+        try:
+            run = history.commit(cards, args.history_label)
+        except ValueError as exc:
+            print(f"History not updated: {exc}", file=sys.stderr)
+            return
+    print(f"History: run {run['run']} ({run['label']}), {run['added']} added, {run['modified']} modified, {len(run['removed'])} removed, {run['new_objects']} new records in {args.history}", file=sys.stderr)
+
+
+def reparse_main(args: argparse.Namespace, config: Dict[str, Any]) -> int:
+    """--reparse-from-archive: rebuild the output JSON from archived pages without any network access."""
+    workers = args.workers if args.workers > 1 else (os.cpu_count() or 1)
+    cards: List[Dict[str, Any]] = []
+    with METRICS.time("reparse"):
+        for _, card in reparse_archive(args.reparse_from_archive, config, workers, include_unlisted=args.reparse_include_unlisted):
+            if card is None:
+                METRICS.inc("cards_skipped_total")
+                continue
+            METRICS.inc("cards_total")
+            cards.append(card)
+
+    if args.dry_run:
+        print(json.dumps(cards[:3], indent=2))
+        finish_metrics(args)
+        return 0
+
+    # Reuse images downloaded by earlier crawls
+    image_paths: Dict[str, str] = {}
+    manifest_path = os.path.join(args.images_dir or "assets/images/cards", "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            image_paths = json.load(f).get("urls", {})
+    try:
+        with METRICS.time("write_output"):
+            count = write_json_atomic(args.output_json, localize_images(cards, image_paths), output_check(args))
+    except OutputRejected:
+        return write_rejected(args)
+    print(f"Re-parsed {count} cards from {args.reparse_from_archive} with {workers} processes into {args.output_json}")
+
+    record_history(args)
+    if not args.no_abilities_index:
+        write_abilities_index(args.output_json)
+    finish_metrics(args)
+    return 0
+
+
+def finish_metrics(args: argparse.Namespace) -> None:
+    """Print the per-stage summary and write the metrics report and profiles if requested."""
+    cards = int(METRICS.counter("cards_total"))
+    snapshot = METRICS.snapshot(cards)
+    print(f"{cards} cards in {snapshot['elapsed_seconds']:.1f}s ({snapshot['cards_per_second'] or 0:.2f} cards/s)", file=sys.stderr)
+    for stage, hist in snapshot["stages"].items():
+        print(f"  {stage:13s} {hist['count']:6d} x {hist['mean_seconds'] * 1000:8.1f} ms = {hist['sum_seconds']:8.2f}s", file=sys.stderr)
+    retries = METRICS.counter("retries_total")
+    slept = METRICS.counter("sleep_seconds_total")
+    print(f"  retries {int(retries)}, slept {slept:.2f}s", file=sys.stderr)
+    if args.metrics_out:
+        METRICS.write_report(args.metrics_out, args.metrics_format, cards)
+        print(f"Wrote metrics to {args.metrics_out}", file=sys.stderr)
+    if args.profile:
+        for path in METRICS.dump_profiles(args.profile):
+            print(f"Wrote profile {path}", file=sys.stderr)
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Scrape UVS Ultra into normalized JSON (requires permission)")
@@ -334,46 +1145,154 @@ def main() -> int:
     parser.add_argument("--output-json", default="card_db/cards.json")
     parser.add_argument("--images-dir", default=None)
     parser.add_argument("--download-images", action="store_true")
+    parser.add_argument("--no-abilities-index", action="store_true", help="Skip writing abilities_index.json next to the output JSON")
+    parser.add_argument("--image-workers", type=int, default=4, help="Threads in the background image download stage")
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1, help="Fetch card pages with N threads sharing one rate limiter")
+    parser.add_argument("--listing-workers", type=int, default=None, help="Threads fetching listing pages once the last page is found (default: --workers)")
+    parser.add_argument("--checkpoint", default=None, help="JSONL crawl checkpoint (default: <output-json>.checkpoint.jsonl)")
+    parser.add_argument("--resume", action="store_true", help="Skip card URLs already recorded in the checkpoint")
+    parser.add_argument("--output-format", choices=("json", "jsonl"), default="json", help="jsonl streams cards to <output-json>.jsonl as they are parsed, then finalizes cards.json")
+    parser.add_argument("--extractor", choices=EXTRACTORS, default=None, help="Card page parser: soup (BeautifulSoup) or lxml (precompiled XPath)")
+    parser.add_argument("--http-cache", default=None, help="SQLite file for the conditional-request response cache")
+    parser.add_argument("--cache-ttl", type=float, default=3600.0, help="Seconds a cached response is served without revalidation")
+    parser.add_argument("--cache-max-mb", type=int, default=512, help="Evict least recently used responses above this size")
+    parser.add_argument("--adaptive", action="store_true", help="Adjust request rate and concurrency from 429/5xx responses, Retry-After and latency (ceiling: max_rate_per_second and --workers)")
+    parser.add_argument("--rate-log", default=None, help="Append the adaptive controller's rate decisions to this JSONL file")
+    parser.add_argument("--archive", default=None, metavar="DIR", help="Store every fetched card page, gzip-compressed, in this archive")
+    parser.add_argument("--reparse-from-archive", default=None, metavar="DIR", help="Rebuild the output from an archive with a process pool (--workers, default all cores) instead of crawling")
+    parser.add_argument("--reparse-include-unlisted", action="store_true", help="Also re-parse archived pages missing from the last crawl's listing (cards that were removed)")
+    parser.add_argument("--schema", default=DEFAULT_SCHEMA, help="JSON Schema the output cards are validated against")
+    parser.add_argument("--no-validate", action="store_true", help="Skip schema validation of the output")
+    parser.add_argument("--validate-workers", type=int, default=1, help="Processes validating card batches")
+    parser.add_argument("--fail-on-invalid", action="store_true", help="Exit with status 1 when any card violates the schema")
+    parser.add_argument("--history", default=None, metavar="DIR", help="Record each run's cards in a deduplicated, versioned history (see card_history.py)")
+    parser.add_argument("--history-label", default=None, help="Label for this run in the history (default: UTC timestamp)")
+    parser.add_argument("--metrics-out", default=None, help="Write per-stage timings and counters here at the end of the run")
+    parser.add_argument("--metrics-format", choices=("json", "prometheus"), default=None, help="Report format (default: prometheus for .prom/.txt paths, else json)")
+    parser.add_argument("--profile", default=None, metavar="DIR", help="cProfile each stage and write <stage>.prof files to DIR")
     args = parser.parse_args()
 
+    METRICS.reset()
+    if args.profile:
+        METRICS.enable_profiling()
+
     config = load_yaml(args.config)
+    if args.extractor:
+        config["extractor"] = args.extractor
+    if args.reparse_from_archive:
+        return reparse_main(args, config)
 
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": "CardIngestor/1.0 (+practice; permission granted)",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    })
+    cache = None
+    if args.http_cache:
+        cache = ResponseCache(args.http_cache, ttl_seconds=args.cache_ttl, max_bytes=args.cache_max_mb * 1024 * 1024)
+    session = build_session(cache)
 
     # Pass max-pages into scraper via env var for simplicity
     if args.max_pages is not None:
         os.environ["UVS_MAX_PAGES"] = str(args.max_pages)
 
-    card_urls = scrape_list(config, session)
+    checkpoint = None
+    stream = None
+    output_base = os.path.splitext(args.output_json)[0]
+    if not args.dry_run:
+        streaming = args.output_format == "jsonl"
+        checkpoint = CrawlCheckpoint(args.checkpoint or f"{output_base}.checkpoint.jsonl", resume=args.resume, keep_cards=not streaming)
+        if streaming:
+            stream = JsonlCardWriter(f"{output_base}.jsonl", append=args.resume)
+    if checkpoint is not None and len(checkpoint):
+        print(f"Resuming: {len(checkpoint)} card pages already in checkpoint", file=sys.stderr)
+
+    # Listing and card pages share one limiter so the combined request rate stays bounded
+    listing_workers = args.listing_workers or args.workers
+    if args.adaptive:
+        limiter = build_adaptive_controller(config, max(args.workers, listing_workers), args.rate_log)
+    elif args.workers > 1 or listing_workers > 1:
+        limiter = TokenBucket.from_delay(float(config.get("rate_limit_seconds", 0.6)))
+    else:
+        limiter = None
+    listing = ListingCrawler(config, session, listing_workers, limiter, listing_max_pages())
+
+    # Card URLs are handed to the detail scraper as listing pages arrive
+    card_urls: List[str] = []
+    resumed = 0
+
+    def todo_urls() -> Iterator[str]:
+        nonlocal resumed
+        for url in listing:
+            card_urls.append(url)
+            if checkpoint is not None and url in checkpoint:
+                resumed += 1
+                continue
+            yield url
+
+    images = None
+    if args.download_images and not args.dry_run:
+        image_delay = float(config.get("image_rate_limit_seconds", config.get("rate_limit_seconds", 0.6)))
+        images = ImagePipeline(args.images_dir or "assets/images/cards", image_delay, workers=args.image_workers, cache=cache)
 
     cards: List[Dict[str, Any]] = []
-    for idx, url in enumerate(card_urls):
-        card = scrape_card(url, config, session)
+    crawl_started = time.monotonic()
+    archive = PageArchive(args.archive) if args.archive else None
+    for parsed, (url, card) in enumerate(scrape_cards(todo_urls(), config, session, args.workers, limiter, archive), start=1):
+        if parsed % 25 == 0:
+            total = listing.estimated_total()
+            print(METRICS.progress(resumed + parsed, total, since=crawl_started, resumed=resumed), file=sys.stderr)
         if not card:
+            METRICS.inc("cards_skipped_total")
+            if checkpoint is not None:
+                checkpoint.record(url, None)
             continue
-        if args.download_images and card.image_url:
-            local_path = download_image(card.image_url, args.images_dir or "assets/images/cards", session, float(config.get("rate_limit_seconds", 0.6)))
-            if local_path:
-                card.image_url = local_path
-        cards.append(card.to_normalized())
-        if (idx + 1) % 25 == 0:
-            print(f"Parsed {idx+1}/{len(card_urls)} cards...", file=sys.stderr)
+        METRICS.inc("cards_total")
+        if images is not None and card.image_url:
+            images.submit(card.id, card.image_url)
+        with METRICS.time("serialize"):
+            normalized = card.to_normalized()
+            if stream is not None:
+                stream.write(normalized)
+            if checkpoint is not None:
+                checkpoint.record(url, normalized)
+            else:
+                cards.append(normalized)
+
+    print(f"Listing: {len(card_urls)} card URLs on {listing.last_page} pages", file=sys.stderr)
+    if archive is not None:
+        archive.save_order(card_urls)
+        archive.close()
+        print(f"Archive: {len(archive)} pages in {args.archive}", file=sys.stderr)
+    if isinstance(limiter, AdaptiveController):
+        limiter.close()
+        summary = limiter.summary()
+        print(f"Adaptive rate: ended at {summary['rate']:.2f} req/s x {summary['concurrency']} in flight (peak {summary['peak_rate']:.2f}, ceiling {summary['max_rate']:.2f} x {summary['max_concurrency']}); decisions {summary['decisions']}", file=sys.stderr)
 
     if args.dry_run:
         print(json.dumps(cards[:3], indent=2))
+        finish_metrics(args)
         return 0
 
-    ensure_dir(os.path.dirname(args.output_json))
-    with open(args.output_json, "w", encoding="utf-8") as f:
-        json.dump(cards, f, ensure_ascii=False, indent=2)
+    checkpoint.close()
+    image_paths: Dict[str, str] = {}
+    if images is not None:
+        image_paths = images.close()
+        if images.failed:
+            print(f"{images.failed} image downloads failed; rerun to retry them", file=sys.stderr)
+    try:
+        with METRICS.time("write_output"):
+            if stream is not None:
+                stream.close()
+                count = finalize_jsonl(stream.path, args.output_json, image_paths, output_check(args))
+            else:
+                count = write_json_atomic(args.output_json, localize_images(checkpoint.cards(card_urls), image_paths), output_check(args))
+    except OutputRejected:
+        return write_rejected(args)
+
+    print(f"Wrote {count} cards to {args.output_json}")
 
-    print(f"Wrote {len(cards)} cards to {args.output_json}")
+    record_history(args)
+    if not args.no_abilities_index:
+        write_abilities_index(args.output_json)
+    finish_metrics(args)
     return 0
 
 
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Pack card images into a few size-capped sprite atlases per set.
+
+Every image is scaled to one tile width and packed onto shelves (rows) of
+atlases no larger than --max-size pixels a side, so the UI can draw hand and
+zone cards from a handful of cached files instead of one request per card.
+atlases/manifest.json gives, per card id, the atlas file and the tile's
+rectangle:
+
+    {"tile_width": 120, "atlases": {"mha-0-1a2b3c4d.webp": {"width": ..., "height": ..., "group": "mha"}},
+     "cards": {"mha_001": {"atlas": "mha-0-1a2b3c4d.webp", "x": 0, "y": 0, "w": 120, "h": 168}}}
+
+A tile is then an element with background-image set to the atlas and
+background-position -x -y. Atlas names carry a hash of their contents, so
+they can be cached forever, and a set whose images have not changed is not
+repacked on the next run.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from image_derivatives import FORMATS, card_sources, file_sha256, load_cards
+
+DEFAULT_TILE_WIDTH = 120
+DEFAULT_MAX_SIZE = 2048
+
+
+def group_name(card: Dict[str, Any]) -> str:
+    """Atlas group for a card: its set code, else a slug of the set name."""
+    card_set = card.get("set") or {}
+    name = card_set.get("code") or card_set.get("name") or "cards"
+    return re.sub(r"[^a-z0-9]+", "-", str(name).lower()).strip("-") or "cards"
+
+
+def pack_shelves(sizes: List[Tuple[str, int, int]], max_size: int, padding: int = 0) -> List[Dict[str, Any]]:
+    """Place (key, width, height) boxes on shelves, opening a new atlas when one is full.
+
+    Boxes go tallest first, left to right; a shelf is as tall as its first box.
+    Card tiles share a width, so this leaves little more than the padding unused.
+    """
+    pages: List[Dict[str, Any]] = []
+    page: Optional[Dict[str, Any]] = None
+    x = y = shelf = 0
+    for key, w, h in sorted(sizes, key=lambda s: (-s[2], -s[1], s[0])):
+        if w > max_size or h > max_size:
+            raise ValueError(f"{key}: {w}x{h} tile does not fit a {max_size}px atlas")
+        if page is not None and x + w > max_size:
+            x, y, shelf = 0, y + shelf + padding, 0
+        if page is None or y + h > max_size:
+            page = {"width": 0, "height": 0, "placements": []}
+            pages.append(page)
+            x = y = shelf = 0
+        page["placements"].append((key, x, y, w, h))
+        page["width"] = max(page["width"], x + w)
+        page["height"] = max(page["height"], y + h)
+        shelf = max(shelf, h)
+        x += w + padding
+    return pages
+
+
+def tile_size(path: str, tile_width: int) -> Tuple[int, int]:
+    with Image.open(path) as img:
+        width, height = img.size
+    return tile_width, max(1, round(height * tile_width / width))
+
+
+def render_group(group: str, sources: Dict[str, str], out_dir: str, tile_width: int, max_size: int, padding: int, fmt: str) -> Dict[str, Any]:
+    """Scale and pack one group's images into atlas files (runs in a worker process)."""
+    spec = FORMATS[fmt]
+    sizes = [(key, *tile_size(path, tile_width)) for key, path in sources.items()]
+    atlases: Dict[str, Dict[str, Any]] = {}
+    cards: Dict[str, Dict[str, Any]] = {}
+    for number, page in enumerate(pack_shelves(sizes, max_size, padding)):
+        sheet = Image.new("RGB", (page["width"], page["height"]), (0, 0, 0))
+        for key, x, y, w, h in page["placements"]:
+            with Image.open(sources[key]) as img:
+                sheet.paste(img.convert("RGB").resize((w, h), Image.LANCZOS), (x, y))
+        tmp_path = os.path.join(out_dir, f".{group}-{number}{spec['ext']}.tmp")
+        try:
+            sheet.save(tmp_path, spec["format"], **spec["options"])
+            name = f"{group}-{number}-{file_sha256(tmp_path)[:8]}{spec['ext']}"
+            os.replace(tmp_path, os.path.join(out_dir, name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        atlases[name] = {"width": page["width"], "height": page["height"], "group": group, "cards": len(page["placements"])}
+        for key, x, y, w, h in page["placements"]:
+            cards[key] = {"atlas": name, "x": x, "y": y, "w": w, "h": h}
+    return {"atlases": atlases, "cards": cards}
+
+
+def group_hash(sources: Dict[str, str], params: Tuple[Any, ...]) -> str:
+    digest = hashlib.sha256(json.dumps(params).encode("utf-8"))
+    for key in sorted(sources):
+        digest.update(f"{key}\0{file_sha256(sources[key])}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_atlases(images_dir: str, out_dir: str, cards_path: Optional[str] = None, tile_width: int = DEFAULT_TILE_WIDTH, max_size: int = DEFAULT_MAX_SIZE, padding: int = 1, fmt: str = "webp", workers: Optional[int] = None) -> Dict[str, Any]:
+    """Pack every card image into per-group atlases and write out_dir/manifest.json.
+
+    Groups whose images and parameters match the previous manifest keep their
+    atlases; atlases no longer referenced are deleted.
+    """
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    previous: Dict[str, Any] = {"groups": {}, "atlases": {}, "cards": {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    cards = load_cards(cards_path)
+    groups_of = {str(card["id"]): group_name(card) for card in cards}
+    groups: Dict[str, Dict[str, str]] = {}
+    for key, path in card_sources(images_dir, cards).items():
+        if os.path.exists(path):
+            groups.setdefault(groups_of.get(key, "cards"), {})[key] = path
+
+    params = (tile_width, max_size, padding, fmt)
+    hashes = {group: group_hash(sources, params) for group, sources in groups.items()}
+    manifest: Dict[str, Any] = {"tile_width": tile_width, "max_size": max_size, "format": fmt, "groups": {}, "atlases": {}, "cards": {}}
+    pending = []
+    for group, digest in hashes.items():
+        kept = previous["groups"].get(group)
+        names = [name for name, atlas in previous["atlases"].items() if atlas["group"] == group]
+        if kept == digest and names and all(os.path.exists(os.path.join(out_dir, name)) for name in names):
+            manifest["atlases"].update((name, previous["atlases"][name]) for name in names)
+            manifest["cards"].update((key, card) for key, card in previous["cards"].items() if card["atlas"] in names)
+            manifest["groups"][group] = digest
+        else:
+            pending.append(group)
+
+    os.makedirs(out_dir, exist_ok=True)
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(
+                render_group,
+                pending,
+                [groups[g] for g in pending],
+                [out_dir] * len(pending),
+                [tile_width] * len(pending),
+                [max_size] * len(pending),
+                [padding] * len(pending),
+                [fmt] * len(pending),
+            )
+            for group, result in zip(pending, results):
+                manifest["atlases"].update(result["atlases"])
+                manifest["cards"].update(result["cards"])
+                manifest["groups"][group] = hashes[group]
+
+    for name in previous["atlases"]:
+        if name not in manifest["atlases"] and os.path.exists(os.path.join(out_dir, name)):
+            os.remove(os.path.join(out_dir, name))
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    manifest["packed"] = pending
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pack card images into per-set sprite atlases with a coordinate manifest")
+    parser.add_argument("--images-dir", default="assets/images/cards")
+    parser.add_argument("--out-dir", default="assets/images/atlases")
+    parser.add_argument("--cards", default="card_db/cards.json", help="Cards JSON used to group images by set (all in one group when missing)")
+    parser.add_argument("--tile-width", type=int, default=DEFAULT_TILE_WIDTH, help="Width every card is scaled to, in pixels")
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE, help="Maximum atlas width and height in pixels")
+    parser.add_argument("--padding", type=int, default=1, help="Pixels between tiles, so scaled drawing does not bleed")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="webp")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    manifest = build_atlases(args.images_dir, args.out_dir, args.cards, args.tile_width, args.max_size, args.padding, args.format, args.workers)
+    total = sum(os.path.getsize(os.path.join(args.out_dir, name)) for name in manifest["atlases"])
+    print(f"Packed {len(manifest['packed'])} of {len(manifest['groups'])} groups; {len(manifest['cards'])} cards in {len(manifest['atlases'])} atlases ({total / 1e6:.1f} MB) under {args.out_dir}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())